@@ -1,14 +1,20 @@
+import asyncio
+import json
 import logging
+from dataclasses import dataclass, field
 from telegram import Update, Bot
 from telegram.ext import (
+    Application,
     ApplicationBuilder,
     CommandHandler,
     ContextTypes,
 )
 from io import BytesIO
-from tradingagents.domain.model import AnalysisStatus
+from tradingagents.domain.model import AnalysisStatus, is_final_status
 
-from service import enqueue_analysis, get_status
+from service import enqueue_analysis_async, get_status_async
+from tradingagents.external.redis.client import get_async_redis_client
+from tradingagents.external.redis.repo import ANALYSIS_NOTIFY_PATTERN
 from tradingagents.config import get_config
 from tradingagents.config import settings
 from datetime import datetime
@@ -26,6 +32,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Progress lines shown in the single status message of a job, per event type
+EVENT_LABELS = {
+    "analyst_report": "✅ {node} report ready",
+    "debate_round": "💬 {node}, debate round {round}",
+    "investment_plan": "🧭 Research Manager investment plan ready",
+    "trader_plan": "📈 Trader plan ready",
+    "risk_debate_round": "⚖️ {node}, risk round {round}",
+    "risk_judge_decision": "🏁 Risk Judge decision made",
+}
+
+@dataclass
+class JobWatcher:
+    """A chat waiting for the result of a job, with the message that shows its progress."""
+    user_id: int
+    chat_id: int
+    message_id: int
+    symbol: str
+    lines: list[str] = field(default_factory=list)
+
+# job_id -> chats to notify, only for jobs started through this bot process
+watched_jobs: dict[str, list[JobWatcher]] = {}
+
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
@@ -68,6 +96,92 @@ def is_coin_available(symbol: str) -> bool:
         return True
     return symbol.upper() in settings.AVAILABLE_COINS
 
+def format_progress(watcher: JobWatcher, job_id: str) -> str:
+    header = f"⏳ Analysis of {watcher.symbol} in progress\nJob ID: {job_id}"
+    return "\n".join([header, ""] + watcher.lines) if watcher.lines else header
+
+async def deliver_result(bot: Bot, job_id: str, watcher: JobWatcher):
+    """Send the final report or failure of a job to a waiting chat."""
+    response = await get_status_async(watcher.user_id, job_id)
+    if response.status == AnalysisStatus.DONE:
+        await send_text_as_file(
+            bot=bot,
+            chat_id=watcher.chat_id,
+            content=response.result,
+            filename=f"analysis_{job_id}.md",
+            caption=f"📊 Analysis of {watcher.symbol} completed. Full report attached.",
+        )
+    elif response.status == AnalysisStatus.FAILED:
+        await bot.send_message(chat_id=watcher.chat_id, text=f"❌ Analysis of {watcher.symbol} failed:\n{response.message}")
+
+async def handle_job_event(bot: Bot, job_id: str, event: dict):
+    """Update the progress messages of a job, and deliver the result once it is finished."""
+    watchers = watched_jobs.get(job_id)
+    if not watchers:
+        return
+
+    if event["type"] == "status":
+        # A failure RQ still retries is followed by a new running status
+        if not is_final_status(AnalysisStatus(event["status"]), event.get("final")):
+            return
+        watched_jobs.pop(job_id, None)
+        for watcher in watchers:
+            try:
+                await deliver_result(bot, job_id, watcher)
+            except Exception as e:
+                logger.error(f"Failed to deliver result of job {job_id} to chat {watcher.chat_id}: {e}")
+        return
+
+    label = EVENT_LABELS.get(event["type"])
+    if label is None:
+        return
+    for watcher in watchers:
+        watcher.lines.append(label.format(node=event.get("node", ""), round=event.get("round", "")))
+        try:
+            await bot.edit_message_text(
+                chat_id=watcher.chat_id,
+                message_id=watcher.message_id,
+                text=format_progress(watcher, job_id),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update progress message of job {job_id} in chat {watcher.chat_id}: {e}")
+
+async def listen_job_events(application: Application):
+    """Receive job events pushed over Redis pub/sub for as long as the bot runs."""
+    while True:
+        pubsub = get_async_redis_client().pubsub()
+        try:
+            await pubsub.psubscribe(ANALYSIS_NOTIFY_PATTERN)
+            logger.info(f"Subscribed to job events on {ANALYSIS_NOTIFY_PATTERN}")
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                job_id = message["channel"].decode().rsplit(":", 1)[-1]
+                await handle_job_event(application.bot, job_id, json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job event subscription failed, reconnecting: {e}")
+            await asyncio.sleep(5)
+        finally:
+            await pubsub.aclose()
+
+async def watch_job(bot: Bot, job_id: str, watcher: JobWatcher):
+    """Register a chat for the events of a job, delivering right away if it already finished."""
+    watched_jobs.setdefault(job_id, []).append(watcher)
+    # The job may have finished before the watcher was registered, e.g. when attached to a done job
+    response = await get_status_async(watcher.user_id, job_id)
+    if response.final:
+        await handle_job_event(bot, job_id, {"type": "status", "status": response.status.value, "final": True})
+
+async def post_init(application: Application):
+    application.bot_data["job_events_task"] = asyncio.create_task(listen_job_events(application))
+
+async def post_shutdown(application: Application):
+    task = application.bot_data.get("job_events_task")
+    if task is not None:
+        task.cancel()
+
 # --------------------------------------------------
 # Commands
 # --------------------------------------------------
@@ -76,7 +190,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "👋 Welcome to TradingAgents Bot\n\n"
         "Commands:\n"
         "/analyze BTC/USDT – start analysis\n"
-        "/report BTC/USDT – check analysis status"
+        "/report job-id – check analysis status\n\n"
+        "Reports are sent automatically when an analysis finishes."
     )
 
 async def analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -94,7 +209,7 @@ async def analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"❌ The symbol {symbol} is not available for analysis.")
         return
 
-    response = enqueue_analysis(user_id=user_id, symbol=symbol, date=datetime.now().strftime("%Y-%m-%d"))
+    response = await enqueue_analysis_async(user_id=user_id, symbol=symbol, date=datetime.now().strftime("%Y-%m-%d"))
     logger.info(f"Analyze response for user {user_id}, symbol {symbol}: {response}")
 
     if response.status == "error":
@@ -105,10 +220,17 @@ async def analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"{response.message}\n\n"
         f"• Symbol: {symbol}\n"
         f"• Job ID: `{response.job_id}`\n"
-        "Use /report to check status.",
+        "The report will be sent here when it is ready.",
         parse_mode="Markdown",
     )
 
+    progress = await update.message.reply_text(f"⏳ Analysis of {symbol} in progress\nJob ID: {response.job_id}")
+    await watch_job(
+        context.bot,
+        response.job_id,
+        JobWatcher(user_id=user_id, chat_id=update.effective_chat.id, message_id=progress.message_id, symbol=symbol),
+    )
+
 
 async def report(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
@@ -122,16 +244,17 @@ async def report(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     job_id = context.args[0]
 
-    response = get_status(user_id, job_id)
+    response = await get_status_async(user_id, job_id)
     logger.info(f"Report response for user {user_id}, job {job_id}: {response}")
 
     if not response:
         await update.message.reply_text("❌ Job not found. or error occurred.")
         return
 
-    if response.status in (AnalysisStatus.PENDING, AnalysisStatus.RUNNING):
+    if not response.final:
+        retrying = f" (retrying)\nLast error: {response.message}" if response.status == AnalysisStatus.FAILED else ""
         await update.message.reply_text(
-            f"⏳ Status: {response.status.value}\n"
+            f"⏳ Status: {response.status.value}{retrying}\n"
             "Please check again later."
         )
         return
@@ -157,7 +280,7 @@ async def report(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # --------------------------------------------------
 def main():
     logger.info("INFO: Starting Telegram bot... {}".format(BOT_TOKEN))
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
+    app = ApplicationBuilder().token(BOT_TOKEN).post_init(post_init).post_shutdown(post_shutdown).build()
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("analyze", analyze))
@@ -1,9 +1,30 @@
-from tradingagents.external.redis.repo import redis_queue, redis_repo
+import hashlib
+import json
+import uuid
+import asyncio
+from tradingagents.external.redis.repo import async_redis_repo, redis_queue, redis_repo
 from tradingagents.domain.model import AnalysisMeta,  AnalysisStatus, JobResultStatus
 from tradingagents.domain.response import EnqueueAnalysisResponse
-from rq import get_current_job
+from rq import Retry, get_current_job
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.checkpointer import get_graph_checkpointer
 from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.http_client import get_connection_stats
+from tradingagents.dataflows.rate_limiter import get_rate_limiter
+from tradingagents.config import settings
+
+# Configuration that changes the outcome of an analysis, jobs are only shared between equal fingerprints
+FINGERPRINT_CONFIG_KEYS = (
+    "llm_provider",
+    "deep_think_llm",
+    "quick_think_llm",
+    "backend_url",
+    "max_debate_rounds",
+    "max_risk_discuss_rounds",
+    "data_vendors",
+    "tool_vendors",
+    "market_context",
+)
 
 trading_agent = None
 
@@ -17,6 +38,29 @@ def get_trading_agent():
         )
     return trading_agent
 
+def get_config_fingerprint() -> str:
+    """Fingerprint the configuration that affects the result of an analysis."""
+    config = get_config()
+    relevant = {key: config.get(key) for key in FINGERPRINT_CONFIG_KEYS}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+def get_job_retry() -> Retry | None:
+    """Get the RQ retry policy of analysis jobs, None when retries are disabled.
+
+    RQ only reads ``retry`` when a job is enqueued, a Queue ignores it.
+    """
+    if settings.RQ_RETRIES < 1:
+        return None
+    return Retry(max=settings.RQ_RETRIES, interval=settings.RQ_INTERVALS)
+
+def will_retry(job) -> bool:
+    """Whether RQ runs the current job again if it fails now.
+
+    ``retries_left`` is only set for jobs enqueued with a retry policy (see get_job_retry),
+    and RQ decrements it after the failed attempt returns.
+    """
+    return job.retries_left is not None and job.retries_left > 0
+
 def process_job(user_id: str, symbol: str, date: str):
     print(f"INFO: Starting job for symbol {symbol} and date {date} by user {user_id}")
     try:
@@ -26,29 +70,82 @@ def process_job(user_id: str, symbol: str, date: str):
         job.save_meta()
 
         print(f"INFO: Processing job-id {job.id} for symbol {symbol} and date {date} by user {user_id}")
+        if job.retries_left is None and settings.RQ_RETRIES > 0:
+            print(f"WARNING: Job-id {job.id} was enqueued without a retry policy, a failure will not be retried")
 
         # Update status to RUNNING
-        redis_repo.update_status_analysis_meta(user_id=user_id, job_id=job.id, status=AnalysisStatus.RUNNING)
+        redis_repo.update_job_status(job.id, AnalysisStatus.RUNNING)
+
+        def publish_event(event: dict):
+            # Progress events are best effort and must never fail the analysis
+            try:
+                redis_repo.add_progress_event(job.id, event)
+            except Exception as e:
+                print(f"WARNING: Could not publish progress event for job-id {job.id}: {e}")
 
-        final_state, decision = get_trading_agent().propagate(ticker=symbol, trade_date=date)
+        # Checkpoints are keyed by job id, so an RQ retry of this job resumes after the last completed node
+        checkpointer = get_graph_checkpointer()
+        final_state, decision = get_trading_agent().propagate(
+            ticker=symbol, trade_date=date, on_event=publish_event, checkpointer=checkpointer, thread_id=job.id
+        )
 
         print(f"INFO: Decision for job-id {job.id}: {decision}")
 
         # Save the final result
         redis_repo.save_result(job_id=job.id, final_trade=final_state["final_trade_decision"])
         # Update status to DONE
-        redis_repo.update_status_analysis_meta(user_id=user_id, job_id=job.id, status=AnalysisStatus.DONE)
+        redis_repo.update_job_status(job.id, AnalysisStatus.DONE)
+        if checkpointer:
+            checkpointer.delete_thread(job.id)
         
         print(f"INFO: Completed job-id {job.id} for symbol {symbol}")
+        print(f"INFO: HTTP connection reuse (worker lifetime): {get_connection_stats()}")
+        if get_rate_limiter():
+            print(f"INFO: Vendor rate limiting (worker lifetime): {get_rate_limiter().get_stats()}")
     except Exception as e:
         job.meta["attempt"] = attempt + 1
         job.save_meta()
         print(f"ERROR: Failed to process job-id {job.id}: {e} (Attempt {attempt})")
-        # Update status to FAILED
-        redis_repo.update_status_analysis_meta(user_id=user_id, job_id=job.id, status=AnalysisStatus.FAILED, message=str(e))
+        retrying = will_retry(job)
+        # Update status to FAILED, final once RQ will not retry the job anymore
+        redis_repo.update_job_status(job.id, AnalysisStatus.FAILED, message=str(e), final=not retrying)
+        # The checkpoints stay in Redis for the retry
+        if get_graph_checkpointer() and not retrying:
+            get_graph_checkpointer().delete_thread(job.id)
         raise e
 
 
+def _enqueue_response(outcome: str, job_id: str, detail, user_id: str, symbol: str, date: str) -> EnqueueAnalysisResponse:
+    """Build the response of an enqueue request from the outcome of ``reserve_analysis``."""
+    if outcome == "on_cooldown":
+        return EnqueueAnalysisResponse(
+            job_id=job_id,
+            status="on_cooldown",
+            message=f"Analysis for {symbol} is on cooldown. Please try again later. TTL: {detail} seconds remaining.",
+        )
+
+    if outcome == "attached":
+        print(f"INFO: Attached user {user_id} to {detail.value} job-id {job_id} for {symbol} on {date}")
+        return EnqueueAnalysisResponse(
+            job_id=job_id,
+            status="attached",
+            message=f"Analysis for {symbol} is already {detail.value}, you will get its result."
+        )
+
+    return EnqueueAnalysisResponse(
+        job_id=job_id,
+        status="enqueued",
+        message=f"Analysis for {symbol} has been enqueued successfully."
+    )
+
+def _enqueue_error(e: Exception) -> EnqueueAnalysisResponse:
+    print(f"ERROR: Failed to enqueue analysis task: {e}")
+    return EnqueueAnalysisResponse(
+        job_id=None,
+        status="error",
+        message=f"Failed to enqueue analysis task: {str(e)}"
+    )
+
 def enqueue_analysis(user_id: str, symbol: str, date: str) -> EnqueueAnalysisResponse:
     """
     Enqueue a background task to analyze trading data for a given symbol and date.
@@ -61,33 +158,35 @@ def enqueue_analysis(user_id: str, symbol: str, date: str) -> EnqueueAnalysisRes
         EnqueueAnalysisResponse: The response containing job_id, status, and message.
     """
     try:
-        # Check if the analysis is on cooldown, if cooldown return the job-id
-        job_id, ttl = redis_repo.get_cooldown(user_id, symbol) 
-        if job_id:
-            return EnqueueAnalysisResponse(
-                job_id=job_id,
-                status="on_cooldown",
-                message=f"Analysis for {symbol} is on cooldown. Please try again later. TTL: {ttl} seconds remaining.",
-            )
-        
-        # If not on cooldown, enqueue the task, insert cooldown key with TTL 6 hours, insert with status pending redis key for analysis analysis:job:{job_id}
-        task = redis_queue.enqueue(process_job, user_id, symbol, date, job_timeout=7200)
-
-        redis_repo.save_cooldown(user_id, symbol, task.id)
-        redis_repo.create_analysis_meta(AnalysisMeta.new(job_id=task.id, user_id=user_id, symbol=symbol, trade_date=date))
-
-        return EnqueueAnalysisResponse(
-            job_id=task.id,
-            status="enqueued",
-            message=f"Analysis for {symbol} has been enqueued successfully."
+        # Check the cooldown, then attach to a pending, running or finished job for the same symbol, date and
+        # configuration, or reserve the cooldown and push a new job, all in one Redis transaction
+        new_job_id = str(uuid.uuid4())
+        outcome, job_id, detail = redis_repo.reserve_analysis(
+            AnalysisMeta.new(job_id=new_job_id, user_id=user_id, symbol=symbol, trade_date=date),
+            fingerprint=get_config_fingerprint(),
+            enqueue=lambda pipe: redis_queue.enqueue(
+                process_job, user_id, symbol, date, job_id=new_job_id, job_timeout=7200, retry=get_job_retry(), pipeline=pipe
+            ),
+            dedup_ttl=settings.ANALYSIS_DEDUP_TTL,
         )
+
+        return _enqueue_response(outcome, job_id, detail, user_id, symbol, date)
     except Exception as e:
-        print(f"ERROR: Failed to enqueue analysis task: {e}")
-        return EnqueueAnalysisResponse(
-            job_id=None,
-            status="error",
-            message=f"Failed to enqueue analysis task: {str(e)}"
-        )
+        return _enqueue_error(e)
+
+async def enqueue_analysis_async(user_id: str, symbol: str, date: str) -> EnqueueAnalysisResponse:
+    """
+    Async version of enqueue_analysis for the webapp and bot event loops, without blocking the loop.
+
+    Args:
+        user_id (str): The user ID requesting the analysis.
+        symbol (str): The trading symbol to analyze (e.g., "BTC/USDT").
+        date (str): The date for which to perform the analysis in YYYY-MM-DD format.
+    Returns:
+        EnqueueAnalysisResponse: The response containing job_id, status, and message.
+    """
+    # rq only enqueues through its synchronous client, so the transaction runs in a worker thread
+    return await asyncio.to_thread(enqueue_analysis, user_id, symbol, date)
 
 def get_status(user_id: str, job_id: str) -> JobResultStatus:
     """
@@ -103,5 +202,24 @@ def get_status(user_id: str, job_id: str) -> JobResultStatus:
     meta = redis_repo.get_analysis_meta(user_id, job_id)
     result = redis_repo.get_result(job_id)
     if meta:
-        return JobResultStatus(status=meta.status, result=result, message=meta.message)
-    return JobResultStatus(status=AnalysisStatus.DONE, result=None, message="Job not found")
+        return JobResultStatus(status=meta.status, result=result, message=meta.message, final=meta.final)
+    return JobResultStatus(status=AnalysisStatus.DONE, result=None, message="Job not found", final=True)
+
+async def get_status_async(user_id: str, job_id: str) -> JobResultStatus:
+    """
+    Async version of get_status for the webapp and bot event loops.
+
+    Args:
+        user_id (str): The user ID requesting the status.
+        job_id (str): The job ID to check.
+    Returns:
+        JobResultStatus: The current status and result of the job, or a failed status if not found.
+    """
+    print(f"INFO: Checking status for job-id {job_id}")
+    meta, result = await asyncio.gather(
+        async_redis_repo.get_analysis_meta(user_id, job_id),
+        async_redis_repo.get_result(job_id),
+    )
+    if meta:
+        return JobResultStatus(status=meta.status, result=result, message=meta.message, final=meta.final)
+    return JobResultStatus(status=AnalysisStatus.DONE, result=None, message="Job not found", final=True)
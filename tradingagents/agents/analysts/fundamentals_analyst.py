@@ -1,8 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from tradingagents.agents.utils.agent_utils import get_fundamentals, get_whitepaper, get_market_cap
+from tradingagents.agents.utils.agent_utils import get_fundamentals, get_whitepaper, get_market_cap, format_prefetched_data, format_market_context, get_market_context_tools
 
 
-def create_fundamentals_analyst(llm):
+def create_fundamentals_analyst(llm, messages_key="messages"):
     def fundamentals_analyst_node(state):
         current_date = state["trade_date"]
         ticker = state["ticker_of_interest"]
@@ -12,11 +12,18 @@ def create_fundamentals_analyst(llm):
             get_whitepaper,
             get_market_cap
         ]
+        tools = get_market_context_tools(state, tools)
+
+        if get_market_cap in tools:
+            tool_usage = " Use the available tools: `get_fundamentals` for comprehensive coin analysis, `get_whitepaper`, and `get_market_cap` for specific information."
+        else:
+            # The market context below already covers the global market capitalization
+            tool_usage = " Use the available tools: `get_fundamentals` for comprehensive coin analysis and `get_whitepaper` for specific information."
 
         system_message = (
             "You are a researcher tasked with analyzing fundamental information over the past week about a crypto-currency coin. Please write a comprehensive report of the coin's fundamental information such as fundamental information, whitepaper, and global market capitalization to gain a full view of the coin's fundamental information to inform traders. Make sure to include as much detail as possible. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."
             + " Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."
-            + " Use the available tools: `get_fundamentals` for comprehensive coin analysis, `get_whitepaper`, and `get_market_cap` for specific information.",
+            + tool_usage
         )
 
         prompt = ChatPromptTemplate.from_messages(
@@ -36,6 +43,10 @@ def create_fundamentals_analyst(llm):
             ]
         )
 
+        # Data fetched by the prefetch and market context stages, if enabled
+        system_message += format_prefetched_data(state, [tool.name for tool in tools])
+        system_message += format_market_context(state)
+
         prompt = prompt.partial(system_message=system_message)
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
@@ -43,7 +54,7 @@ def create_fundamentals_analyst(llm):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = chain.invoke(state[messages_key])
 
         report = ""
 
@@ -51,7 +62,7 @@ def create_fundamentals_analyst(llm):
             report = result.content
 
         return {
-            "messages": [result],
+            messages_key: [result],
             "fundamentals_report": report,
         }
 
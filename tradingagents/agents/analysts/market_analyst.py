@@ -1,8 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from tradingagents.agents.utils.agent_utils import get_crypto_data, get_indicators_bulk, get_account_balance, get_open_orders
+from tradingagents.agents.utils.agent_utils import get_crypto_data, get_indicators_bulk, get_account_balance, get_open_orders, format_prefetched_data
 
 
-def create_market_analyst(llm):
+def create_market_analyst(llm, messages_key="messages"):
 
     def market_analyst_node(state):
         current_date = state["trade_date"]
@@ -61,6 +61,9 @@ Volume-Based Indicators:
             ]
         )
 
+        # Data fetched by the prefetch stage, if enabled
+        system_message += format_prefetched_data(state, ["get_crypto_data", "get_indicators_bulk"])
+
         prompt = prompt.partial(system_message=system_message)
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
@@ -68,7 +71,7 @@ Volume-Based Indicators:
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = chain.invoke(state[messages_key])
 
         report = ""
 
@@ -76,7 +79,7 @@ Volume-Based Indicators:
             report = result.content
        
         return {
-            "messages": [result],
+            messages_key: [result],
             "market_report": report,
         }
 
@@ -1,7 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from tradingagents.agents.utils.agent_utils import get_news, get_global_news
+from tradingagents.agents.utils.agent_utils import get_news, get_global_news, format_prefetched_data, format_market_context, get_market_context_tools
 
-def create_news_analyst(llm):
+def create_news_analyst(llm, messages_key="messages"):
     def news_analyst_node(state):
         current_date = state["trade_date"]
         ticker = state["ticker_of_interest"]
@@ -10,9 +10,18 @@ def create_news_analyst(llm):
             get_news,
             get_global_news,
         ]
+        tools = get_market_context_tools(state, tools)
+
+        if get_global_news in tools:
+            tool_usage = "Use the available tools: get_news(query, start_date, end_date) for crypto-specific or targeted news searches, and get_global_news(curr_date, look_back_days, limit) for broader macroeconomic news."
+        else:
+            # The market context below already covers the global news
+            tool_usage = "Use the available tool get_news(query, start_date, end_date) for crypto-specific or targeted news searches."
 
         system_message = (
-            "You are a news researcher tasked with analyzing recent news and trends over the past week. Please write a comprehensive report of the current state of the world that is relevant for trading and macroeconomics. Use the available tools: get_news(query, start_date, end_date) for crypto-specific or targeted news searches, and get_global_news(curr_date, look_back_days, limit) for broader macroeconomic news. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."
+            "You are a news researcher tasked with analyzing recent news and trends over the past week. Please write a comprehensive report of the current state of the world that is relevant for trading and macroeconomics. "
+            + tool_usage
+            + " Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."
             + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."""
         )
 
@@ -33,13 +42,17 @@ def create_news_analyst(llm):
             ]
         )
 
+        # Data fetched by the prefetch and market context stages, if enabled
+        system_message += format_prefetched_data(state, [tool.name for tool in tools])
+        system_message += format_market_context(state)
+
         prompt = prompt.partial(system_message=system_message)
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = chain.invoke(state[messages_key])
 
         report = ""
 
@@ -47,7 +60,7 @@ def create_news_analyst(llm):
             report = result.content
 
         return {
-            "messages": [result],
+            messages_key: [result],
             "news_report": report,
         }
 
@@ -1,11 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_account_balance, get_open_orders
+from tradingagents.agents.utils.agent_utils import get_account_balance, get_open_orders, format_prefetched_data
 from tradingagents.dataflows.config import get_config
 
 
-def create_profile_analyst(llm):
+def create_profile_analyst(llm, messages_key="messages"):
     def profile_analyst_node(state):
         current_date = state["trade_date"]
         ticker = state["ticker_of_interest"]
@@ -20,7 +20,7 @@ def create_profile_analyst(llm):
                             You will be given access to the user's portfolio data, your objective is to write a comprehensive long report detailing your analysis, insights, and implications for the user's trading capacity after assessing their buying power, asset allocation, risk exposure, and active market participation. \
                             Use the `get_account_balance(symbol)` tool (e.g., symbol='BTC/USDT') to determine total equity, free margin, and locked capital. Use the `get_open_orders(symbol)` tool (e.g., symbol='BTC/USDT') to identify capital tied up in pending limit orders or stop-losses. \
                             Do not simply list the user's balances or holdings, provide detailed and finegrained analysis and insights. For instance, warn the user if they are overexposed to a single volatile asset, point out if they have too many 'stale' open orders locking up funds, or analyze if their current cash position allows for aggressive moves. Your report should serve as a risk management check before any new trades are executed."
-                            + """ Make sure to append a Markdown table at the end of the report to organize key portfolio metrics (Total Equity, Free Margin, Top Holdings, Risk Level) and actionable recommendations, organized and easy to read.""",
+                            + """ Make sure to append a Markdown table at the end of the report to organize key portfolio metrics (Total Equity, Free Margin, Top Holdings, Risk Level) and actionable recommendations, organized and easy to read."""
                         )
 
         prompt = ChatPromptTemplate.from_messages(
@@ -40,13 +40,16 @@ def create_profile_analyst(llm):
             ]
         )
 
+        # Data fetched by the prefetch stage, if enabled
+        system_message += format_prefetched_data(state, ["get_account_balance", "get_open_orders"])
+
         prompt = prompt.partial(system_message=system_message)
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = chain.invoke(state[messages_key])
 
         report = ""
 
@@ -54,7 +57,7 @@ def create_profile_analyst(llm):
             report = result.content
 
         return {
-            "messages": [result],
+            messages_key: [result],
             "profile_report": report,
         }
 
@@ -1,8 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from tradingagents.agents.utils.agent_utils import get_news, get_fear_and_greed
+from tradingagents.agents.utils.agent_utils import get_news, get_fear_and_greed, format_prefetched_data, format_market_context, get_market_context_tools
 
 
-def create_social_media_analyst(llm):
+def create_social_media_analyst(llm, messages_key="messages"):
     def social_media_analyst_node(state):
         current_date = state["trade_date"]
         ticker = state["ticker_of_interest"]
@@ -11,12 +11,13 @@ def create_social_media_analyst(llm):
             get_news,
             get_fear_and_greed,
         ]
+        tools = get_market_context_tools(state, tools)
 
         system_message = (
             "You are a social media and crypto coin specific news researcher/analyst tasked with analyzing social media posts, recent coin news, and public sentiment for a specific coin over the past week. \
             You will be given a coin name, your objective is to write a comprehensive long report detailing your analysis, insights, and implications for traders and investors on this coin current state after looking at social media and what people are saying about that coin, analyzing sentiment data of what people feel each day about the coin, and looking at recent coin news. \
             Use the get_news(query, start_date, end_date) tool to search for coin-specific news and social media discussions. Try to look at all sources possible from social media to sentiment to news. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."
-            + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read.""",
+            + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."""
         )
 
         prompt = ChatPromptTemplate.from_messages(
@@ -36,6 +37,10 @@ def create_social_media_analyst(llm):
             ]
         )
 
+        # Data fetched by the prefetch and market context stages, if enabled
+        system_message += format_prefetched_data(state, [tool.name for tool in tools])
+        system_message += format_market_context(state)
+
         prompt = prompt.partial(system_message=system_message)
         prompt = prompt.partial(tool_names=", ".join([tool.name for tool in tools]))
         prompt = prompt.partial(current_date=current_date)
@@ -43,7 +48,7 @@ def create_social_media_analyst(llm):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = chain.invoke(state[messages_key])
 
         report = ""
 
@@ -51,7 +56,7 @@ def create_social_media_analyst(llm):
             report = result.content
 
         return {
-            "messages": [result],
+            messages_key: [result],
             "sentiment_report": report,
         }
 
@@ -1,7 +1,20 @@
-from typing import Annotated
+from typing import Annotated, Any, Dict
 from typing_extensions import TypedDict
 from tradingagents.agents import *
+from langchain_core.messages import AnyMessage
 from langgraph.graph import MessagesState
+from langgraph.graph.message import add_messages
+
+
+def get_analyst_messages_key(analyst_type: str, parallel: bool = False) -> str:
+    """Get the state channel an analyst reads and writes its messages on.
+
+    Sequential analysts share the ``messages`` channel, parallel analysts each
+    get their own so that concurrent branches do not clear each other.
+    """
+    if parallel:
+        return f"{analyst_type}_messages"
+    return "messages"
 
 
 # Researcher team state
@@ -50,6 +63,21 @@ class AgentState(MessagesState):
 
     sender: Annotated[str, "Agent that sent this message"]
 
+    # per-analyst message channels, used when analysts run in parallel
+    market_messages: Annotated[list[AnyMessage], add_messages]
+    social_messages: Annotated[list[AnyMessage], add_messages]
+    news_messages: Annotated[list[AnyMessage], add_messages]
+    fundamentals_messages: Annotated[list[AnyMessage], add_messages]
+    profile_messages: Annotated[list[AnyMessage], add_messages]
+
+    # prefetch step
+    prefetched_data: Annotated[
+        Dict[str, Dict[str, Any]], "Tool payloads fetched before the analysts run, keyed by tool name"
+    ]
+    market_context: Annotated[
+        Dict[str, Any], "Symbol-independent market data and its macro summary, shared by every coin on the trade date"
+    ]
+
     # research step
     market_report: Annotated[str, "Report from the Market Analyst"]
     sentiment_report: Annotated[str, "Report from the Social Media Analyst"]
@@ -33,10 +33,10 @@ from tradingagents.agents.utils.profile_tools import (
     get_open_orders,
 )
 
-def create_msg_delete():
+def create_msg_delete(messages_key="messages"):
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
-        messages = state["messages"]
+        messages = state[messages_key]
         
         # Remove all messages
         removal_operations = [RemoveMessage(id=m.id) for m in messages]
@@ -44,9 +44,52 @@ def create_msg_delete():
         # Add a minimal placeholder message
         placeholder = HumanMessage(content="Continue")
         
-        return {"messages": removal_operations + [placeholder]}
+        return {messages_key: removal_operations + [placeholder]}
     
     return delete_messages
 
 
-        
\ No newline at end of file
+def format_prefetched_data(state, tool_names):
+    """Format the prefetched tool payloads of an analyst for its system prompt."""
+    prefetched_data = state.get("prefetched_data") or {}
+    blocks = []
+    for tool_name in tool_names:
+        payload = prefetched_data.get(tool_name)
+        if not payload:
+            continue
+        args = ", ".join(f"{k}={v!r}" for k, v in payload["args"].items())
+        blocks.append(f"### {tool_name}({args})\n{payload['result']}")
+
+    if not blocks:
+        return ""
+
+    return (
+        "\n\nThe following tool results have already been retrieved for you. Do not call these tools again with the same arguments;"
+        " only call tools when you need additional or different data.\n\n"
+        + "\n\n".join(blocks)
+        + "\n"
+    )
+
+
+def get_market_context_tools(state, tools):
+    """Drop the tools whose market-wide data is already covered by the market context summary."""
+    market_context = state.get("market_context") or {}
+    if not market_context.get("summary"):
+        return tools
+    covered = market_context.get("data") or {}
+    return [tool for tool in tools if tool.name not in covered]
+
+
+def format_market_context(state):
+    """Format the shared market context summary for an analyst's system prompt."""
+    market_context = state.get("market_context") or {}
+    if not market_context.get("summary"):
+        return ""
+
+    return (
+        "\n\nThe market-wide context below (global news, fear & greed, total market capitalization) has already been"
+        " analyzed once for every coin on this date. Rely on it instead of re-analyzing market-wide data and focus"
+        " your report on what is specific to the coin.\n\n"
+        + market_context["summary"]
+        + "\n"
+    )
@@ -0,0 +1,202 @@
+"""
+Embedding cache shared by all agent memories.
+
+Embeddings are cached per (model, sha256 of the text). Lookups go through an
+in-process LRU first and then, when configured, a Redis or on-disk tier, so
+the situation embedded by one agent is reused by the others, by reflection
+and by backtest replays.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from tradingagents.config import settings
+
+EMBEDDING_CACHE_KEY = "embedding:{model}:{digest}"
+
+EMBEDDING_CACHE_TIERS = ("none", "redis", "disk")
+
+_cache = None
+
+
+def get_text_digest(text: str) -> str:
+    """Hash the text of an embedding request."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """In-process LRU of embeddings with an optional shared Redis or on-disk tier."""
+
+    def __init__(self, max_entries: int = 1024, redis_client=None, cache_dir: Optional[str] = None, ttl: int = 30 * 86400):
+        """
+        Args:
+            max_entries: Embeddings kept in the in-process LRU
+            redis_client: Optional Redis client sharing embeddings between workers
+            cache_dir: Optional directory persisting embeddings between runs
+            ttl: Seconds an embedding is kept in Redis
+        """
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "shared_hits": 0, "misses": 0}
+
+    def make_key(self, model: str, text: str) -> str:
+        """Build the cache key of the embedding of a text by a model."""
+        return EMBEDDING_CACHE_KEY.format(model=model, digest=get_text_digest(text))
+
+    def _path(self, key: str) -> str:
+        prefix, digest = key.rsplit(":", 1)
+        model = prefix.split(":", 1)[1]
+        return os.path.join(self.cache_dir, model.replace("/", "_").replace(":", "_"), digest[:2], f"{digest}.json")
+
+    def _remember(self, key: str, embedding: List[float]):
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_shared(self, key: str) -> Optional[List[float]]:
+        if self.redis is not None:
+            raw = self.redis.get(key)
+            return json.loads(raw) if raw is not None else None
+        if self.cache_dir is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    return json.load(f)
+        return None
+
+    def _write_shared(self, key: str, embedding: List[float]):
+        if self.redis is not None:
+            self.redis.set(key, json.dumps(embedding), ex=self.ttl)
+        elif self.cache_dir is not None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Readers never see a partially written file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(embedding, f)
+            os.replace(tmp_path, path)
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Get the cached embedding of a text, or None on a miss."""
+        key = self.make_key(model, text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return embedding
+
+        try:
+            embedding = self._read_shared(key)
+        except Exception as e:
+            print(f"WARNING: Embedding cache read failed for {key}: {e}")
+            embedding = None
+
+        with self._lock:
+            self._stats["shared_hits" if embedding is not None else "misses"] += 1
+        if embedding is not None:
+            self._remember(key, embedding)
+        return embedding
+
+    def set(self, model: str, text: str, embedding: List[float]):
+        """Cache the embedding of a text in every tier."""
+        key = self.make_key(model, text)
+        self._remember(key, embedding)
+        try:
+            self._write_shared(key, embedding)
+        except Exception as e:
+            print(f"WARNING: Embedding cache write failed for {key}: {e}")
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Get the cached embeddings of several texts, None for each miss, with one Redis round trip."""
+        if self.redis is None:
+            return [self.get(model, text) for text in texts]
+
+        keys = [self.make_key(model, text) for text in texts]
+        embeddings: List[Optional[List[float]]] = []
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._entries.get(key)
+                if embedding is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing.append(i)
+                embeddings.append(embedding)
+
+        if missing:
+            try:
+                raws = self.redis.mget([keys[i] for i in missing])
+            except Exception as e:
+                print(f"WARNING: Embedding cache read failed for {len(missing)} keys: {e}")
+                raws = [None] * len(missing)
+            for i, raw in zip(missing, raws):
+                if raw is not None:
+                    embeddings[i] = json.loads(raw)
+                    self._remember(keys[i], embeddings[i])
+            with self._lock:
+                hits = sum(1 for raw in raws if raw is not None)
+                self._stats["shared_hits"] += hits
+                self._stats["misses"] += len(missing) - hits
+        return embeddings
+
+    def set_many(self, model: str, texts: List[str], embeddings: List[List[float]]):
+        """Cache the embeddings of several texts, with one Redis round trip."""
+        if self.redis is None:
+            for text, embedding in zip(texts, embeddings):
+                self.set(model, text, embedding)
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        for text, embedding in zip(texts, embeddings):
+            key = self.make_key(model, text)
+            self._remember(key, embedding)
+            pipe.set(key, json.dumps(embedding), ex=self.ttl)
+        try:
+            pipe.execute()
+        except Exception as e:
+            print(f"WARNING: Embedding cache write failed for {len(texts)} keys: {e}")
+
+    def get_or_embed(self, model: str, text: str, embed: Callable[[str], List[float]]) -> List[float]:
+        """Get the cached embedding of a text, embedding and caching it on a miss."""
+        embedding = self.get(model, text)
+        if embedding is None:
+            embedding = embed(text)
+            self.set(model, text, embedding)
+        return embedding
+
+    def get_stats(self):
+        """Get the hit/miss counters of this process."""
+        with self._lock:
+            return dict(self._stats)
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the shared embedding cache, or None when it is disabled in the configuration."""
+    global _cache
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        tier = settings.EMBEDDING_CACHE_TIER.lower()
+        if tier not in EMBEDDING_CACHE_TIERS:
+            print(f"WARNING: Unknown embedding cache tier {tier!r}, using the in-process cache only")
+            tier = "none"
+        redis_client = None
+        cache_dir = None
+        if tier == "redis":
+            from tradingagents.external.redis.client import get_redis_client
+            redis_client = get_redis_client()
+        elif tier == "disk":
+            cache_dir = settings.EMBEDDING_CACHE_DIR
+        _cache = EmbeddingCache(settings.EMBEDDING_CACHE_MAX_ENTRIES, redis_client, cache_dir, settings.EMBEDDING_CACHE_TTL)
+    return _cache
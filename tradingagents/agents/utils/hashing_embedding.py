@@ -0,0 +1,69 @@
+"""
+Offline embeddings for agent memories by feature hashing.
+
+Each text becomes the word unigrams and bigrams of its lowercased tokens,
+hashed with CRC32 into a fixed number of signed buckets, weighted by
+sublinear term frequency log(1 + tf) and L2-normalized. No model weights or
+network access are needed and the result is identical in every process.
+"""
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.%$/-]*")
+
+
+class HashingEmbedder:
+    """Embeds texts into ``dim`` signed hash buckets of their word n-grams."""
+
+    def __init__(self, dim: int = 1024, ngrams: int = 2):
+        """
+        Args:
+            dim: Embedding dimension, the number of hash buckets
+            ngrams: Longest word n-gram hashed
+        """
+        self.dim = dim
+        self.ngrams = ngrams
+        # Vocabularies repeat across situations, hash each n-gram once
+        self._bucket = lru_cache(maxsize=200_000)(self._hash_feature)
+
+    def _hash_feature(self, feature: str) -> int:
+        h = zlib.crc32(feature.encode("utf-8"))
+        # The top bit picks the sign, so collisions cancel out on average
+        return (h % self.dim) if h & 0x80000000 else -(h % self.dim) - 1
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = list(tokens)
+        for n in range(2, self.ngrams + 1):
+            features.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return features
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts.
+
+        Returns:
+            float32 array of shape (len(texts), dim) with unit-norm rows (zero for texts without tokens)
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            term_counts = Counter(self._features(text))
+            if not term_counts:
+                continue
+            buckets = np.fromiter((self._bucket(f) for f in term_counts), dtype=np.int64, count=len(term_counts))
+            weights = np.log1p(np.fromiter(term_counts.values(), dtype=np.float64, count=len(term_counts)))
+            signs = np.where(buckets >= 0, 1.0, -1.0)
+            indices = np.where(buckets >= 0, buckets, -buckets - 1)
+            vectors[row] = np.bincount(indices, weights=signs * weights, minlength=self.dim)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a text."""
+        return self.embed_many([text])[0].tolist()
@@ -1,71 +1,185 @@
-import chromadb
-from chromadb.config import Settings
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 from openai import OpenAI
 from tradingagents.config import settings
+from tradingagents.agents.utils.embedding_cache import get_embedding_cache
+from tradingagents.agents.utils.hashing_embedding import HashingEmbedder
+from tradingagents.agents.utils.memory_backends import get_memory_backend
+
+# "openai" calls the embeddings API of the backend, "hashing" embeds offline by feature hashing
+EMBEDDING_PROVIDERS = ("openai", "hashing")
+
+# Rough characters per token, to keep embedding requests under the token limit without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def get_embedding_provider(name, config):
+    """Get the embedding provider of a memory from ``config["memory_embedding"]``.
+
+    Args:
+        name: Memory name, e.g. "bull_memory"
+        config: Graph configuration. ``memory_embedding`` is either a provider for all
+            memories or a dict mapping memory names (and "default") to providers.
+    """
+    provider = config.get("memory_embedding", settings.MEMORY_EMBEDDING)
+    if isinstance(provider, dict):
+        provider = provider.get(name, provider.get("default", "openai"))
+    provider = provider.lower()
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(f"Unsupported memory embedding provider: {provider}")
+    return provider
+
+
+def get_situation_id(situation, recommendation):
+    """Get the content-hash id of a memory, identical for the same situation and advice in every worker."""
+    payload = json.dumps([situation, recommendation])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
-        if settings.BACKEND_URL == "http://localhost:11434/v1":
+        config = config or {}
+        self.embedding_provider = get_embedding_provider(name, config)
+        self.hashing_embedder = None
+        self.client = None
+        if self.embedding_provider == "hashing":
+            self.hashing_embedder = HashingEmbedder(settings.MEMORY_HASHING_DIM)
+            self.embedding = f"hashing-{settings.MEMORY_HASHING_DIM}"
+            # Vectors of another provider do not mix with the API embeddings of the same memory
+            name = f"{name}_{self.embedding}"
+        elif settings.BACKEND_URL == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
         else:
             self.embedding = "text-embedding-3-small"
-        self.client = OpenAI(base_url=settings.BACKEND_URL)
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.get_or_create_collection(name=name)
+        if self.hashing_embedder is None:
+            self.client = OpenAI(base_url=settings.BACKEND_URL)
+        self.backend = get_memory_backend(config.get("memory_store", settings.MEMORY_STORE), name)
 
     def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        
+        """Get OpenAI embedding for a text, through the shared embedding cache when enabled"""
+        if self.hashing_embedder is not None:
+            # Cheaper than a cache lookup
+            return self.hashing_embedder.embed(text)
+        cache = get_embedding_cache()
+        if cache is None:
+            return self._embed(text)
+        return cache.get_or_embed(self.embedding, text, self._embed)
+
+    def _embed(self, text):
         response = self.client.embeddings.create(
             model=self.embedding, input=text
         )
         return response.data[0].embedding
 
+    def _embed_batch(self, texts):
+        response = self.client.embeddings.create(
+            model=self.embedding, input=texts
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def get_embedding_batches(self, texts):
+        """Split texts into embedding requests of at most EMBEDDING_BATCH_SIZE inputs and EMBEDDING_BATCH_TOKENS tokens."""
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = len(text) // CHARS_PER_TOKEN + 1
+            if batch and (
+                len(batch) >= settings.EMBEDDING_BATCH_SIZE
+                or batch_tokens + tokens > settings.EMBEDDING_BATCH_TOKENS
+            ):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def get_embeddings(self, texts):
+        """Get OpenAI embeddings for several texts, embedding cache misses in concurrent batched requests
+
+        Args:
+            texts: Texts to embed, duplicates are embedded once
+
+        Returns:
+            List of embeddings in the order of ``texts``
+        """
+        if self.hashing_embedder is not None:
+            return self.hashing_embedder.embed_many(texts).tolist()
+
+        unique_texts = list(dict.fromkeys(texts))
+        cache = get_embedding_cache()
+        cached = cache.get_many(self.embedding, unique_texts) if cache is not None else [None] * len(unique_texts)
+        embeddings = dict(zip(unique_texts, cached))
+
+        missing = [text for text in unique_texts if embeddings[text] is None]
+        if missing:
+            batches = self.get_embedding_batches(missing)
+            max_workers = max(1, min(settings.EMBEDDING_MAX_WORKERS, len(batches)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for batch, batch_embeddings in zip(batches, executor.map(self._embed_batch, batches)):
+                    embeddings.update(zip(batch, batch_embeddings))
+            if cache is not None:
+                cache.set_many(self.embedding, missing, [embeddings[text] for text in missing])
+
+        return [embeddings[text] for text in texts]
+
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
-
-        offset = self.situation_collection.count()
-
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
-
-        self.situation_collection.add(
-            documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
+        # Content-hash ids make re-adding a memory, from this or another worker, a no-op
+        records = {}
+        for situation, recommendation in situations_and_advice:
+            records[get_situation_id(situation, recommendation)] = (situation, recommendation)
+
+        ids = list(records)
+        situations = [situation for situation, _ in records.values()]
+        advice = [recommendation for _, recommendation in records.values()]
+        embeddings = self.get_embeddings(situations)
+
+        self.backend.upsert(
+            ids,
+            situations,
+            [{"recommendation": rec} for rec in advice],
+            embeddings,
         )
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
         query_embedding = self.get_embedding(current_situation)
-
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
-
-        matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
-                {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
-                }
-            )
-
-        return matched_results
+        return self._query([query_embedding], n_matches)[0]
+
+    def get_memories_many(self, current_situations, n_matches=1):
+        """Find matching recommendations for several situations with one embedding request and one query
+
+        Returns:
+            List with the matches of each situation, in the order of ``current_situations``
+        """
+        if not current_situations:
+            return []
+        return self._query(self.get_embeddings(current_situations), n_matches)
+
+    def _query(self, query_embeddings, n_matches):
+        results = self.backend.query(query_embeddings, n_matches)
+
+        all_matches = []
+        for q in range(len(query_embeddings)):
+            matched_results = []
+            for i in range(len(results["documents"][q])):
+                matched_results.append(
+                    {
+                        "matched_situation": results["documents"][q][i],
+                        "recommendation": results["metadatas"][q][i]["recommendation"],
+                        "similarity_score": 1 - results["distances"][q][i],
+                    }
+                )
+            all_matches.append(matched_results)
+
+        return all_matches
 
 
 if __name__ == "__main__":
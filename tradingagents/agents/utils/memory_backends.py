@@ -0,0 +1,297 @@
+"""
+Vector stores behind FinancialSituationMemory.
+
+Every backend stores (id, document, metadata, embedding) records per memory
+and answers k-nearest-neighbour queries in Chroma's result shape. The Chroma
+backend covers the in-process, persistent and client/server setups; the NumPy
+backend keeps a normalized float32 matrix, searched with a single matmul and
+persisted as an append-only memory-mapped file, which is all small memory
+collections need and starts without importing chromadb.
+"""
+import fcntl
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+import numpy as np
+
+from tradingagents.config import settings
+
+# "memory", "persistent" and "http" are Chroma clients (in-process, under MEMORY_STORE_DIR
+# and a Chroma server), "numpy" is the NumPy index persisted under MEMORY_STORE_DIR
+CHROMA_STORES = ("memory", "persistent", "http")
+MEMORY_STORES = CHROMA_STORES + ("numpy",)
+
+# Fallback number of records written per Chroma call when the client does not report its limit
+DEFAULT_WRITE_BATCH_SIZE = 1000
+
+_chroma_clients = {}
+_chroma_lock = threading.Lock()
+
+
+def get_chroma_client(store):
+    """Get the process-wide Chroma client of a memory store, shared by all memories."""
+    import chromadb
+    from chromadb.config import Settings
+
+    with _chroma_lock:
+        client = _chroma_clients.get(store)
+        if client is None:
+            if store == "persistent":
+                client = chromadb.PersistentClient(
+                    path=settings.MEMORY_STORE_DIR, settings=Settings(allow_reset=True, anonymized_telemetry=False)
+                )
+            elif store == "http":
+                client = chromadb.HttpClient(
+                    host=settings.MEMORY_STORE_HOST,
+                    port=settings.MEMORY_STORE_PORT,
+                    settings=Settings(anonymized_telemetry=False),
+                )
+            else:
+                client = chromadb.Client(Settings(allow_reset=True))
+            _chroma_clients[store] = client
+        return client
+
+
+class MemoryBackend(ABC):
+    """Interface of the vector store of one memory collection."""
+
+    @abstractmethod
+    def upsert(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]], embeddings: List[List[float]]):
+        """Store records, replacing or skipping those whose id is already stored."""
+
+    @abstractmethod
+    def query(self, query_embeddings: List[List[float]], n_results: int) -> Dict[str, List[list]]:
+        """Find the nearest records of each query embedding.
+
+        Returns:
+            Dict with "documents", "metadatas" and "distances", each holding one list per query
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Get the number of stored records."""
+
+
+class ChromaMemoryBackend(MemoryBackend):
+    """Memory collection stored in Chroma."""
+
+    def __init__(self, store: str, name: str):
+        self.client = get_chroma_client(store)
+        self.collection = self.client.get_or_create_collection(name=name)
+
+    def get_write_batch_size(self) -> int:
+        """Get the maximum number of records the Chroma client accepts per write."""
+        try:
+            return self.client.get_max_batch_size()
+        except Exception:
+            return DEFAULT_WRITE_BATCH_SIZE
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        batch_size = self.get_write_batch_size()
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self.collection.upsert(
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                embeddings=embeddings[start:end],
+                ids=ids[start:end],
+            )
+
+    def query(self, query_embeddings, n_results):
+        return self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            include=["metadatas", "documents", "distances"],
+        )
+
+    def count(self):
+        return self.collection.count()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+class NumpyMemoryBackend(MemoryBackend):
+    """Memory collection held in a normalized float32 matrix and searched by brute-force cosine similarity.
+
+    With a directory, vectors are appended to ``{name}.f32`` and records to ``{name}.jsonl``
+    under a file lock, so several workers can share the collection. Each process memory-maps
+    the vectors and picks up rows appended by others before every query. Distances are
+    ``1 - cosine similarity``.
+    """
+
+    def __init__(self, name: str, directory: str = None):
+        """
+        Args:
+            name: Collection name, used for the file names
+            directory: Directory persisting the collection, kept in the process only if None
+        """
+        self.name = name
+        self.directory = directory
+        self.dim = None
+        self._ids: List[str] = []
+        # Row of each record in the vector file
+        self._rows: List[int] = []
+        self._next_row = 0
+        self._id_set = set()
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._buffer = np.zeros((0, 0), dtype=np.float32)
+        self._matrix = self._buffer
+        self._records_offset = 0
+        self._lock = threading.RLock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._vectors_path = os.path.join(directory, f"{name}.f32")
+            self._records_path = os.path.join(directory, f"{name}.jsonl")
+            self._lock_path = os.path.join(directory, f"{name}.lock")
+            self._refresh()
+
+    def _refresh(self):
+        """Load the records appended to the collection files since the last refresh."""
+        if not os.path.exists(self._records_path) or os.path.getsize(self._records_path) == self._records_offset:
+            return
+        with open(self._records_path, "rb") as f:
+            f.seek(self._records_offset)
+            data = f.read()
+        # Only complete lines, a writer may be in the middle of one
+        data = data[: data.rfind(b"\n") + 1]
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Every committed line was written along with one vector row
+                print(f"WARNING: Skipping corrupt record in memory collection {self.name}")
+                self._next_row += 1
+                continue
+            self.dim = record["dim"]
+            # Records written before rows were stored take the next row
+            self._rows.append(record.get("row", self._next_row))
+            self._next_row = self._rows[-1] + 1
+            self._ids.append(record["id"])
+            self._id_set.add(record["id"])
+            self._documents.append(record["document"])
+            self._metadatas.append(record["metadata"])
+        self._records_offset += len(data)
+        if self._ids:
+            vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows[-1] + 1, self.dim))
+            if self._rows[-1] + 1 == len(self._rows):
+                self._matrix = vectors
+            else:
+                # Rows of skipped records are left out, copied once per refresh
+                self._matrix = np.asarray(vectors[self._rows])
+
+    def _append_in_memory(self, vectors: np.ndarray):
+        rows = len(self._matrix)
+        if rows + len(vectors) > len(self._buffer):
+            # Grow geometrically so appends stay amortized O(1)
+            buffer = np.zeros((max(2 * len(self._buffer), rows + len(vectors), 64), self.dim), dtype=np.float32)
+            if rows:
+                buffer[:rows] = self._matrix
+            self._buffer = buffer
+        self._buffer[rows:rows + len(vectors)] = vectors
+        self._matrix = self._buffer[:rows + len(vectors)]
+
+    def _append_to_files(self, ids, documents, metadatas, vectors: np.ndarray):
+        # Called under the file lock right after a refresh. Rows and the partial record line
+        # of a writer that died before committing are dropped first.
+        first_row = self._next_row
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(first_row * self.dim * 4)
+            f.write(vectors.tobytes())
+        # The records commit the rows, they are written last
+        with open(self._records_path, "ab") as f:
+            f.truncate(self._records_offset)
+            for row, (record_id, document, metadata) in enumerate(zip(ids, documents, metadatas), first_row):
+                record = {"id": record_id, "document": document, "metadata": metadata, "dim": self.dim, "row": row}
+                f.write((json.dumps(record) + "\n").encode("utf-8"))
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        # Ids are content hashes, a stored id always holds the same record
+        with self._lock:
+            lock_file = None
+            if self.directory is not None:
+                lock_file = open(self._lock_path, "w")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self.directory is not None:
+                    self._refresh()
+                new = [i for i, record_id in enumerate(ids) if record_id not in self._id_set]
+                new = list({ids[i]: i for i in new}.values())
+                if not new:
+                    return
+
+                vectors = _normalize(np.asarray([embeddings[i] for i in new], dtype=np.float32))
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                if vectors.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match collection {self.name} ({self.dim})")
+
+                new_ids = [ids[i] for i in new]
+                new_documents = [documents[i] for i in new]
+                new_metadatas = [metadatas[i] for i in new]
+                if self.directory is not None:
+                    self._append_to_files(new_ids, new_documents, new_metadatas, vectors)
+                    self._refresh()
+                else:
+                    self._append_in_memory(vectors)
+                    self._ids.extend(new_ids)
+                    self._id_set.update(new_ids)
+                    self._documents.extend(new_documents)
+                    self._metadatas.extend(new_metadatas)
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    def query(self, query_embeddings, n_results):
+        with self._lock:
+            if self.directory is not None:
+                self._refresh()
+            matrix = self._matrix
+            documents, metadatas = self._documents, self._metadatas
+
+        results = {"documents": [], "metadatas": [], "distances": []}
+        k = min(n_results, len(matrix))
+        if k == 0:
+            for key in results:
+                results[key] = [[] for _ in query_embeddings]
+            return results
+
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+        similarities = queries @ matrix.T
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        for q, candidates in enumerate(top):
+            order = candidates[np.argsort(-similarities[q, candidates])]
+            results["documents"].append([documents[i] for i in order])
+            results["metadatas"].append([metadatas[i] for i in order])
+            results["distances"].append([float(1 - similarities[q, i]) for i in order])
+        return results
+
+    def count(self):
+        with self._lock:
+            if self.directory is not None:
+                self._refresh()
+            return len(self._ids)
+
+
+def get_memory_backend(store: str, name: str) -> MemoryBackend:
+    """Create the vector store of a memory collection.
+
+    Args:
+        store: One of MEMORY_STORES
+        name: Collection name
+    """
+    store = store.lower()
+    if store == "numpy":
+        return NumpyMemoryBackend(name, settings.MEMORY_STORE_DIR)
+    if store in CHROMA_STORES:
+        return ChromaMemoryBackend(store, name)
+    raise ValueError(f"Unsupported memory store: {store}")
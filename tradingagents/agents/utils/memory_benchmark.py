@@ -0,0 +1,104 @@
+"""
+Benchmark of the agent memory backends.
+
+Seeds every store with the same random embeddings, then reports the query
+latency of a single-situation lookup and the time and peak RSS a fresh worker
+process spends opening the five memory collections of a graph.
+
+    python -m tradingagents.agents.utils.memory_benchmark --stores numpy,persistent --rows 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from tradingagents.config import settings
+from tradingagents.agents.utils.memory_backends import get_memory_backend
+
+MEMORY_NAMES = ["bull_memory", "bear_memory", "trader_memory", "invest_judge_memory", "risk_manager_memory"]
+
+# The package import is the same for every store and not timed, chromadb is only imported by its backends
+STARTUP_SCRIPT = """
+import json, resource, time
+from tradingagents.agents.utils.memory_backends import get_memory_backend
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+backends = [get_memory_backend({store!r}, name) for name in {names!r}]
+counts = [backend.count() for backend in backends]
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "added_rss_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+    "rows": counts[0],
+}}))
+"""
+
+
+def seed(store, rows, dim, rng):
+    """Fill the five collections of a store with random records."""
+    for name in MEMORY_NAMES:
+        backend = get_memory_backend(store, name)
+        embeddings = rng.standard_normal((rows, dim)).astype(np.float32).tolist()
+        backend.upsert(
+            [f"{name}-{i}" for i in range(rows)],
+            [f"situation {i}" for i in range(rows)],
+            [{"recommendation": f"advice {i}"} for i in range(rows)],
+            embeddings,
+        )
+
+
+def measure_queries(store, queries, dim, rng):
+    """Time single-situation top-2 queries against one collection, in milliseconds."""
+    backend = get_memory_backend(store, MEMORY_NAMES[0])
+    timings = []
+    for _ in range(queries):
+        query = rng.standard_normal((1, dim)).astype(np.float32).tolist()
+        started = time.perf_counter()
+        backend.query(query, 2)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"query_ms_mean": float(np.mean(timings)), "query_ms_p95": float(np.percentile(timings, 95))}
+
+
+def measure_startup(store, directory):
+    """Open the five collections in a fresh interpreter, like a worker starting up."""
+    script = STARTUP_SCRIPT.format(store=store, names=MEMORY_NAMES)
+    env = {**os.environ, "MEMORY_STORE_DIR": directory}
+    output = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the query latency and startup cost of memory backends")
+    parser.add_argument("--stores", default="numpy,persistent", help="Comma-separated persistent stores to compare")
+    parser.add_argument("--rows", type=int, default=1000, help="Records per collection")
+    parser.add_argument("--dim", type=int, default=1536, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per store")
+    args = parser.parse_args()
+
+    for store in args.stores.split(","):
+        with tempfile.TemporaryDirectory() as directory:
+            settings.MEMORY_STORE_DIR = directory
+            rng = np.random.default_rng(0)
+
+            started = time.perf_counter()
+            seed(store, args.rows, args.dim, rng)
+            seed_seconds = time.perf_counter() - started
+
+            queries = measure_queries(store, args.queries, args.dim, rng)
+            startup = measure_startup(store, directory)
+
+            print(
+                f"{store:>10}: seed {seed_seconds:.2f}s, query mean {queries['query_ms_mean']:.2f}ms "
+                f"p95 {queries['query_ms_p95']:.2f}ms, worker startup {startup['seconds']:.2f}s "
+                f"({startup['rows']} rows x {len(MEMORY_NAMES)} collections, +{startup['added_rss_mb']:.0f} MB peak RSS)"
+            )
+
+
+if __name__ == "__main__":
+    main()
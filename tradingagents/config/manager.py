@@ -64,6 +64,7 @@ class Settings:
         self.RESULTS_DIR = os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results")
         self.DATA_DIR = os.getenv("TRADINGAGENTS_DATA_DIR", "/Users/yluo/Documents/Code/ScAI/FR1-data")
         self.DATA_CACHE_DIR = os.path.join(self.PROJECT_DIR, "dataflows/data_cache")
+        self.CANDLE_STORE_DIR = os.getenv("CANDLE_STORE_DIR", os.path.join(self.DATA_CACHE_DIR, "candles"))
         
         # LLM settings
         self.LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
@@ -76,6 +77,14 @@ class Settings:
         self.MAX_RISK_DISCUSS_ROUNDS = int(os.getenv("MAX_RISK_DISCUSS_ROUNDS", 1))
         self.MAX_RECUR_LIMIT = int(os.getenv("MAX_RECUR_LIMIT", 100))
         
+        # Graph settings
+        self.PARALLEL_ANALYSTS = os.getenv("PARALLEL_ANALYSTS", "false").lower() == "true"
+        self.PREFETCH_DATA = os.getenv("PREFETCH_DATA", "false").lower() == "true"
+        self.MARKET_CONTEXT_ENABLED = os.getenv("MARKET_CONTEXT_ENABLED", "true").lower() == "true"
+        self.MARKET_CONTEXT_REDIS = os.getenv("MARKET_CONTEXT_REDIS", "true").lower() == "true"
+        self.MARKET_CONTEXT_TTL = int(os.getenv("MARKET_CONTEXT_TTL", 6 * 3600))
+        self.MARKET_CONTEXT_LOCK_TTL = float(os.getenv("MARKET_CONTEXT_LOCK_TTL", 600))
+        
         # Data vendor settings
         self.CORE_CRYPTO_APIS = os.getenv("CORE_CRYPTO_APIS", "bybit")
         self.CORE_STOCK_APIS = os.getenv("CORE_STOCK_APIS", "yfinance")
@@ -84,6 +93,77 @@ class Settings:
         self.NEWS_DATA = os.getenv("NEWS_DATA", "openai")
         self.PROFILE_DATA = os.getenv("PROFILE_DATA", "bybit")
         
+        # Candle store settings
+        self.CANDLE_STORE_ENABLED = os.getenv("CANDLE_STORE_ENABLED", "true").lower() == "true"
+        
+        # Instrument registry settings
+        self.INSTRUMENT_CACHE_TTL = int(os.getenv("INSTRUMENT_CACHE_TTL", 3600))
+        self.INSTRUMENT_CACHE_REDIS = os.getenv("INSTRUMENT_CACHE_REDIS", "false").lower() == "true"
+        
+        # Vendor router settings
+        self.ROUTER_MAX_WORKERS = int(os.getenv("ROUTER_MAX_WORKERS", 16))
+        self.ROUTER_VENDOR_TIMEOUT = float(os.getenv("ROUTER_VENDOR_TIMEOUT", 60))
+        self.ROUTER_HEDGING = os.getenv("ROUTER_HEDGING", "true").lower() == "true"
+        self.ROUTER_HEDGE_MIN_DELAY = float(os.getenv("ROUTER_HEDGE_MIN_DELAY", 2))
+        self.ROUTER_HEDGE_DEFAULT_DELAY = float(os.getenv("ROUTER_HEDGE_DEFAULT_DELAY", 15))
+        
+        # Vendor circuit breaker settings
+        self.CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+        self.CIRCUIT_BREAKER_REDIS = os.getenv("CIRCUIT_BREAKER_REDIS", "false").lower() == "true"
+        self.CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5))
+        self.CIRCUIT_BREAKER_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_BREAKER_RECOVERY_TIMEOUT", 60))
+        
+        # Singleflight (coalescing of identical in-flight vendor calls) settings
+        self.SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+        self.SINGLEFLIGHT_REDIS = os.getenv("SINGLEFLIGHT_REDIS", "false").lower() == "true"
+        self.SINGLEFLIGHT_LOCK_TTL = float(os.getenv("SINGLEFLIGHT_LOCK_TTL", 120))
+        self.SINGLEFLIGHT_WAIT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_WAIT_TIMEOUT", 120))
+        
+        # Vendor router result cache settings
+        self.RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+        self.RESULT_CACHE_REDIS = os.getenv("RESULT_CACHE_REDIS", "false").lower() == "true"
+        self.RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 1024))
+        
+        # Agent memory embedding cache settings, the shared tier is one of none, redis or disk
+        self.EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+        self.EMBEDDING_CACHE_TIER = os.getenv("EMBEDDING_CACHE_TIER", "disk")
+        self.EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(self.DATA_CACHE_DIR, "embeddings"))
+        self.EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 1024))
+        self.EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", 30 * 86400))
+        self.EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 256))
+        self.EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", 100000))
+        self.EMBEDDING_MAX_WORKERS = int(os.getenv("EMBEDDING_MAX_WORKERS", 4))
+        
+        # Agent memory vector store settings, the store is one of memory, persistent, http or numpy
+        self.MEMORY_STORE = os.getenv("MEMORY_STORE", "memory")
+        self.MEMORY_STORE_DIR = os.getenv("MEMORY_STORE_DIR", os.path.join(self.RESULTS_DIR, "memory"))
+        self.MEMORY_STORE_HOST = os.getenv("MEMORY_STORE_HOST", "localhost")
+        self.MEMORY_STORE_PORT = int(os.getenv("MEMORY_STORE_PORT", 8001))
+        self.MEMORY_EMBEDDING = os.getenv("MEMORY_EMBEDDING", "openai")
+        self.MEMORY_HASHING_DIM = int(os.getenv("MEMORY_HASHING_DIM", 1024))
+        
+        # Vendor rate limits as "bucket=requests/seconds", shared by all workers through Redis when enabled
+        self.RATE_LIMITER_ENABLED = os.getenv("RATE_LIMITER_ENABLED", "true").lower() == "true"
+        self.RATE_LIMITER_REDIS = os.getenv("RATE_LIMITER_REDIS", "false").lower() == "true"
+        self.RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 300))
+        self.RATE_LIMITS = {
+            bucket.strip(): tuple(float(x) for x in limit.split("/"))
+            for bucket, limit in (
+                item.split("=") for item in os.getenv(
+                    "RATE_LIMITS",
+                    "alpha_vantage=5/60,coingecko=30/60,taapi=1/15,bybit_market=50/1,bybit_trade=10/1,bybit_account=10/1,bybit=10/1",
+                ).split(",") if "=" in item
+            )
+        }
+        
+        # HTTP transport settings
+        self.HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+        self.HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+        self.HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+        self.HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+        self.HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))
+        self.HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 16))
+        
         # Tool overrides
         self.TOOL_GET_GLOBAL_NEWS = os.getenv("TOOL_GET_GLOBAL_NEWS", "telegram")
         
@@ -112,6 +192,11 @@ class Settings:
             int(x.strip()) for x in os.getenv("RQ_INTERVALS", "30,60,120").split(",")
         ]
         
+        # Analysis job settings
+        self.ANALYSIS_DEDUP_TTL = int(os.getenv("ANALYSIS_DEDUP_TTL", 6 * 3600))
+        self.GRAPH_CHECKPOINT_ENABLED = os.getenv("GRAPH_CHECKPOINT_ENABLED", "true").lower() == "true"
+        self.GRAPH_CHECKPOINT_TTL = int(os.getenv("GRAPH_CHECKPOINT_TTL", 24 * 3600))
+        
         # Whitelist settings
         self.WHITELIST_ENABLED = os.getenv("WHITELIST_ENABLED", "false").lower() == "true"
         self.WHITELISTED_USER_IDS = [int(x.strip()) for x in os.getenv("WHITELISTED_USER_IDS", "").split(",") if x.strip().isdigit()]
@@ -182,6 +267,7 @@ class Settings:
             "results_dir": self.RESULTS_DIR,
             "data_dir": self.DATA_DIR,
             "data_cache_dir": self.DATA_CACHE_DIR,
+            "candle_store_dir": self.CANDLE_STORE_DIR,
             
             # LLM settings
             "llm_provider": self.LLM_PROVIDER,
@@ -194,10 +280,47 @@ class Settings:
             "max_risk_discuss_rounds": self.MAX_RISK_DISCUSS_ROUNDS,
             "max_recur_limit": self.MAX_RECUR_LIMIT,
             
+            # Graph settings
+            "parallel_analysts": self.PARALLEL_ANALYSTS,
+            "prefetch_data": self.PREFETCH_DATA,
+            "market_context": self.MARKET_CONTEXT_ENABLED,
+            "market_context_redis": self.MARKET_CONTEXT_REDIS,
+            "market_context_ttl": self.MARKET_CONTEXT_TTL,
+            "market_context_lock_ttl": self.MARKET_CONTEXT_LOCK_TTL,
+            
             # Data vendors
             "data_vendors": self.data_vendors,
             "tool_vendors": self.tool_vendors,
             "tool_providers": self.tool_providers,
+            "candle_store_enabled": self.CANDLE_STORE_ENABLED,
+            "instrument_cache_ttl": self.INSTRUMENT_CACHE_TTL,
+            "instrument_cache_redis": self.INSTRUMENT_CACHE_REDIS,
+            "router_max_workers": self.ROUTER_MAX_WORKERS,
+            "router_vendor_timeout": self.ROUTER_VENDOR_TIMEOUT,
+            "router_hedging": self.ROUTER_HEDGING,
+            "circuit_breaker_enabled": self.CIRCUIT_BREAKER_ENABLED,
+            "circuit_breaker_redis": self.CIRCUIT_BREAKER_REDIS,
+            "singleflight_enabled": self.SINGLEFLIGHT_ENABLED,
+            "singleflight_redis": self.SINGLEFLIGHT_REDIS,
+            "result_cache_enabled": self.RESULT_CACHE_ENABLED,
+            "result_cache_redis": self.RESULT_CACHE_REDIS,
+            "embedding_cache_enabled": self.EMBEDDING_CACHE_ENABLED,
+            "embedding_cache_tier": self.EMBEDDING_CACHE_TIER,
+            "embedding_batch_size": self.EMBEDDING_BATCH_SIZE,
+            "embedding_batch_tokens": self.EMBEDDING_BATCH_TOKENS,
+            "embedding_max_workers": self.EMBEDDING_MAX_WORKERS,
+            "memory_store": self.MEMORY_STORE,
+            "memory_embedding": self.MEMORY_EMBEDDING,
+            "memory_hashing_dim": self.MEMORY_HASHING_DIM,
+            "rate_limiter_enabled": self.RATE_LIMITER_ENABLED,
+            "rate_limiter_redis": self.RATE_LIMITER_REDIS,
+            "rate_limits": self.RATE_LIMITS,
+            "http_connect_timeout": self.HTTP_CONNECT_TIMEOUT,
+            "http_read_timeout": self.HTTP_READ_TIMEOUT,
+            "http_max_retries": self.HTTP_MAX_RETRIES,
+            "analysis_dedup_ttl": self.ANALYSIS_DEDUP_TTL,
+            "graph_checkpoint_enabled": self.GRAPH_CHECKPOINT_ENABLED,
+            "graph_checkpoint_ttl": self.GRAPH_CHECKPOINT_TTL,
             "external": self.external,
             "redis": self.redis,
         }
@@ -229,6 +352,77 @@ def update_config(updates: Dict[str, Any]) -> None:
             settings.MAX_DEBATE_ROUNDS = value
         elif key == "max_risk_discuss_rounds":
             settings.MAX_RISK_DISCUSS_ROUNDS = value
+        elif key == "parallel_analysts":
+            settings.PARALLEL_ANALYSTS = value
+        elif key == "prefetch_data":
+            settings.PREFETCH_DATA = value
+        elif key == "market_context":
+            settings.MARKET_CONTEXT_ENABLED = value
+        elif key == "market_context_redis":
+            settings.MARKET_CONTEXT_REDIS = value
+        elif key == "market_context_ttl":
+            settings.MARKET_CONTEXT_TTL = value
+        elif key == "market_context_lock_ttl":
+            settings.MARKET_CONTEXT_LOCK_TTL = value
+        elif key == "candle_store_enabled":
+            settings.CANDLE_STORE_ENABLED = value
+        elif key == "instrument_cache_ttl":
+            settings.INSTRUMENT_CACHE_TTL = value
+        elif key == "instrument_cache_redis":
+            settings.INSTRUMENT_CACHE_REDIS = value
+        elif key == "analysis_dedup_ttl":
+            settings.ANALYSIS_DEDUP_TTL = value
+        elif key == "graph_checkpoint_enabled":
+            settings.GRAPH_CHECKPOINT_ENABLED = value
+        elif key == "graph_checkpoint_ttl":
+            settings.GRAPH_CHECKPOINT_TTL = value
+        elif key == "router_max_workers":
+            # Read when the router's thread pool is first created
+            settings.ROUTER_MAX_WORKERS = value
+        elif key == "router_vendor_timeout":
+            settings.ROUTER_VENDOR_TIMEOUT = value
+        elif key == "router_hedging":
+            settings.ROUTER_HEDGING = value
+        elif key == "circuit_breaker_enabled":
+            settings.CIRCUIT_BREAKER_ENABLED = value
+        elif key == "circuit_breaker_redis":
+            settings.CIRCUIT_BREAKER_REDIS = value
+        elif key == "singleflight_enabled":
+            settings.SINGLEFLIGHT_ENABLED = value
+        elif key == "singleflight_redis":
+            settings.SINGLEFLIGHT_REDIS = value
+        elif key == "result_cache_enabled":
+            settings.RESULT_CACHE_ENABLED = value
+        elif key == "result_cache_redis":
+            settings.RESULT_CACHE_REDIS = value
+        elif key == "embedding_cache_enabled":
+            settings.EMBEDDING_CACHE_ENABLED = value
+        elif key == "embedding_cache_tier":
+            settings.EMBEDDING_CACHE_TIER = value
+        elif key == "embedding_batch_size":
+            settings.EMBEDDING_BATCH_SIZE = value
+        elif key == "embedding_batch_tokens":
+            settings.EMBEDDING_BATCH_TOKENS = value
+        elif key == "embedding_max_workers":
+            settings.EMBEDDING_MAX_WORKERS = value
+        elif key == "memory_store":
+            settings.MEMORY_STORE = value
+        elif key == "memory_embedding":
+            settings.MEMORY_EMBEDDING = value
+        elif key == "memory_hashing_dim":
+            settings.MEMORY_HASHING_DIM = value
+        elif key == "rate_limiter_enabled":
+            settings.RATE_LIMITER_ENABLED = value
+        elif key == "rate_limiter_redis":
+            settings.RATE_LIMITER_REDIS = value
+        elif key == "rate_limits" and isinstance(value, dict):
+            settings.RATE_LIMITS.update(value)
+        elif key == "http_connect_timeout":
+            settings.HTTP_CONNECT_TIMEOUT = value
+        elif key == "http_read_timeout":
+            settings.HTTP_READ_TIMEOUT = value
+        elif key == "http_max_retries":
+            settings.HTTP_MAX_RETRIES = value
         elif key == "data_vendors" and isinstance(value, dict):
             for vendor_key, vendor_value in value.items():
                 if vendor_key == "core_crypto_apis":
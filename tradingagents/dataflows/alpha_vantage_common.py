@@ -1,9 +1,10 @@
 import os
-import requests
 import pandas as pd
 import json
 from datetime import datetime
 from io import StringIO
+from . import http_client
+from .rate_limiter import rate_limit
 
 API_BASE_URL = "https://www.alphavantage.co/query"
 
@@ -63,7 +64,8 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
+    rate_limit("alpha_vantage")
+    response = http_client.get(API_BASE_URL, params=api_params)
     response.raise_for_status()
 
     response_text = response.text
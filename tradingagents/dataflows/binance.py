@@ -6,9 +6,13 @@ import csv
 import io
 from tradingagents.dataflows.config import get_config
 from tradingagents.config import settings
+from .candle_store import INTERVAL_MS, get_candle_store, merge_candles, format_price
 
 _client = None
 
+# Maximum number of candles Binance returns per klines request
+KLINES_LIMIT = 1000
+
 def get_binance_client():
     """Get or create Binance client with lazy initialization."""
     global _client
@@ -29,6 +33,43 @@ def get_binance_client():
     
     return _client
 
+def _fetch_klines(symbol: str, interval: str, start_time: int, end_time: int) -> list:
+    """Download kline rows from Binance, paging through ranges longer than a single request.
+
+    Rows are [open time, open, high, low, close, volume, close time, quote asset volume,
+    number of trades, taker buy base asset volume, taker buy quote asset volume].
+    """
+    client = get_binance_client()
+    interval_ms = INTERVAL_MS[interval]
+    rows = []
+
+    chunk_start = start_time
+    while chunk_start <= end_time:
+        chunk_end = min(chunk_start + KLINES_LIMIT * interval_ms - 1, end_time)
+        response = client.rest_api.klines(
+            symbol=symbol,
+            start_time=chunk_start,
+            end_time=chunk_end,
+            interval=interval,
+            limit=KLINES_LIMIT,
+        )
+        # Drop the trailing unused field
+        rows.extend([float(v) for v in row[:11]] for row in response.data())
+        chunk_start = chunk_end + 1
+
+    return rows
+
+def get_klines(symbol: str, interval: str, start_time: int, end_time: int):
+    """Get kline rows ordered by open time, served from the local candle store when enabled."""
+    def fetch(fetch_start, fetch_end):
+        return _fetch_klines(symbol, interval, fetch_start, fetch_end)
+
+    store = get_candle_store()
+    if store is None:
+        return merge_candles(None, fetch(start_time, end_time))
+
+    return store.get_candles("binance", "spot", symbol, interval, start_time, end_time, fetch)
+
 def get_market_data(symbol: str, start_date: str, end_date: str):
     """Fetch market data for a given symbol from Binance. Get OHLCV data. interval is 1 day.
     
@@ -49,21 +90,10 @@ def get_market_data(symbol: str, start_date: str, end_date: str):
     
     # print(f"DEBUG: Fetching data for {formatted_symbol} from {start_date} to {end_date}")
     try:
-        client = get_binance_client()
-        response = client.rest_api.klines(
-            symbol=formatted_symbol,
-            start_time=start_epoch,
-            end_time=end_epoch,
-            interval="1d",
-        )
-
-        rate_limits = response.rate_limits
-        # print(f"DEBUG: klines() rate limits: {rate_limits}")
-
-        data = response.data()
+        data = get_klines(formatted_symbol, "1d", start_epoch, end_epoch)
         
         # Convert to CSV format
-        if not data:
+        if data is None or not len(data):
             return "No data available"
         
         # Create CSV string
@@ -87,9 +117,11 @@ def get_market_data(symbol: str, start_date: str, end_date: str):
         ]
         writer.writerow(headers)
         
-        # Write data rows
+        # Write data rows, times and trade counts are integers
         for row in data:
-            writer.writerow(row)
+            writer.writerow(
+                [int(v) if i in (0, 6, 8) else format_price(v) for i, v in enumerate(row)] + ["0"]
+            )
         
         csv_string = output.getvalue()
         output.close()
@@ -5,14 +5,44 @@ import time
 from typing import Dict, Optional, List
 from urllib.parse import urlencode
 
-import requests
 from tradingagents.config import settings
 
 import json
 from datetime import datetime, timedelta, timezone
-import pandas as pd
-from stockstats import StockDataFrame
-
+import numpy as np
+from .indicator_engine import INDICATOR_DESCRIPTIONS, compute_indicators
+from .candle_store import INTERVAL_MS, get_candle_store, merge_candles, format_price
+from .instrument_registry import InstrumentRegistry
+from . import http_client
+from .rate_limiter import rate_limit
+
+# Maximum number of candles Bybit returns per kline request
+KLINE_LIMIT = 1000
+# Maximum number of instruments Bybit returns per instruments-info page
+INSTRUMENTS_LIMIT = 1000
+# Categories bulk-loaded when the instrument registry is created
+INSTRUMENT_CATEGORIES = ("spot", "linear")
+# Contract type kept per derivatives category, dated futures share the base/quote pair of the perpetual
+INSTRUMENT_CONTRACT_TYPES = {"linear": "LinearPerpetual", "inverse": "InversePerpetual"}
+
+# Rate limit bucket per Bybit V5 endpoint group, other paths use the "bybit" bucket
+ENDPOINT_GROUPS = {
+    "/v5/market/": "bybit_market",
+    "/v5/order/": "bybit_trade",
+    "/v5/position/": "bybit_trade",
+    "/v5/account/": "bybit_account",
+    "/v5/asset/": "bybit_account",
+}
+
+_instrument_registry = None
+
+
+def get_endpoint_group(path: str) -> str:
+    """Get the rate limit bucket of a Bybit V5 endpoint path."""
+    for prefix, group in ENDPOINT_GROUPS.items():
+        if path.startswith(prefix):
+            return group
+    return "bybit"
 
 def bybit_v5_request(method: str, path: str, params: Optional[Dict] = None, body: Optional[Dict] = None) -> Dict:
     """Generic signed HTTP request helper for Bybit V5 API."""
@@ -23,6 +53,9 @@ def bybit_v5_request(method: str, path: str, params: Optional[Dict] = None, body
     if not api_key or not api_secret:
         raise ValueError("Missing BYBIT_API_KEY or BYBIT_API_SECRET")
 
+    # Wait for the endpoint group's quota before signing, the timestamp must be fresh
+    rate_limit(get_endpoint_group(path))
+
     timestamp = str(int(time.time() * 1000))
     recv_window = "5000"
 
@@ -54,9 +87,9 @@ def bybit_v5_request(method: str, path: str, params: Optional[Dict] = None, body
 
     # Make request
     if method.upper() == "GET":
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
     else:
-        response = requests.post(url, headers=headers, data=payload)
+        response = http_client.post(url, headers=headers, data=payload)
 
     response.raise_for_status()
     data = response.json()
@@ -104,39 +137,100 @@ def get_account_balance(symbol: str) -> dict:
     report += json.dumps(result.get(base_coin, {}), indent=2) + "\n"
     return report
 
-def get_symbol(base_coin: str, quote_coin: str) -> str:
+def _load_instruments(category: str) -> List[dict]:
+    """Download every instrument of a category, following the pagination cursor.
+
+    Derivatives categories only keep their perpetual contracts, one per base/quote pair.
+    """
+    contract_type = INSTRUMENT_CONTRACT_TYPES.get(category)
+    instruments = []
+    cursor = None
+    while True:
+        params = {"category": category, "limit": INSTRUMENTS_LIMIT}
+        if cursor:
+            params["cursor"] = cursor
+        result = bybit_v5_request("GET", "/v5/market/instruments-info", params).get("result", {})
+        instruments.extend(
+            item for item in result.get("list", [])
+            if contract_type is None or item.get("contractType") == contract_type
+        )
+        cursor = result.get("nextPageCursor")
+        if not cursor:
+            return instruments
+
+def get_instrument_registry() -> InstrumentRegistry:
+    """Get the shared Bybit instrument registry, backed by Redis when enabled in the configuration."""
+    global _instrument_registry
+    if _instrument_registry is None:
+        redis_client = None
+        if settings.INSTRUMENT_CACHE_REDIS:
+            from tradingagents.external.redis.client import get_redis_client
+            redis_client = get_redis_client()
+        _instrument_registry = InstrumentRegistry(
+            "bybit", _load_instruments, settings.INSTRUMENT_CACHE_TTL, redis_client
+        )
+        # Concurrent lookups wait on the per-category loads instead of downloading again
+        _instrument_registry.preload(INSTRUMENT_CATEGORIES)
+    return _instrument_registry
+
+def get_symbol(base_coin: str, quote_coin: str, category: str = "spot") -> str:
     """
     Safely retrieves the correct Bybit symbol (e.g., "BTCUSDT") for a given base/quote pair.
+    Served from the cached instrument registry, so no request is made per lookup.
     
     Args:
         base_coin: The asset (e.g., "BTC")
         quote_coin: The currency (e.g., "USDT")
-        category: "linear", "spot", or "inverse"
+        category: "linear" or "spot"
         
     Returns:
         The valid symbol string (e.g., "BTCUSDT") or None if not found.
     """
-    # 1. Query the API specifically for this Base Coin
-    # This filters the search on the server side, which is much faster.
-    params = {
-        "category": "spot",
-        "baseCoin": base_coin.upper(),
-        "limit": 20 # We only expect a few matches (e.g., BTCUSDT, BTC-PERP)
-    }
-    
-    data = bybit_v5_request("GET", "/v5/market/instruments-info", params)
+    return get_instrument_registry().get_symbol(base_coin, quote_coin, category)
+
+def _fetch_klines(category: str, symbol: str, interval: str, start_ms: int, end_ms: int) -> list:
+    """Download kline rows from Bybit, paging through ranges longer than a single request."""
+    interval_ms = INTERVAL_MS[interval]
+    rows = []
+
+    chunk_start = start_ms
+    while chunk_start <= end_ms:
+        chunk_end = min(chunk_start + KLINE_LIMIT * interval_ms - 1, end_ms)
+        data = bybit_v5_request("GET", "/v5/market/kline", {
+            "category": category,
+            "symbol": symbol.upper(),
+            "interval": interval,
+            "start": chunk_start,
+            "end": chunk_end,
+            "limit": KLINE_LIMIT
+        })
+        # Each row is [timestamp, open, high, low, close, volume, turnover] as strings
+        rows.extend([float(v) for v in row] for row in data.get("result", {}).get("list", []))
+        chunk_start = chunk_end + 1
 
-    result = data.get("result", {})
-    instruments = result.get("list", [])
+    return rows
 
-    # 2. Find the exact match for the Quote Coin
-    # This handles cases where BTC might pair with USDT, USDC, or DAI
-    for item in instruments:
-        if item.get("quoteCoin") == quote_coin.upper() and item.get("baseCoin") == base_coin.upper():
-            return item.get("symbol")
+def get_klines(category: str, symbol: str, interval: str, start_ms: int, end_ms: int) -> np.ndarray:
+    """
+    Get kline rows [timestamp, open, high, low, close, volume, turnover] ordered Oldest -> Newest.
+    Served from the local candle store when enabled, so only missing candles are downloaded.
+    
+    Args:
+        category: "spot" or "linear"
+        symbol: Bybit symbol (e.g., "BTCUSDT")
+        interval: Bybit interval (e.g., "D")
+        start_ms: Start open time in ms (Inclusive)
+        end_ms: End open time in ms (Inclusive)
+    """
+    def fetch(fetch_start_ms, fetch_end_ms):
+        return _fetch_klines(category, symbol, interval, fetch_start_ms, fetch_end_ms)
+
+    store = get_candle_store()
+    if store is None:
+        candles = merge_candles(None, fetch(start_ms, end_ms))
+        return candles if candles is not None else np.empty((0, 0))
 
-    # 3. Fallback/Error handling
-    return None
+    return store.get_candles("bybit", category, symbol, interval, start_ms, end_ms, fetch)
 
 def get_open_orders(symbol: str) -> str:
     """
@@ -209,39 +303,25 @@ def get_market_data(symbol:str, start_date: str, end_date: str) -> str:
     symbol2 = get_symbol(base_coin, quote_coin)
     if not symbol2:
         return f"# Error: No valid spot symbol found for {base_coin}/{quote_coin}."
-    params = {
-        "category": "spot",
-        "symbol": symbol2.upper(),
-        "interval": "D",
-        "start": ts_start,
-        "end": ts_end,
-        "limit": 1000 
-    }
-    
-    data = bybit_v5_request("GET", "/v5/market/kline", params)
-
-    result = data.get("result", {})
-    raw_candles = result.get("list", []) # Returns [timestamp, open, high, low, close, volume, turnover]
+    candles = get_klines("spot", symbol2, "D", ts_start, ts_end) # Rows of [timestamp, open, high, low, close, volume, turnover]
     
-    if not raw_candles:
+    if not len(candles):
         return f"# No market data found for {symbol.upper()} from {start_date} to {end_date}."
 
     # 3. Format Data
-    # Bybit returns Newest -> Oldest. We reverse it to get chronological order (Oldest -> Newest).
-    raw_candles.reverse()
-    
+    # Candles are already in chronological order (Oldest -> Newest).
     csv_lines = []
     
-    for candle in raw_candles:
+    for candle in candles:
         # Parse Timestamp
         ts_ms = int(candle[0])
         date_str = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
         
         # Parse Values
-        open_p = candle[1]
-        high_p = candle[2]
-        low_p = candle[3]
-        close_p = candle[4]
+        open_p = format_price(candle[1])
+        high_p = format_price(candle[2])
+        low_p = format_price(candle[3])
+        close_p = format_price(candle[4])
         volume = float(candle[5]) # Volume in Base Currency (e.g. BTC)
         
         # Format Line: Date,Open,High,Low,Close,Volume
@@ -262,6 +342,69 @@ def get_market_data(symbol:str, start_date: str, end_date: str) -> str:
     
     return "\n".join(header + csv_lines)
 
+def _calculate_daily_indicators(
+    symbol: str,
+    indicators: List[str],
+    start_window_dt: datetime,
+    target_date_dt: datetime
+):
+    """
+    Calculates indicators over daily linear klines with the vectorized indicator engine.
+    
+    Returns:
+        (date string -> candle index for the report window, indicator -> values),
+        or None if Bybit returned no data
+    """
+    # Buffer: Fetch 250 extra days before start_window for lagging indicators (like 200 SMA)
+    buffer_days = 250 
+    fetch_start_dt = start_window_dt - timedelta(days=buffer_days)
+    
+    # Convert to timestamps for Bybit (ms)
+    ts_start = int(fetch_start_dt.timestamp() * 1000)
+    ts_end = int((target_date_dt + timedelta(days=1)).timestamp() * 1000)
+
+    # Rows are [timestamp, open, high, low, close, volume, turnover], Oldest -> Newest
+    candles = get_klines("linear", symbol, "D", ts_start, ts_end)
+    
+    if not len(candles):
+        return None
+
+    values = compute_indicators(
+        candles[:, 1], candles[:, 2], candles[:, 3], candles[:, 4], candles[:, 5], indicators
+    )
+
+    # Only the candles inside the report window need a date lookup
+    window_start = int(np.searchsorted(candles[:, 0], start_window_dt.timestamp() * 1000, side="left"))
+    date_index = {
+        datetime.fromtimestamp(int(ts) / 1000).strftime('%Y-%m-%d'): idx
+        for idx, ts in enumerate(candles[window_start:, 0], start=window_start)
+    }
+    return date_index, values
+
+def _format_indicator_window(
+    date_index: Dict[str, int],
+    values: np.ndarray,
+    start_window_dt: datetime,
+    target_date_dt: datetime,
+    missing: str
+) -> List[str]:
+    """
+    Formats one indicator as "date: value" lines, Newest -> Oldest.
+    """
+    report_lines = []
+    current_check_date = target_date_dt
+    
+    while current_check_date >= start_window_dt:
+        date_str = current_check_date.strftime('%Y-%m-%d')
+        idx = date_index.get(date_str)
+        if idx is None:
+            report_lines.append(f"{date_str}: {missing}")
+        else:
+            report_lines.append(f"{date_str}: {values[idx]:.4f}")
+        current_check_date -= timedelta(days=1)
+
+    return report_lines
+
 def get_crypto_indicator_window(
     symbol: str,
     indicator: str,
@@ -270,172 +413,32 @@ def get_crypto_indicator_window(
 ) -> str:
     """
     Calculates technical indicators for a crypto pair using Bybit data.
-    Fix: Uses index lookup for dates since stockstats sets 'date' as the index.
     """
     if "/" not in symbol:
         return f"Error: Symbol '{symbol}' is not in the correct format. Please use 'BASE/QUOTE' format, e.g., 'BTC/USDT'."
     base_coin, quote_coin = symbol.split("/")
     symbol2 = get_symbol(base_coin, quote_coin)
-    
-    # 1. Define Supported Indicators (Same as before)
-    best_ind_params = {
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
 
-    # 2. Calculate Date Range
+    # 1. Calculate Date Range
     target_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     start_window_dt = target_date_dt - timedelta(days=look_back_days)
-    
-    # Buffer: Fetch 250 extra days before start_window for lagging indicators (like 200 SMA)
-    buffer_days = 250 
-    fetch_start_dt = start_window_dt - timedelta(days=buffer_days)
-    
-    # Convert to timestamps for Bybit (ms)
-    ts_start = int(fetch_start_dt.timestamp() * 1000)
-    ts_end = int((target_date_dt + timedelta(days=1)).timestamp() * 1000)
 
-    # 3. Fetch Data from Bybit
-    params = {
-        "category": "linear",
-        "symbol": symbol2.upper(),
-        "interval": "D",
-        "start": ts_start,
-        "end": ts_end,
-        "limit": 1000
-    }
-    
-    # Ensure 'bybit_v5_request' is defined in your scope
-    data = bybit_v5_request("GET", "/v5/market/kline", params)
-    raw_list = data.get("result", {}).get("list", [])
-    
-    if not raw_list:
+    # 2. Fetch Data and Calculate Indicator
+    calculated = _calculate_daily_indicators(symbol2, [indicator], start_window_dt, target_date_dt)
+    if calculated is None:
         return f"Error: No data found for {symbol2}."
+    date_index, values = calculated
 
-    # 4. Prepare DataFrame
-    parsed_data = []
-    for row in raw_list:
-        parsed_data.append({
-            # Standardize date format for the Index
-            "date": datetime.fromtimestamp(int(row[0])/1000).strftime('%Y-%m-%d'),
-            "open": float(row[1]),
-            "high": float(row[2]),
-            "low": float(row[3]),
-            "close": float(row[4]),
-            "volume": float(row[5])
-        })
-    
-    df = pd.DataFrame(parsed_data)
-    # Sort Ascending (Oldest -> Newest) is CRITICAL for stockstats
-    df = df.sort_values("date").reset_index(drop=True)
-    
-    # 5. Calculate Indicator
-    # retype(df) sets 'date' column as the Index!
-    stock = StockDataFrame.retype(df) 
-    
-    try:
-        # Trigger calculation
-        _ = stock[indicator] 
-    except KeyError:
+    if indicator not in values:
         return f"Error: Could not calculate {indicator}. Check if supported."
 
-    # 6. Build Report
-    report_lines = []
-    current_check_date = target_date_dt
-    
-    while current_check_date >= start_window_dt:
-        date_str = current_check_date.strftime('%Y-%m-%d')
-        
-        # --- FIX: Use .loc to find the row by Index (Date) ---
-        try:
-            # Locate the row using the date string index
-            val = stock.loc[date_str][indicator]
-            
-            # Format value
-            if isinstance(val, (float, int)):
-                val_str = f"{val:.4f}"
-            else:
-                val_str = str(val)
-                
-            report_lines.append(f"{date_str}: {val_str}")
-            
-        except KeyError:
-            # Date not found in index
-            report_lines.append(f"{date_str}: N/A (No Data)")
-        except Exception as e:
-            report_lines.append(f"{date_str}: Error ({str(e)})")
-            
-        current_check_date -= timedelta(days=1)
+    # 3. Build Report
+    report_lines = _format_indicator_window(
+        date_index, values[indicator], start_window_dt, target_date_dt, "N/A (No Data)"
+    )
 
-    # 7. Final Output
-    description = best_ind_params.get(indicator, "No description available.")
+    # 4. Final Output
+    description = INDICATOR_DESCRIPTIONS.get(indicator, "No description available.")
     
     result_str = (
         f"## {indicator} values for {symbol2} from {start_window_dt.strftime('%Y-%m-%d')} to {curr_date}:\n\n"
@@ -465,156 +468,30 @@ def get_crypto_indicators_bulk(
         return f"Error: Symbol '{symbol}' is not in the correct format. Please use 'BASE/QUOTE' format, e.g., 'BTC/USDT'."
     base_coin, quote_coin = symbol.split("/")
     symbol2 = get_symbol(base_coin, quote_coin)
-    
-    # 1. Define Descriptions
-    best_ind_params = {
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
 
-    # 2. Fetch Data (ONLY ONCE)
-    # ---------------------------------------------------------
+    # 1. Fetch Data and Calculate All Indicators (ONLY ONCE)
     target_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     start_window_dt = target_date_dt - timedelta(days=look_back_days)
-    
-    # Buffer for lagging indicators
-    buffer_days = 250 
-    fetch_start_dt = start_window_dt - timedelta(days=buffer_days)
-    
-    ts_start = int(fetch_start_dt.timestamp() * 1000)
-    ts_end = int((target_date_dt + timedelta(days=1)).timestamp() * 1000)
 
-    params = {
-        "category": "linear",
-        "symbol": symbol2.upper(),
-        "interval": "D",
-        "start": ts_start,
-        "end": ts_end,
-        "limit": 1000
-    }
-    
-    data = bybit_v5_request("GET", "/v5/market/kline", params)
-    raw_list = data.get("result", {}).get("list", [])
-    
-    if not raw_list:
+    calculated = _calculate_daily_indicators(symbol2, indicators, start_window_dt, target_date_dt)
+    if calculated is None:
         return f"Error: No data found for {symbol2}."
+    date_index, values = calculated
 
-    parsed_data = []
-    for row in raw_list:
-        parsed_data.append({
-            "date": datetime.fromtimestamp(int(row[0])/1000).strftime('%Y-%m-%d'),
-            "open": float(row[1]),
-            "high": float(row[2]),
-            "low": float(row[3]),
-            "close": float(row[4]),
-            "volume": float(row[5])
-        })
-    
-    df = pd.DataFrame(parsed_data)
-    df = df.sort_values("date").reset_index(drop=True)
-    stock = StockDataFrame.retype(df) 
-    # ---------------------------------------------------------
-
-    # 3. Process Each Indicator
+    # 2. Process Each Indicator
     final_report = [f"# Technical Indicators Report for {symbol2}\n" + '-' * 40]
 
     for ind in indicators:
-        # Pre-calculation check
-        try:
-            # Trigger calculation of the specific column
-            _ = stock[ind]
-        except (KeyError, ValueError):
+        if ind not in values:
             final_report.append(f"## Error: Indicator '{ind}' is not supported or failed to calculate.\n")
             continue
 
         # Generate Block Report
-        report_lines = []
-        current_check_date = target_date_dt
-        
-        while current_check_date >= start_window_dt:
-            date_str = current_check_date.strftime('%Y-%m-%d')
-            try:
-                # Use .loc because 'date' is the index
-                val = stock.loc[date_str][ind]
-                
-                if isinstance(val, (float, int)):
-                    val_str = f"{val:.4f}"
-                else:
-                    val_str = str(val)
-                report_lines.append(f"{date_str}: {val_str}")
-            except KeyError:
-                report_lines.append(f"{date_str}: N/A")
-            
-            current_check_date -= timedelta(days=1)
-
-        description = best_ind_params.get(ind, "No description available.")
+        report_lines = _format_indicator_window(
+            date_index, values[ind], start_window_dt, target_date_dt, "N/A"
+        )
+
+        description = INDICATOR_DESCRIPTIONS.get(ind, "No description available.")
         
         block = (
             f"## {ind} values for {symbol2} from {start_window_dt.strftime('%Y-%m-%d')} to {curr_date}:\n\n"
@@ -0,0 +1,181 @@
+"""
+Persistent, incremental OHLCV candle store shared by the exchange dataflows.
+
+Candles are kept as one float64 NumPy array per (exchange, category, symbol, interval)
+on disk, ordered by open time (column 0, epoch milliseconds). Range queries are
+served from a memory-mapped file and only candles missing from the store are
+downloaded from the exchange.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+import numpy as np
+from tradingagents.config import settings
+
+# Candle length in milliseconds for the interval codes used by Bybit and Binance
+INTERVAL_MS = {
+    # Bybit
+    "1": 60_000,
+    "3": 3 * 60_000,
+    "5": 5 * 60_000,
+    "15": 15 * 60_000,
+    "30": 30 * 60_000,
+    "60": 3_600_000,
+    "120": 2 * 3_600_000,
+    "240": 4 * 3_600_000,
+    "360": 6 * 3_600_000,
+    "720": 12 * 3_600_000,
+    "D": 86_400_000,
+    "W": 7 * 86_400_000,
+    # Binance
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "1h": 3_600_000,
+    "4h": 4 * 3_600_000,
+    "1d": 86_400_000,
+    "1w": 7 * 86_400_000,
+}
+
+# fetch(start_ms, end_ms) -> rows of [open_time_ms, open, high, low, close, volume, ...]
+FetchFn = Callable[[int, int], list]
+
+_store = None
+
+
+def merge_candles(stored: Optional[np.ndarray], fetched: list) -> Optional[np.ndarray]:
+    """Merge fetched rows into the stored candles, newer rows win on equal open time."""
+    parts = []
+    if stored is not None and len(stored):
+        parts.append(np.asarray(stored, dtype=np.float64))
+    if fetched:
+        parts.append(np.asarray(fetched, dtype=np.float64))
+    if not parts:
+        return stored
+
+    merged = np.concatenate(parts) if len(parts) > 1 else parts[0]
+    # Stable sort keeps fetched rows after stored ones, then keep the last row per open time
+    merged = merged[np.argsort(merged[:, 0], kind="stable")]
+    keep = np.append(merged[1:, 0] != merged[:-1, 0], True)
+    return merged[keep]
+
+
+class CandleStore:
+    """Local columnar candle store keyed by (exchange, category, symbol, interval)."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._locks = defaultdict(threading.Lock)
+
+    def _base_path(self, exchange: str, category: str, symbol: str, interval: str) -> str:
+        return os.path.join(self.root_dir, exchange, category, f"{symbol.upper()}_{interval}")
+
+    def _load(self, base_path: str) -> Optional[np.ndarray]:
+        """Memory-map the stored candles, or None if nothing is stored yet."""
+        try:
+            return np.load(f"{base_path}.npy", mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _load_meta(self, base_path: str) -> dict:
+        try:
+            with open(f"{base_path}.json") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self, base_path: str, candles: np.ndarray, meta: dict):
+        """Atomically replace the stored candles so concurrent readers never see a partial file."""
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(f"{base_path}.npy{tmp_suffix}", "wb") as f:
+            np.save(f, np.ascontiguousarray(candles, dtype=np.float64))
+        os.replace(f"{base_path}.npy{tmp_suffix}", f"{base_path}.npy")
+
+        with open(f"{base_path}.json{tmp_suffix}", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{base_path}.json{tmp_suffix}", f"{base_path}.json")
+
+    def get_candles(
+        self,
+        exchange: str,
+        category: str,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: int,
+        fetch: FetchFn,
+    ) -> np.ndarray:
+        """Get the candles with open time in [start_ms, end_ms], downloading only what is missing.
+
+        Args:
+            exchange: Exchange name, e.g. "bybit"
+            category: Market category, e.g. "spot" or "linear"
+            symbol: Exchange symbol, e.g. "BTCUSDT"
+            interval: Exchange interval code, e.g. "D" or "1d"
+            start_ms: Start open time in epoch milliseconds (inclusive)
+            end_ms: End open time in epoch milliseconds (inclusive)
+            fetch: Callable downloading the rows for an open time range from the exchange
+
+        Returns:
+            float64 array of candle rows ordered by open time
+        """
+        interval_ms = INTERVAL_MS[interval]
+        base_path = self._base_path(exchange, category, symbol, interval)
+
+        with self._locks[base_path]:
+            stored = self._load(base_path)
+            meta = self._load_meta(base_path)
+
+            fetched = []
+            if stored is None or not len(stored):
+                fetched.extend(fetch(start_ms, end_ms))
+                covered_from = start_ms
+            else:
+                first_ms, last_ms = int(stored[0, 0]), int(stored[-1, 0])
+                covered_from = min(meta.get("covered_from", first_ms), first_ms)
+
+                # Backfill history before the first stored bar (only once per requested start)
+                if start_ms < covered_from:
+                    fetched.extend(fetch(start_ms, covered_from - 1))
+                    covered_from = start_ms
+
+                # Only download the candles after the last stored bar
+                if end_ms >= last_ms + interval_ms:
+                    fetched.extend(fetch(last_ms + interval_ms, end_ms))
+
+            merged = merge_candles(stored, fetched)
+            if merged is None:
+                return np.empty((0, 0), dtype=np.float64)
+
+            if fetched:
+                # Never persist the bar that is still open, it will change until it closes
+                now_ms = int(time.time() * 1000)
+                closed = merged[merged[:, 0] + interval_ms <= now_ms]
+                self._save(base_path, closed, {"covered_from": covered_from})
+            elif covered_from != meta.get("covered_from"):
+                self._save(base_path, merged, {"covered_from": covered_from})
+
+        lo = np.searchsorted(merged[:, 0], start_ms, side="left")
+        hi = np.searchsorted(merged[:, 0], end_ms, side="right")
+        return np.array(merged[lo:hi])
+
+
+def get_candle_store() -> Optional[CandleStore]:
+    """Get the shared candle store, or None when it is disabled in the configuration."""
+    global _store
+    if not settings.CANDLE_STORE_ENABLED:
+        return None
+    if _store is None:
+        _store = CandleStore(settings.CANDLE_STORE_DIR)
+    return _store
+
+
+def format_price(value: float) -> str:
+    """Format a stored price without scientific notation or trailing zeros."""
+    return np.format_float_positional(value, trim="-")
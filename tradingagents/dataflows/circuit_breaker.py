@@ -0,0 +1,244 @@
+"""
+Per-vendor circuit breakers for the vendor router.
+
+A breaker opens after consecutive failures of its vendor so calls skip the
+vendor right away, lets a single probe request through once the recovery
+timeout has passed (half-open) and closes again when the probe succeeds.
+State is kept in Redis when enabled so all workers share it.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from tradingagents.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CIRCUIT_KEY = "circuit:{vendor}"
+CIRCUIT_PROBE_KEY = "circuit:{vendor}:probe"
+
+# The shared state is only changed by these scripts, so concurrent workers never overwrite
+# each other's failure counts or state changes. KEYS: circuit hash, probe key.
+
+# ARGV: failure threshold, now. Returns {opened (1 if the circuit was not open before), failures}
+FAILURE_SCRIPT = """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'half_open' or failures >= tonumber(ARGV[1]) then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', ARGV[2])
+    redis.call('DEL', KEYS[2])
+    if state ~= 'open' then
+        return {1, failures}
+    end
+end
+return {0, failures}
+"""
+
+# Returns 0 if nothing changed, 1 if the failure count was reset and 2 if the circuit closed
+SUCCESS_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local failures = tonumber(redis.call('HGET', KEYS[1], 'failures') or '0')
+if state == 'closed' and failures == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'state', 'closed', 'failures', 0, 'opened_at', 0)
+redis.call('DEL', KEYS[2])
+if state ~= 'closed' then
+    return 2
+end
+return 1
+"""
+
+# ARGV: now, recovery timeout, probe TTL. Returns 0 to reject, 1 to allow and 2 to allow as the probe
+ALLOW_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'closed' then
+    return 1
+end
+local opened_at = tonumber(redis.call('HGET', KEYS[1], 'opened_at') or '0')
+if state == 'open' and tonumber(ARGV[1]) - opened_at < tonumber(ARGV[2]) then
+    return 0
+end
+if not redis.call('SET', KEYS[2], '1', 'NX', 'EX', ARGV[3]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'state', 'half_open')
+return 2
+"""
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker of one vendor, optionally shared through Redis."""
+
+    def __init__(self, vendor: str, failure_threshold: int = 5, recovery_timeout: float = 60, redis_client=None):
+        """
+        Args:
+            vendor: Vendor name, e.g. "alpha_vantage"
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a probe request is allowed
+            redis_client: Optional Redis client to share the state between workers
+        """
+        self.vendor = vendor
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.redis = redis_client
+        self._lock = threading.Lock()
+        self._local = {"state": CLOSED, "failures": 0, "opened_at": 0.0}
+        self._local_probe_until = 0.0
+        if redis_client is not None:
+            self._failure_script = redis_client.register_script(FAILURE_SCRIPT)
+            self._success_script = redis_client.register_script(SUCCESS_SCRIPT)
+            self._allow_script = redis_client.register_script(ALLOW_SCRIPT)
+
+    @property
+    def _key(self) -> str:
+        return CIRCUIT_KEY.format(vendor=self.vendor)
+
+    @property
+    def _probe_key(self) -> str:
+        return CIRCUIT_PROBE_KEY.format(vendor=self.vendor)
+
+    def _load(self) -> dict:
+        if self.redis is None:
+            return dict(self._local)
+        raw = {k.decode(): v.decode() for k, v in self.redis.hgetall(self._key).items()}
+        return {
+            "state": raw.get("state", CLOSED),
+            "failures": int(raw.get("failures", 0)),
+            "opened_at": float(raw.get("opened_at", 0.0)),
+        }
+
+    def _store(self, **fields):
+        self._local.update(fields)
+
+    def _acquire_probe(self) -> bool:
+        """Let a single caller of this process probe the vendor."""
+        now = time.time()
+        if now < self._local_probe_until:
+            return False
+        self._local_probe_until = now + self.recovery_timeout
+        return True
+
+    def _release_probe(self):
+        self._local_probe_until = 0.0
+
+    @property
+    def _script_keys(self) -> List[str]:
+        return [self._key, self._probe_key]
+
+    def allow_request(self) -> bool:
+        """Check whether a call to the vendor may be made now."""
+        try:
+            if self.redis is not None:
+                allowed = int(self._allow_script(
+                    keys=self._script_keys,
+                    args=[time.time(), self.recovery_timeout, max(int(self.recovery_timeout), 1)],
+                ))
+            else:
+                with self._lock:
+                    allowed = self._allow_local()
+            if allowed == 2:
+                print(f"INFO: Circuit for vendor '{self.vendor}' is half-open, probing with a single request")
+            return allowed > 0
+        except Exception as e:
+            # Never block vendor calls because the breaker state is unavailable
+            print(f"WARNING: Could not read circuit state of vendor '{self.vendor}': {e}")
+            return True
+
+    def _allow_local(self) -> int:
+        state = self._load()
+        if state["state"] == CLOSED:
+            return 1
+        if state["state"] == OPEN and time.time() - state["opened_at"] < self.recovery_timeout:
+            return 0
+        if not self._acquire_probe():
+            return 0
+        self._store(state=HALF_OPEN)
+        return 2
+
+    def record_success(self):
+        try:
+            if self.redis is not None:
+                changed = int(self._success_script(keys=self._script_keys))
+            else:
+                with self._lock:
+                    changed = self._record_success_local()
+            if changed == 2:
+                print(f"INFO: Circuit for vendor '{self.vendor}' closed again")
+        except Exception as e:
+            print(f"WARNING: Could not update circuit state of vendor '{self.vendor}': {e}")
+
+    def _record_success_local(self) -> int:
+        state = self._load()
+        if state["state"] == CLOSED and state["failures"] == 0:
+            return 0
+        self._store(state=CLOSED, failures=0, opened_at=0.0)
+        self._release_probe()
+        return 2 if state["state"] != CLOSED else 1
+
+    def record_failure(self):
+        try:
+            if self.redis is not None:
+                opened, failures = self._failure_script(
+                    keys=self._script_keys, args=[self.failure_threshold, time.time()]
+                )
+            else:
+                with self._lock:
+                    opened, failures = self._record_failure_local()
+            if int(opened):
+                print(f"WARNING: Circuit for vendor '{self.vendor}' opened after {int(failures)} consecutive failure(s)")
+        except Exception as e:
+            print(f"WARNING: Could not update circuit state of vendor '{self.vendor}': {e}")
+
+    def _record_failure_local(self):
+        state = self._load()
+        failures = state["failures"] + 1
+        if state["state"] == HALF_OPEN or failures >= self.failure_threshold:
+            self._store(state=OPEN, failures=failures, opened_at=time.time())
+            self._release_probe()
+            return int(state["state"] != OPEN), failures
+        self._store(failures=failures)
+        return 0, failures
+
+    def get_state(self) -> dict:
+        """Get the current state for monitoring."""
+        try:
+            state = self._load()
+        except Exception as e:
+            return {"state": "unknown", "error": str(e)}
+        if state["state"] == OPEN:
+            state["retry_in"] = max(self.recovery_timeout - (time.time() - state["opened_at"]), 0.0)
+        return state
+
+
+def get_circuit_breaker(vendor: str) -> Optional[CircuitBreaker]:
+    """Get the circuit breaker of a vendor, or None when circuit breakers are disabled."""
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        return None
+    with _breakers_lock:
+        if vendor not in _breakers:
+            redis_client = None
+            if settings.CIRCUIT_BREAKER_REDIS:
+                from tradingagents.external.redis.client import get_redis_client
+                redis_client = get_redis_client()
+            _breakers[vendor] = CircuitBreaker(
+                vendor,
+                settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+                redis_client,
+            )
+        return _breakers[vendor]
+
+
+def get_circuit_states(vendors: List[str]) -> Dict[str, dict]:
+    """Get the circuit state of each vendor, e.g. for a monitoring endpoint."""
+    states = {}
+    for vendor in vendors:
+        breaker = get_circuit_breaker(vendor)
+        states[vendor] = breaker.get_state() if breaker else {"state": "disabled"}
+    return states
@@ -1,5 +1,6 @@
-import requests
 from tradingagents.config import settings
+from . import http_client
+from .rate_limiter import rate_limit
 
 def get_market_cap() -> str:
     """
@@ -10,7 +11,8 @@ def get_market_cap() -> str:
     """
     api_base_url = settings.COIN_GECKO_API_BASE_URL
     endpoint = f"{api_base_url}/global"
-    response = requests.get(endpoint)
+    rate_limit("coingecko")
+    response = http_client.get(endpoint)
     print(f"DEBUG: CoinGecko API response status code: {response.status_code}")
     response.raise_for_status()
     data = response.json()
@@ -0,0 +1,99 @@
+"""
+Shared HTTP transport for the dataflow vendors.
+
+One requests.Session with per-host keep-alive connection pools, default
+timeouts and retry with exponential backoff, so vendor calls reuse TCP/TLS
+connections instead of opening a new one per request.
+"""
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tradingagents.config import settings
+
+# Statuses worth retrying: rate limited or a transient server-side failure
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _create_session() -> requests.Session:
+    # Only idempotent methods are retried after a request was sent (urllib3 default),
+    # so e.g. a Bybit order POST is never submitted twice. Connection failures are always retried.
+    retry = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Get or create the shared HTTP session with lazy initialization."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session, applying the configured timeouts by default.
+
+    Args:
+        method: HTTP method, e.g. "GET"
+        url: Request URL
+        **kwargs: Any other ``requests`` argument (params, headers, json, data, timeout, ...)
+
+    Returns:
+        The ``requests.Response``
+    """
+    kwargs.setdefault("timeout", (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT))
+    return get_http_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def get_connection_stats() -> Dict[str, Dict[str, int]]:
+    """Get connection reuse statistics per host of the currently pooled connections.
+
+    Returns:
+        Dict mapping "scheme://host:port" to {"requests", "connections", "reused"},
+        where "reused" counts requests served over an already open connection
+    """
+    if _session is None:
+        return {}
+
+    stats = {}
+    adapters = {id(adapter): adapter for adapter in _session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            host_stats = stats.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+            host_stats["requests"] += pool.num_requests
+            host_stats["connections"] += pool.num_connections
+            host_stats["reused"] += max(pool.num_requests - pool.num_connections, 0)
+    return stats
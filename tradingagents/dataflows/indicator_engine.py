@@ -0,0 +1,366 @@
+"""
+Vectorized NumPy technical indicator engine.
+
+Computes the indicators the market analyst can request in a single pass over
+contiguous float64 arrays, sharing intermediate results (EMAs, true range,
+typical price) between indicators. Results match stockstats, which is only
+used as a fallback for indicators this engine does not implement.
+"""
+import re
+from typing import Dict, List
+
+import numpy as np
+
+INDICATOR_DESCRIPTIONS = {
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
+
+# Same defaults as stockstats
+MACD_WINDOWS = (12, 26, 9)
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+DEFAULT_WINDOWS = {"rsi": 14, "atr": 14, "vwma": 14, "mfi": 14}
+
+_MOVING_AVERAGE_RE = re.compile(r"^(open|high|low|close|volume)_(\d+)_(sma|ema)$")
+_WINDOWED_RE = re.compile(r"^(rsi|atr|vwma|mfi)(?:_(\d+))?$")
+
+
+def _linear_recurrence(values: np.ndarray, decay: float) -> np.ndarray:
+    """Compute y[t] = decay * y[t-1] + values[t] with y[-1] = 0.
+
+    Solved in closed form per chunk, y[s+k] = decay^k * (decay * y[s-1] + sum_j values[s+j] * decay^-j),
+    with chunks short enough that decay^-j cannot overflow.
+    """
+    n = len(values)
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    if decay == 0.0:
+        out[:] = values
+        return out
+
+    chunk = int(min(256, max(1, np.floor(np.log(1e15) / -np.log(decay))))) if decay < 1.0 else 256
+    powers = decay ** np.arange(chunk, dtype=np.float64)
+    inverse_powers = 1.0 / powers
+
+    carry = 0.0
+    for start in range(0, n, chunk):
+        block = values[start:start + chunk]
+        size = len(block)
+        scaled = np.cumsum(block * inverse_powers[:size])
+        scaled[:] += decay * carry
+        out[start:start + size] = scaled * powers[:size]
+        carry = out[start + size - 1]
+    return out
+
+
+def ewm_mean(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponentially weighted mean, same as pandas ``ewm(alpha=alpha, adjust=True).mean()``."""
+    decay = 1.0 - alpha
+    numerator = _linear_recurrence(values, decay)
+    denominator = _linear_recurrence(np.ones_like(values), decay)
+    return numerator / denominator
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average over ``span`` periods (stockstats ``ema``)."""
+    return ewm_mean(values, 2.0 / (span + 1.0))
+
+
+def smma(values: np.ndarray, window: int) -> np.ndarray:
+    """Smoothed moving average over ``window`` periods (stockstats ``smma``)."""
+    return ewm_mean(values, 1.0 / window)
+
+
+def _rolling_windows(values: np.ndarray, window: int):
+    """Get the trailing windows of every position, padded with NaN before the first value."""
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return windows, counts
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum with ``min_periods=1``."""
+    windows, _ = _rolling_windows(values, window)
+    return np.nansum(windows, axis=1)
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average with ``min_periods=1``."""
+    windows, counts = _rolling_windows(values, window)
+    return np.nansum(windows, axis=1) / counts
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Sample standard deviation (ddof=1) with ``min_periods=1``, NaN for a single value."""
+    windows, counts = _rolling_windows(values, window)
+    mean = np.nansum(windows, axis=1) / counts
+    deviations = np.nan_to_num(windows - mean[:, None])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sqrt(np.sum(deviations * deviations, axis=1) / (counts - 1))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range, using the first close as the previous close of the first bar."""
+    prev_close = np.empty_like(close)
+    prev_close[:1] = close[:1]
+    prev_close[1:] = close[:-1]
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.nan_to_num(tr)
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    diff = np.zeros_like(values)
+    diff[1:] = np.diff(values)
+    return diff
+
+
+def rsi(close: np.ndarray, window: int) -> np.ndarray:
+    diff = _diff(close)
+    up = smma(np.where(diff > 0, diff, 0.0), window)
+    down = smma(np.where(diff < 0, -diff, 0.0), window)
+    total = up + down
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(total != 0, 100 * (up / total), 50.0)
+    out[0] = 50.0
+    return out
+
+
+def vwma(typical_price: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray:
+    rolling_tpv = rolling_sum(volume * typical_price, window)
+    rolling_vol = rolling_sum(volume, window)
+    return np.divide(rolling_tpv, rolling_vol, out=np.zeros_like(rolling_tpv), where=rolling_vol != 0)
+
+
+def mfi(typical_price: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray:
+    """Money flow index as a 0-1 ratio, like stockstats."""
+    raw_money_flow = typical_price * volume
+    tp_diff = _diff(typical_price)
+    pos_sum = rolling_sum(np.where(tp_diff > 0, raw_money_flow, 0.0), window)
+    neg_sum = rolling_sum(np.where(tp_diff < 0, raw_money_flow, 0.0), window)
+    total_flow = pos_sum + neg_sum
+    out = np.divide(pos_sum, total_flow, out=np.full_like(pos_sum, 0.5), where=total_flow > 0)
+    out[:window] = 0.5
+    return out
+
+
+def _stockstats_fallback(columns: Dict[str, np.ndarray], indicators: List[str]) -> Dict[str, np.ndarray]:
+    """Compute indicators the engine does not implement with stockstats."""
+    import pandas as pd
+    from stockstats import StockDataFrame
+
+    stock = StockDataFrame.retype(pd.DataFrame(columns))
+    results = {}
+    for name in indicators:
+        try:
+            results[name] = np.asarray(stock[name], dtype=np.float64)
+        except Exception:
+            # stockstats raises KeyError, ValueError or UserWarning for names it cannot parse
+            continue
+    return results
+
+
+def compute_indicators(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    indicators: List[str],
+) -> Dict[str, np.ndarray]:
+    """Compute the requested indicators over candles ordered Oldest -> Newest.
+
+    Args:
+        open_, high, low, close, volume: float64 arrays of equal length
+        indicators: Indicator names, e.g. ["rsi", "close_200_sma", "macd"]
+
+    Returns:
+        Dict mapping each indicator that could be calculated to its values,
+        aligned with the input arrays. Unsupported indicators are left out.
+    """
+    columns = {
+        "open": np.ascontiguousarray(open_, dtype=np.float64),
+        "high": np.ascontiguousarray(high, dtype=np.float64),
+        "low": np.ascontiguousarray(low, dtype=np.float64),
+        "close": np.ascontiguousarray(close, dtype=np.float64),
+        "volume": np.ascontiguousarray(volume, dtype=np.float64),
+    }
+    cache = {}
+
+    def typical_price():
+        if "tp" not in cache:
+            cache["tp"] = (columns["close"] + columns["high"] + columns["low"]) / 3.0
+        return cache["tp"]
+
+    def macd_family():
+        if "macd" not in cache:
+            short_w, long_w, signal_w = MACD_WINDOWS
+            line = ema(columns["close"], short_w) - ema(columns["close"], long_w)
+            signal = ema(line, signal_w)
+            cache["macd"] = {"macd": line, "macds": signal, "macdh": line - signal}
+        return cache["macd"]
+
+    def boll_family():
+        if "boll" not in cache:
+            middle = sma(columns["close"], BOLL_WINDOW)
+            width = BOLL_STD_TIMES * rolling_std(columns["close"], BOLL_WINDOW)
+            cache["boll"] = {"boll": middle, "boll_ub": middle + width, "boll_lb": middle - width}
+        return cache["boll"]
+
+    results = {}
+    unsupported = []
+    for name in indicators:
+        if name in results:
+            continue
+        if name in ("macd", "macds", "macdh"):
+            results[name] = macd_family()[name]
+            continue
+        if name in ("boll", "boll_ub", "boll_lb"):
+            results[name] = boll_family()[name]
+            continue
+
+        match = _MOVING_AVERAGE_RE.match(name)
+        if match:
+            column, window, kind = match.group(1), int(match.group(2)), match.group(3)
+            if window > 0:
+                results[name] = sma(columns[column], window) if kind == "sma" else ema(columns[column], window)
+                continue
+
+        match = _WINDOWED_RE.match(name)
+        if match:
+            kind = match.group(1)
+            window = int(match.group(2)) if match.group(2) else DEFAULT_WINDOWS[kind]
+            if window > 0:
+                if kind == "rsi":
+                    results[name] = rsi(columns["close"], window)
+                elif kind == "atr":
+                    if "tr" not in cache:
+                        cache["tr"] = true_range(columns["high"], columns["low"], columns["close"])
+                    results[name] = smma(cache["tr"], window)
+                elif kind == "vwma":
+                    results[name] = vwma(typical_price(), columns["volume"], window)
+                else:
+                    results[name] = mfi(typical_price(), columns["volume"], window)
+                continue
+
+        unsupported.append(name)
+
+    if unsupported:
+        results.update(_stockstats_fallback(columns, unsupported))
+
+    return results
+
+
+if __name__ == "__main__":
+    # Benchmark the engine against the stockstats + per-date .loc path it replaces
+    import time
+    from datetime import datetime, timedelta
+
+    import pandas as pd
+    from stockstats import StockDataFrame
+
+    rng = np.random.default_rng(7)
+    n_days, look_back_days, repeats = 280, 30, 20
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+    open_ = close * (1 + rng.normal(0, 0.005, n_days))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, n_days))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, n_days))
+    volume = rng.uniform(1e3, 1e5, n_days)
+    first_day = datetime(2024, 1, 1)
+    dates = [(first_day + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(n_days)]
+    indicators = list(INDICATOR_DESCRIPTIONS)
+    window_dates = dates[-(look_back_days + 1):]
+
+    def stockstats_path():
+        df = pd.DataFrame({"date": dates, "open": open_, "high": high, "low": low, "close": close, "volume": volume})
+        stock = StockDataFrame.retype(df)
+        out = {}
+        for ind in indicators:
+            _ = stock[ind]
+            out[ind] = [stock.loc[date_str][ind] for date_str in window_dates]
+        return out
+
+    def engine_path():
+        values = compute_indicators(open_, high, low, close, volume, indicators)
+        return {ind: values[ind][-(look_back_days + 1):] for ind in indicators}
+
+    expected, actual = stockstats_path(), engine_path()
+    for ind in indicators:
+        np.testing.assert_allclose(actual[ind], np.asarray(expected[ind], dtype=np.float64), rtol=1e-9, atol=1e-9)
+    print(f"Outputs match stockstats for {len(indicators)} indicators")
+
+    for label, fn in (("stockstats + .loc", stockstats_path), ("numpy engine", engine_path)):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{label:>18}: {elapsed * 1000:8.2f} ms per call ({n_days} candles, {len(indicators)} indicators)")
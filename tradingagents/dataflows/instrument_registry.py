@@ -0,0 +1,159 @@
+"""
+Cached exchange instrument registry.
+
+Bulk-loads every instrument of the configured categories once, keeps them in
+memory (and optionally in Redis so all workers share one download) and answers
+symbol lookups locally until the snapshot expires.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+INSTRUMENTS_KEY = "instruments:{exchange}:{category}"
+
+# Minimum age of a snapshot before a lookup miss triggers a reload (e.g. for a new listing)
+MISS_RELOAD_SECONDS = 60
+
+# load_instruments(category) -> [{"symbol": ..., "baseCoin": ..., "quoteCoin": ...}, ...]
+LoadFn = Callable[[str], List[dict]]
+
+
+class InstrumentRegistry:
+    """In-memory (and optionally Redis-backed) registry of instruments per category."""
+
+    def __init__(
+        self,
+        exchange: str,
+        load_instruments: LoadFn,
+        ttl_seconds: int = 3600,
+        redis_client=None,
+    ):
+        """
+        Args:
+            exchange: Exchange name, used to namespace the Redis keys
+            load_instruments: Callable downloading all instruments of a category from the exchange
+            ttl_seconds: Age after which a snapshot is reloaded
+            redis_client: Optional Redis client to share snapshots between workers
+        """
+        self.exchange = exchange
+        self.load_instruments = load_instruments
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self._lock = threading.Lock()
+        # One loader per category, lookups never wait on the download of another category
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # category -> (loaded_at, {(BASE, QUOTE): symbol}), replaced as a whole on reload
+        self._snapshots: Dict[str, Tuple[float, Dict[Tuple[str, str], str]]] = {}
+
+    def _redis_key(self, category: str) -> str:
+        return INSTRUMENTS_KEY.format(exchange=self.exchange, category=category)
+
+    def _read_redis(self, category: str) -> Optional[Tuple[float, List[dict]]]:
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(self._redis_key(category))
+        except Exception as e:
+            print(f"WARNING: Could not read {self.exchange} {category} instruments from Redis: {e}")
+            return None
+        if raw is None:
+            return None
+        snapshot = json.loads(raw)
+        return snapshot["loaded_at"], snapshot["instruments"]
+
+    def _write_redis(self, category: str, loaded_at: float, instruments: List[dict]):
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(
+                self._redis_key(category),
+                json.dumps({"loaded_at": loaded_at, "instruments": instruments}),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            print(f"WARNING: Could not write {self.exchange} {category} instruments to Redis: {e}")
+
+    def _index(self, instruments: List[dict]) -> Dict[Tuple[str, str], str]:
+        return {
+            (item["baseCoin"].upper(), item["quoteCoin"].upper()): item["symbol"]
+            for item in instruments
+        }
+
+    def _is_fresh(self, category: str, max_age: float) -> bool:
+        cached = self._snapshots.get(category)
+        return cached is not None and time.time() - cached[0] < max_age
+
+    def refresh(self, category: str, max_age: Optional[float] = None):
+        """
+        Reload a category once its snapshot is older than ``max_age`` seconds (default: the TTL).
+        A fresh enough snapshot shared in Redis is used before downloading from the exchange.
+
+        The download runs outside the registry lock and the new snapshot is swapped in at once.
+        While another thread reloads a category, lookups keep using its previous snapshot and
+        only wait when there is none yet.
+        """
+        max_age = self.ttl_seconds if max_age is None else max_age
+        if self._is_fresh(category, max_age):
+            return
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(category, threading.Lock())
+        if not load_lock.acquire(blocking=category not in self._snapshots):
+            return
+
+        try:
+            # Another thread may have loaded it while this one waited
+            if self._is_fresh(category, max_age):
+                return
+
+            now = time.time()
+            shared = self._read_redis(category)
+            if shared is not None and now - shared[0] < max_age:
+                loaded_at, instruments = shared
+            else:
+                instruments = [
+                    {"symbol": item["symbol"], "baseCoin": item["baseCoin"], "quoteCoin": item["quoteCoin"]}
+                    for item in self.load_instruments(category)
+                ]
+                loaded_at = now
+                self._write_redis(category, loaded_at, instruments)
+                print(f"INFO: Loaded {len(instruments)} {self.exchange} {category} instruments")
+
+            self._snapshots[category] = (loaded_at, self._index(instruments))
+        finally:
+            load_lock.release()
+
+    def preload(self, categories: Iterable[str]):
+        """Load several categories concurrently, e.g. all of them when the registry is created."""
+        categories = list(categories)
+
+        def load(category):
+            try:
+                self.refresh(category)
+            except Exception as e:
+                # The first lookup of the category retries
+                print(f"WARNING: Could not preload {self.exchange} {category} instruments: {e}")
+
+        with ThreadPoolExecutor(max_workers=max(1, len(categories))) as executor:
+            list(executor.map(load, categories))
+
+    def get_symbol(self, base_coin: str, quote_coin: str, category: str = "spot") -> Optional[str]:
+        """
+        Look up the exchange symbol for a base/quote pair.
+
+        Returns:
+            The symbol (e.g. "BTCUSDT") or None if the pair is not listed
+        """
+        key = (base_coin.upper(), quote_coin.upper())
+        self.refresh(category)
+        loaded_at, index = self._snapshots[category]
+        symbol = index.get(key)
+
+        if symbol is None and time.time() - loaded_at >= MISS_RELOAD_SECONDS:
+            # The pair may have been listed after the snapshot was taken
+            self.refresh(category, max_age=MISS_RELOAD_SECONDS)
+            symbol = self._snapshots[category][1].get(key)
+
+        return symbol
@@ -1,4 +1,6 @@
 from typing import Annotated
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from tradingagents.config import settings
 
 # Import from vendor-specific modules
@@ -24,6 +26,10 @@ from .taapi import get_crypto_stats_indicators_window, get_crypto_stats_indicato
 
 # Configuration and routing logic
 from .config import get_config
+from .result_cache import get_result_cache, get_call_digest
+from .singleflight import get_singleflight
+from .circuit_breaker import get_circuit_breaker, get_circuit_states
+from .vendor_stats import get_vendor_stats
 from .bybit import (
     get_account_balance,
     get_open_orders,
@@ -177,6 +183,13 @@ VENDOR_METHODS = {
     },
 }
 
+_router_executor = None
+
+def get_vendor_circuit_states() -> dict:
+    """Get the circuit breaker state of every vendor for monitoring."""
+    vendors = sorted({vendor for impls in VENDOR_METHODS.values() for vendor in impls})
+    return get_circuit_states(vendors)
+
 def get_category_for_method(method: str) -> str:
     """Get the category that contains the specified method."""
     for category, info in TOOLS_CATEGORIES.items():
@@ -200,6 +213,171 @@ def get_vendor(category: str, method: str = None) -> str:
     data_vendors = settings.data_vendors
     return data_vendors.get(category, "default")
 
+def _get_router_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool used to call several vendors concurrently."""
+    global _router_executor
+    if _router_executor is None:
+        _router_executor = ThreadPoolExecutor(
+            max_workers=settings.ROUTER_MAX_WORKERS, thread_name_prefix="vendor-router"
+        )
+    return _router_executor
+
+def _call_vendor(method: str, vendor: str, args: tuple, kwargs: dict) -> list:
+    """Run every implementation of a vendor for a method, serving from the result cache when possible.
+
+    Returns:
+        The results of the implementations that succeeded (empty if all failed)
+    """
+    vendor_impl = VENDOR_METHODS[method][vendor]
+    cache = get_result_cache()
+
+    # Handle list of methods for a vendor
+    if isinstance(vendor_impl, list):
+        vendor_methods = [(impl, vendor) for impl in vendor_impl]
+        print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
+    else:
+        vendor_methods = [(vendor_impl, vendor)]
+
+    # Serve this vendor's results from the cache when possible
+    cached_results = cache.get(method, vendor, args, kwargs) if cache else None
+    if cached_results is not None:
+        print(f"DEBUG: Cache hit for {method} from vendor '{vendor}'")
+        return list(cached_results)
+
+    # Skip vendors whose circuit is open right away
+    breaker = get_circuit_breaker(vendor)
+    if breaker and not breaker.allow_request():
+        print(f"INFO: Circuit open for vendor '{vendor}', skipping it for {method}")
+        return []
+
+    def fetch():
+        return _run_vendor_methods(method, vendor, vendor_methods, args, kwargs, breaker, cache)
+
+    # Identical concurrent calls (in this process or, with Redis, any worker) share one fetch
+    flight = get_singleflight()
+    if flight:
+        return list(flight.do(f"{method}:{vendor}:{get_call_digest(args, kwargs)}", fetch))
+    return fetch()
+
+def _run_vendor_methods(method: str, vendor: str, vendor_methods: list, args: tuple, kwargs: dict, breaker, cache) -> list:
+    """Call the implementations of a vendor, recording the outcome in the stats, breaker and cache."""
+    vendor_results = []
+    started = time.monotonic()
+    for impl_func, vendor_name in vendor_methods:
+        try:
+            print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
+            result = impl_func(*args, **kwargs)
+            vendor_results.append(result)
+            print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
+                
+        except AlphaVantageRateLimitError as e:
+            if vendor == "alpha_vantage":
+                print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
+                print(f"DEBUG: Rate limit details: {e}")
+            # Continue to next vendor for fallback
+            continue
+        except Exception as e:
+            # Log error but continue with other implementations
+            print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
+            continue
+
+    get_vendor_stats().record(method, vendor, time.monotonic() - started, bool(vendor_results))
+    if breaker:
+        if vendor_results:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    # Only cache complete results, a partially failed vendor is retried next time
+    if cache and vendor_results and len(vendor_results) == len(vendor_methods):
+        cache.set(method, vendor, args, kwargs, vendor_results)
+
+    return vendor_results
+
+def _fan_out(method: str, vendors: list, args: tuple, kwargs: dict) -> list:
+    """Call several vendors concurrently and join their results in the given vendor order.
+
+    Vendors that fail or do not answer within ROUTER_VENDOR_TIMEOUT seconds are left out,
+    so the results of the others are still returned.
+    """
+    executor = _get_router_executor()
+    futures = [(vendor, executor.submit(_call_vendor, method, vendor, args, kwargs)) for vendor in vendors]
+    # All vendors start together, so a shared deadline is a per-vendor timeout
+    wait([future for _, future in futures], timeout=settings.ROUTER_VENDOR_TIMEOUT)
+
+    results = []
+    for vendor, future in futures:
+        if not future.done():
+            print(f"FAILED: Vendor '{vendor}' timed out after {settings.ROUTER_VENDOR_TIMEOUT}s for {method}")
+            continue
+        try:
+            vendor_results = future.result()
+        except Exception as e:
+            print(f"FAILED: Vendor '{vendor}' failed for {method}: {e}")
+            continue
+        if vendor_results:
+            results.extend(vendor_results)
+            print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+        else:
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+    return results
+
+def _get_hedge_delay(method: str, vendor: str) -> float:
+    """Get how long to wait for a vendor before also starting the next one: its p95 latency."""
+    p95 = get_vendor_stats().p95_latency(method, vendor)
+    if p95 is None:
+        return settings.ROUTER_HEDGE_DEFAULT_DELAY
+    return max(p95, settings.ROUTER_HEDGE_MIN_DELAY)
+
+def _call_hedged(method: str, vendors: list, primary_vendors: list, args: tuple, kwargs: dict):
+    """Call vendors in order, starting the next one when a vendor fails or exceeds its hedge delay.
+
+    Returns:
+        (results of the first vendor that succeeded, number of vendors started)
+    """
+    executor = _get_router_executor()
+    remaining = list(vendors)
+    pending = {}
+    attempts = 0
+
+    def start_next():
+        nonlocal attempts
+        vendor = remaining.pop(0)
+        attempts += 1
+        vendor_type = "PRIMARY" if vendor in primary_vendors else "FALLBACK"
+        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{attempts})")
+        pending[executor.submit(_call_vendor, method, vendor, args, kwargs)] = vendor
+        return vendor
+
+    last_started = start_next()
+    while pending:
+        hedge_delay = _get_hedge_delay(method, last_started) if remaining else None
+        done, _ = wait(list(pending), timeout=hedge_delay, return_when=FIRST_COMPLETED)
+
+        if not done:
+            print(f"INFO: Vendor '{last_started}' has not answered {method} within {hedge_delay:.1f}s, hedging with the next vendor")
+            last_started = start_next()
+            continue
+
+        for future in done:
+            vendor = pending.pop(future)
+            try:
+                vendor_results = future.result()
+            except Exception as e:
+                print(f"FAILED: Vendor '{vendor}' failed for {method}: {e}")
+                vendor_results = []
+            if vendor_results:
+                print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+                # Slower hedged calls keep running in the background and still update the cache and stats
+                return vendor_results, attempts
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+
+        # Replace the failed vendor(s) right away
+        if remaining:
+            last_started = start_next()
+
+    return [], attempts
+
 def route_to_vendor(method: str, *args, **kwargs):
     """Route method calls to appropriate vendor implementation with fallback support."""
     category = get_category_for_method(method)
@@ -214,81 +392,45 @@ def route_to_vendor(method: str, *args, **kwargs):
     # Get all available vendors for this method for fallback
     all_available_vendors = list(VENDOR_METHODS[method].keys())
     
-    # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks
-    fallback_vendors = primary_vendors.copy()
-    for vendor in all_available_vendors:
-        if vendor not in fallback_vendors:
-            fallback_vendors.append(vendor)
+    # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks,
+    # fastest and most reliable first according to the recent vendor statistics
+    fallback_vendors = primary_vendors + get_vendor_stats().order(
+        method, [vendor for vendor in all_available_vendors if vendor not in primary_vendors]
+    )
 
     # Debug: Print fallback ordering
     primary_str = " → ".join(primary_vendors)
     fallback_str = " → ".join(fallback_vendors)
     print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
 
-    # Track results and execution state
-    results = []
-    vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
-    successful_vendor = None
-
-    for vendor in fallback_vendors:
+    for vendor in primary_vendors:
         if vendor not in VENDOR_METHODS[method]:
-            if vendor in primary_vendors:
-                print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
-            continue
-
-        vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary_vendor = vendor in primary_vendors
-        vendor_attempt_count += 1
-
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
-
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
-
-        # Handle list of methods for a vendor
-        if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
-        else:
-            vendor_methods = [(vendor_impl, vendor)]
+            print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
+    vendors = [vendor for vendor in fallback_vendors if vendor in VENDOR_METHODS[method]]
+    vendor_attempt_count = len(vendors)
 
-        # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
+    if len(primary_vendors) > 1:
+        # Multiple vendor configs (comma-separated) collect from all sources, so query them concurrently
+        print(f"DEBUG: Querying {len(vendors)} vendors concurrently for {method}: [{', '.join(vendors)}]")
+        results = _fan_out(method, vendors, args, kwargs)
+    elif settings.ROUTER_HEDGING and len(vendors) > 1:
+        # Do not let a slow-but-alive vendor hold up the call when there are alternatives
+        results, vendor_attempt_count = _call_hedged(method, vendors, primary_vendors, args, kwargs)
+    else:
+        results = []
+        for attempt, vendor in enumerate(vendors, start=1):
+            # Debug: Print current attempt
+            vendor_type = "PRIMARY" if vendor in primary_vendors else "FALLBACK"
+            print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{attempt})")
 
-        # Add this vendor's results
-        if vendor_results:
-            results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-            
-            # Stopping logic: Stop after first successful vendor for single-vendor configs
-            # Multiple vendor configs (comma-separated) may want to collect from multiple sources
-            if len(primary_vendors) == 1:
+            vendor_results = _call_vendor(method, vendor, args, kwargs)
+            if vendor_results:
+                results.extend(vendor_results)
+                print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+                # Stop after first successful vendor for single-vendor configs
                 print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
+                vendor_attempt_count = attempt
                 break
-        else:
             print(f"FAILED: Vendor '{vendor}' produced no results")
 
     # Final result summary
@@ -1,8 +1,8 @@
 from typing import Annotated
 import pandas as pd
 import os
-import requests
 from .config import DATA_DIR
+from . import http_client
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
@@ -488,7 +488,7 @@ def get_fear_and_greed(
     """
 
     url = f"https://api.alternative.me/fng/?limit={look_back_days}&date_format=world"
-    response = requests.get(url)
+    response = http_client.get(url)
 
     data = response.json().get("data", [])
 
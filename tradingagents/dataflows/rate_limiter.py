@@ -0,0 +1,148 @@
+"""
+Token-bucket rate limiter for metered vendor APIs.
+
+Every bucket (a vendor, or a Bybit endpoint group) allows ``requests`` calls per
+``seconds`` with bursts up to ``requests``. Buckets live in Redis when enabled
+so all worker processes share one quota; callers wait for a token instead of
+hitting the vendor's limit.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+from tradingagents.config import settings
+
+RATE_LIMIT_KEY = "ratelimit:{bucket}"
+
+# Atomically refill the bucket and take a token. Returns "0" when a token was taken,
+# otherwise the seconds until one will be available.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+_limiter = None
+
+
+class RateLimitTimeout(Exception):
+    """Raised when no token became available within the maximum wait time."""
+    pass
+
+
+class RateLimiter:
+    """Token buckets per name, kept in Redis when a client is given and in memory otherwise."""
+
+    def __init__(self, limits: Dict[str, tuple], max_wait: float = 300, redis_client=None):
+        """
+        Args:
+            limits: Bucket name -> (requests, seconds)
+            max_wait: Maximum seconds a caller waits for a token
+            redis_client: Optional Redis client to share the buckets between workers
+        """
+        self.limits = limits
+        self.max_wait = max_wait
+        self.redis = redis_client
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT) if redis_client is not None else None
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, tuple] = {}
+        self._stats = defaultdict(lambda: {"acquired": 0, "throttled": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0})
+
+    def _take_local(self, bucket: str, capacity: float, rate: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, ts = self._buckets.get(bucket, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[bucket] = (tokens, now)
+            return wait
+
+    def _take(self, bucket: str, capacity: float, rate: float) -> float:
+        """Try to take a token, returning 0 on success or the seconds to wait before retrying."""
+        if self._script is None:
+            return self._take_local(bucket, capacity, rate)
+        try:
+            return float(self._script(keys=[RATE_LIMIT_KEY.format(bucket=bucket)], args=[capacity, rate]))
+        except Exception as e:
+            print(f"WARNING: Shared rate limiter unavailable for {bucket}, limiting this process only: {e}")
+            return self._take_local(bucket, capacity, rate)
+
+    def acquire(self, bucket: str):
+        """Block until a token of the bucket is available. Buckets without a limit return immediately.
+
+        Raises:
+            RateLimitTimeout: If no token became available within ``max_wait`` seconds
+        """
+        limit = self.limits.get(bucket)
+        if limit is None:
+            return
+        capacity, seconds = limit
+        rate = capacity / seconds
+
+        started = time.monotonic()
+        throttled = False
+        while True:
+            wait = self._take(bucket, capacity, rate)
+            if wait <= 0:
+                break
+            waited = time.monotonic() - started
+            if waited + wait > self.max_wait:
+                raise RateLimitTimeout(f"No {bucket} rate limit token available within {self.max_wait}s")
+            if not throttled:
+                print(f"DEBUG: Rate limit reached for {bucket}, waiting {wait:.2f}s for a token")
+            throttled = True
+            time.sleep(wait)
+
+        waited = time.monotonic() - started
+        with self._lock:
+            stats = self._stats[bucket]
+            stats["acquired"] += 1
+            if throttled:
+                stats["throttled"] += 1
+                stats["wait_seconds"] += waited
+                stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the acquired/throttled counts and wait times of this process per bucket."""
+        with self._lock:
+            return {bucket: dict(stats) for bucket, stats in self._stats.items()}
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Get the shared rate limiter, or None when it is disabled in the configuration."""
+    global _limiter
+    if not settings.RATE_LIMITER_ENABLED:
+        return None
+    if _limiter is None:
+        redis_client = None
+        if settings.RATE_LIMITER_REDIS:
+            from tradingagents.external.redis.client import get_redis_client
+            redis_client = get_redis_client()
+        _limiter = RateLimiter(settings.RATE_LIMITS, settings.RATE_LIMIT_MAX_WAIT, redis_client)
+    return _limiter
+
+
+def rate_limit(bucket: str):
+    """Wait for a token of the bucket when rate limiting is enabled."""
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        limiter.acquire(bucket)
@@ -0,0 +1,215 @@
+"""
+Result cache for the vendor router.
+
+Vendor results are cached per (method, vendor, normalized args) with a TTL that
+depends on the method and on whether the requested date window has already
+passed. Lookups go through an in-process LRU first and then, when enabled, a
+Redis tier shared by all workers.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from tradingagents.config import settings
+
+RESULT_CACHE_KEY = "route:cache:{method}:{vendor}:{digest}"
+
+# Seconds a result stays valid for live (or undated) requests, methods not listed are never cached
+METHOD_CACHE_TTLS = {
+    "get_crypto_data": 5 * 60,
+    "get_stock_data": 5 * 60,
+    "get_indicators": 5 * 60,
+    "get_indicators_bulk": 5 * 60,
+    "get_news": 15 * 60,
+    "get_global_news": 15 * 60,
+    "get_fear_and_greed": 60 * 60,
+    "get_market_cap": 60 * 60,
+    "get_fundamentals": 6 * 3600,
+    "get_whitepaper": 30 * 86400,
+    "get_balance_sheet": 86400,
+    "get_cashflow": 86400,
+    "get_income_statement": 86400,
+    "get_insider_sentiment": 6 * 3600,
+    "get_insider_transactions": 6 * 3600,
+    "get_account_balance": 15,
+    "get_open_orders": 15,
+}
+
+# Methods whose result for a date window that has fully passed never changes
+HISTORICAL_METHODS = {
+    "get_crypto_data",
+    "get_stock_data",
+    "get_indicators",
+    "get_indicators_bulk",
+    "get_news",
+    "get_global_news",
+}
+HISTORICAL_TTL = 30 * 86400
+
+# Seconds an empty or "no data" result is kept, vendors return them transiently too
+EMPTY_RESULT_TTL = 60
+# Longer texts are real payloads even if they start like a "no data" message
+EMPTY_RESULT_MAX_LENGTH = 300
+_EMPTY_RESULT_RE = re.compile(r"^no\b.*\b(data|results?|found|available|returned)\b", re.IGNORECASE | re.DOTALL)
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+_cache = None
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return value
+
+
+def get_call_digest(args: tuple, kwargs: dict) -> str:
+    """Hash the normalized arguments of a vendor call."""
+    payload = json.dumps(
+        {"args": _normalize(list(args)), "kwargs": _normalize(kwargs)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def get_cache_ttl(method: str, args: tuple, kwargs: dict) -> Optional[int]:
+    """Get how long a result of ``method`` called with these arguments may be cached.
+
+    Returns:
+        TTL in seconds, or None if the result must not be cached
+    """
+    ttl = METHOD_CACHE_TTLS.get(method)
+    if ttl is None or method not in HISTORICAL_METHODS:
+        return ttl
+
+    dates = [
+        value for value in list(args) + list(kwargs.values())
+        if isinstance(value, str) and _DATE_RE.match(value.strip())
+    ]
+    if dates and max(d.strip() for d in dates) < datetime.now().strftime("%Y-%m-%d"):
+        return HISTORICAL_TTL
+    return ttl
+
+
+def _is_cacheable(results: List[Any]) -> bool:
+    for result in results:
+        # Vendors report some failures as text instead of raising
+        if isinstance(result, str) and result.lstrip("# ").startswith("Error"):
+            return False
+    try:
+        json.dumps(results)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_empty(result: Any) -> bool:
+    if result is None:
+        return True
+    if isinstance(result, str):
+        text = result.strip().lstrip("# ")
+        return not text or (len(text) <= EMPTY_RESULT_MAX_LENGTH and bool(_EMPTY_RESULT_RE.match(text)))
+    if isinstance(result, (list, dict)):
+        return not result
+    return False
+
+
+class ResultCache:
+    """In-process LRU of vendor results with an optional shared Redis tier."""
+
+    def __init__(self, max_entries: int = 1024, redis_client=None):
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"memory_hits": 0, "redis_hits": 0, "misses": 0})
+
+    def make_key(self, method: str, vendor: str, args: tuple, kwargs: dict) -> str:
+        """Build the cache key of a vendor call from its normalized arguments."""
+        return RESULT_CACHE_KEY.format(method=method, vendor=vendor, digest=get_call_digest(args, kwargs))
+
+    def _remember(self, key: str, results: List[Any], expires_at: float):
+        with self._lock:
+            self._entries[key] = (expires_at, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, method: str, vendor: str, args: tuple, kwargs: dict) -> Optional[List[Any]]:
+        """Get the cached results of a vendor call, or None on a miss."""
+        if get_cache_ttl(method, args, kwargs) is None:
+            return None
+        key = self.make_key(method, vendor, args, kwargs)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._stats[method]["memory_hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(key)
+                if raw is not None:
+                    ttl = self.redis.ttl(key)
+                    results = json.loads(raw)
+                    self._remember(key, results, now + max(ttl, 1))
+                    with self._lock:
+                        self._stats[method]["redis_hits"] += 1
+                    return results
+            except Exception as e:
+                print(f"WARNING: Result cache read from Redis failed for {method}: {e}")
+
+        with self._lock:
+            self._stats[method]["misses"] += 1
+        return None
+
+    def set(self, method: str, vendor: str, args: tuple, kwargs: dict, results: List[Any]):
+        """Cache the results of a successful vendor call according to the TTL policy."""
+        ttl = get_cache_ttl(method, args, kwargs)
+        if ttl is None or not results or not _is_cacheable(results):
+            return
+        if any(_is_empty(result) for result in results):
+            # Negative cache, long enough to absorb a burst of identical calls
+            ttl = min(ttl, EMPTY_RESULT_TTL)
+        key = self.make_key(method, vendor, args, kwargs)
+        self._remember(key, results, time.time() + ttl)
+
+        if self.redis is not None:
+            try:
+                self.redis.set(key, json.dumps(results), ex=ttl)
+            except Exception as e:
+                print(f"WARNING: Result cache write to Redis failed for {method}: {e}")
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the hit/miss counters of this process per method."""
+        with self._lock:
+            return {method: dict(counters) for method, counters in self._stats.items()}
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the shared result cache, or None when it is disabled in the configuration."""
+    global _cache
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        redis_client = None
+        if settings.RESULT_CACHE_REDIS:
+            from tradingagents.external.redis.client import get_redis_client
+            redis_client = get_redis_client()
+        _cache = ResultCache(settings.RESULT_CACHE_MAX_ENTRIES, redis_client)
+    return _cache
@@ -0,0 +1,156 @@
+"""
+Singleflight coalescing of identical in-flight vendor calls.
+
+The first caller of a key does the fetch while identical concurrent callers
+wait for and share its result: threads of this process through an event,
+other worker processes through a Redis lock and a published result key.
+"""
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from tradingagents.config import settings
+
+SINGLEFLIGHT_LOCK_KEY = "singleflight:lock:{key}"
+SINGLEFLIGHT_RESULT_KEY = "singleflight:result:{key}"
+
+# Seconds a published result stays readable for processes still waiting on it
+RESULT_TTL = 10
+POLL_INTERVAL = 0.2
+
+# Delete the lock only if this caller still owns it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_singleflight = None
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs a function once per key for all concurrent callers, optionally across processes."""
+
+    def __init__(self, redis_client=None, lock_ttl: float = 120, wait_timeout: float = 120):
+        """
+        Args:
+            redis_client: Optional Redis client to coalesce calls across worker processes
+            lock_ttl: Seconds a process may hold a key before others stop waiting on it
+            wait_timeout: Maximum seconds to wait for another process before fetching anyway
+        """
+        self.redis = redis_client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._release = redis_client.register_script(RELEASE_SCRIPT) if redis_client is not None else None
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(
+        self, key: str, fn: Callable[[], Any], lock_ttl: Optional[float] = None, wait_timeout: Optional[float] = None
+    ) -> Any:
+        """Get the result of ``fn``, sharing one execution between all concurrent callers of ``key``.
+
+        Args:
+            lock_ttl: Overrides the group's lock TTL, for calls that take longer than vendor fetches
+            wait_timeout: Overrides the group's wait timeout
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_shared(
+                key,
+                fn,
+                self.lock_ttl if lock_ttl is None else lock_ttl,
+                self.wait_timeout if wait_timeout is None else wait_timeout,
+            )
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _do_shared(self, key: str, fn: Callable[[], Any], lock_ttl: float, wait_timeout: float) -> Any:
+        """Run ``fn`` unless another process already does, in which case wait for its published result."""
+        if self.redis is None:
+            return fn()
+
+        lock_key = SINGLEFLIGHT_LOCK_KEY.format(key=key)
+        result_key = SINGLEFLIGHT_RESULT_KEY.format(key=key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis.set(lock_key, token, nx=True, ex=max(int(lock_ttl), 1))
+        except Exception as e:
+            print(f"WARNING: Singleflight lock unavailable for {key}, fetching directly: {e}")
+            return fn()
+
+        if acquired:
+            try:
+                # Never hand out the result of an earlier flight
+                self.redis.delete(result_key)
+                result = fn()
+                try:
+                    self.redis.set(result_key, json.dumps(result), ex=RESULT_TTL)
+                except (TypeError, ValueError):
+                    # Not publishable, waiting processes fetch it themselves
+                    pass
+                return result
+            finally:
+                try:
+                    self._release(keys=[lock_key], args=[token])
+                except Exception as e:
+                    print(f"WARNING: Could not release singleflight lock {lock_key}: {e}")
+
+        print(f"DEBUG: Waiting for another worker's in-flight call {key}")
+        deadline = time.monotonic() + wait_timeout
+        try:
+            while time.monotonic() < deadline:
+                raw = self.redis.get(result_key)
+                if raw is not None:
+                    return json.loads(raw)
+                if not self.redis.exists(lock_key):
+                    # The result is published before the lock is released, so check once more
+                    raw = self.redis.get(result_key)
+                    if raw is not None:
+                        return json.loads(raw)
+                    break
+                time.sleep(POLL_INTERVAL)
+        except Exception as e:
+            print(f"WARNING: Could not wait for singleflight result of {key}: {e}")
+        return fn()
+
+
+def get_singleflight() -> Optional[SingleFlight]:
+    """Get the shared singleflight group, or None when it is disabled in the configuration."""
+    global _singleflight
+    if not settings.SINGLEFLIGHT_ENABLED:
+        return None
+    if _singleflight is None:
+        redis_client = None
+        if settings.SINGLEFLIGHT_REDIS:
+            from tradingagents.external.redis.client import get_redis_client
+            redis_client = get_redis_client()
+        _singleflight = SingleFlight(redis_client, settings.SINGLEFLIGHT_LOCK_TTL, settings.SINGLEFLIGHT_WAIT_TIMEOUT)
+    return _singleflight
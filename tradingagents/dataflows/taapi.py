@@ -1,6 +1,8 @@
 import requests
 from typing import Annotated, List
 from tradingagents.config import settings
+from . import http_client
+from .rate_limiter import rate_limit
 
 # This is for single indicator, unused for now but kept for reference
 def get_crypto_stats_indicators_window(
@@ -70,7 +72,8 @@ def get_crypto_stats_indicators_window(
 
     try:
         # Make the API request
-        response = requests.get(url, params=params)
+        rate_limit("taapi")
+        response = http_client.get(url, params=params)
         response.raise_for_status()  # Raise an exception for bad status codes
 
         # Get the JSON response
@@ -207,7 +210,8 @@ def get_crypto_stats_indicators(
 
     try:
         # Make the POST request to bulk API
-        response = requests.post(url, json=payload)
+        rate_limit("taapi")
+        response = http_client.post(url, json=payload)
         response.raise_for_status()
 
         # Get the JSON response
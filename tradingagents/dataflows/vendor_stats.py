@@ -0,0 +1,87 @@
+"""
+Rolling latency and error statistics per (method, vendor) for the vendor router.
+
+Used to derive the hedging delay of a vendor (its p95 latency) and to order
+fallback vendors by how fast and reliable they have recently been.
+"""
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Calls kept per (method, vendor)
+WINDOW_SIZE = 100
+# Calls needed before the statistics of a vendor are trusted
+MIN_SAMPLES = 5
+# Vendors failing at least this often are tried after all others
+UNHEALTHY_ERROR_RATE = 0.5
+
+_stats = None
+
+
+class VendorStats:
+    """Thread-safe rolling window of (latency, success) samples per method and vendor."""
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self._samples = defaultdict(lambda: deque(maxlen=window_size))
+        self._lock = threading.Lock()
+
+    def record(self, method: str, vendor: str, latency: float, ok: bool):
+        """Record the latency in seconds and the outcome of a vendor call."""
+        with self._lock:
+            self._samples[(method, vendor)].append((latency, ok))
+
+    def _get(self, method: str, vendor: str) -> list:
+        with self._lock:
+            return list(self._samples.get((method, vendor), ()))
+
+    def p95_latency(self, method: str, vendor: str) -> Optional[float]:
+        """Get the p95 latency of successful calls, or None without enough samples."""
+        latencies = [latency for latency, ok in self._get(method, vendor) if ok]
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return float(np.percentile(latencies, 95))
+
+    def error_rate(self, method: str, vendor: str) -> Optional[float]:
+        """Get the share of failed calls, or None without enough samples."""
+        samples = self._get(method, vendor)
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return sum(1 for _, ok in samples if not ok) / len(samples)
+
+    def order(self, method: str, vendors: List[str]) -> List[str]:
+        """Order vendors by health then p95 latency, keeping the given order for ties and unknowns.
+
+        Healthy vendors with statistics come first (fastest first), then vendors without
+        enough samples, then vendors failing at least UNHEALTHY_ERROR_RATE of the time.
+        """
+        def sort_key(vendor):
+            error_rate = self.error_rate(method, vendor)
+            p95 = self.p95_latency(method, vendor)
+            unhealthy = error_rate is not None and error_rate >= UNHEALTHY_ERROR_RATE
+            return unhealthy, p95 if p95 is not None else math.inf
+
+        return sorted(vendors, key=sort_key)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """Get the current statistics as {method: {vendor: {"calls", "p95_latency", "error_rate"}}}."""
+        with self._lock:
+            keys = list(self._samples.keys())
+        snapshot = defaultdict(dict)
+        for method, vendor in keys:
+            snapshot[method][vendor] = {
+                "calls": len(self._get(method, vendor)),
+                "p95_latency": self.p95_latency(method, vendor),
+                "error_rate": self.error_rate(method, vendor),
+            }
+        return dict(snapshot)
+
+
+def get_vendor_stats() -> VendorStats:
+    """Get the vendor statistics of this process."""
+    global _stats
+    if _stats is None:
+        _stats = VendorStats()
+    return _stats
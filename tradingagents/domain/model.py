@@ -11,11 +11,24 @@ class AnalysisStatus(str, Enum):
     DONE = "done"
     FAILED = "failed"
 
+def is_final_status(status: AnalysisStatus, final: Optional[bool] = None) -> bool:
+    """Whether a job in ``status`` will not change anymore.
+
+    A failed job is only final once RQ has no retries left, which the worker records
+    as ``final``. Records without the flag predate retries and treat every failure as final.
+    """
+    if status == AnalysisStatus.DONE:
+        return True
+    if status == AnalysisStatus.FAILED:
+        return True if final is None else final
+    return False
+
 @dataclass
 class JobResultStatus:
     status: AnalysisStatus
     result: Optional[str] = None
     message: Optional[str] = None
+    final: bool = False
 
 @dataclass
 class AnalysisMeta:
@@ -27,6 +40,8 @@ class AnalysisMeta:
     updated_at: float
     message: Optional[str] = None
     created_at: float = field(default_factory=time.time)
+    # Whether the status will not change anymore, see is_final_status
+    final: bool = False
 
     @staticmethod
     def new(job_id: str, user_id: str, symbol: str, trade_date: str) -> "AnalysisMeta":
@@ -1,11 +1,17 @@
 from redis import Redis, ConnectionPool
+from redis import asyncio as aioredis
+from redis.asyncio.retry import Retry as AsyncRetry
 from redis.backoff import ExponentialBackoff
 from redis.retry import Retry
 from redis.exceptions import ResponseError, DataError
 from tradingagents.config import settings
 import logging
 
+# Seconds a command of the sync client may wait for its reply, blocking reads must return sooner
+SOCKET_TIMEOUT = 5
+
 _client = None
+_async_client = None
 logger = logging.getLogger(__name__)
 
 def get_redis_client() -> Redis:
@@ -25,7 +31,7 @@ def get_redis_client() -> Redis:
                 decode_responses=False,  # Set to False to let RQ handle decoding
                 encoding='utf-8',
                 socket_connect_timeout=5,
-                socket_timeout=5,
+                socket_timeout=SOCKET_TIMEOUT,
                 health_check_interval=10,
                 retry=retry,
             )
@@ -38,3 +44,23 @@ def get_redis_client() -> Redis:
             raise
     
     return _client
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """Get or create the asyncio Redis client for code running in an event loop."""
+    global _async_client
+    if _async_client is None:
+        print(f"INFO: Creating async Redis client with host={settings.REDIS_HOST}, port={settings.REDIS_PORT}")
+        _async_client = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            db=settings.REDIS_DB,
+            decode_responses=False,
+            socket_connect_timeout=5,
+            # No read timeout, XREAD BLOCK and pub/sub listeners wait longer than any fixed one
+            socket_timeout=None,
+            health_check_interval=10,
+            retry=AsyncRetry(ExponentialBackoff(), retries=5),
+        )
+    return _async_client
@@ -1,40 +1,49 @@
+import json
 import time
-from tradingagents.external.redis.client import get_redis_client
-from tradingagents.domain.model import AnalysisMeta, AnalysisStatus
+from tradingagents.external.redis.client import SOCKET_TIMEOUT, get_async_redis_client, get_redis_client
+from tradingagents.domain.model import AnalysisMeta, AnalysisStatus, is_final_status
 from tradingagents.config import settings
-from rq import Queue, Retry
+from typing import Callable
+from rq import Queue
 from redis import Redis
+from redis import asyncio as aioredis
+from redis.client import Pipeline
 
 ANALYSIS_META_KEY = "analysis:meta:{user_id}:{job_id}"
 ANALYSIS_RESULT_KEY = "analysis:result:{job_id}"
 ANALYSIS_COOLDOWN_KEY = "tradingagents-analysis-cooldown-{user_id}:{symbol}"
+ANALYSIS_DEDUP_KEY = "analysis:dedup:{symbol}:{trade_date}:{fingerprint}"
+ANALYSIS_JOB_KEY = "analysis:job:{job_id}"
+ANALYSIS_JOB_USERS_KEY = "analysis:job:{job_id}:users"
+ANALYSIS_EVENTS_KEY = "analysis:events:{job_id}"
+ANALYSIS_NOTIFY_CHANNEL = "analysis:notify:{job_id}"
+ANALYSIS_NOTIFY_PATTERN = "analysis:notify:*"
+
+# Progress events kept per job stream
+ANALYSIS_EVENTS_MAXLEN = 1000
+
+class _RedisRepoBase:
+    """Key layout, hash parsing and pipeline writes shared by the sync and async repositories.
+
+    The ``_write_*`` helpers only buffer commands, so they work on sync and asyncio pipelines alike.
+    """
 
-class RedisRepo:
-    def __init__(self, redis: Redis):
-        self.redis = redis
-        
     def _decode_hash(self, data: dict[bytes, bytes]) -> dict[str, str]:
         return {k.decode(): v.decode() for k, v in data.items()}
 
-    def exists(self, key: str) -> bool:
-        return self.redis.exists(key) == 1
-    
     def create_cooldown_key(self, user_id: str, symbol: str) -> str:
         return ANALYSIS_COOLDOWN_KEY.format(user_id=user_id, symbol=symbol)
-    
-    def save_cooldown(self, user_id: str, symbol: str, job_id: str, ttl: int = 6 * 3600):
-        key = self.create_cooldown_key(user_id, symbol)
-        self.redis.set(key, job_id, ex=ttl)
 
-    def get_cooldown(self, user_id: str, symbol: str) -> tuple[str | None, int | None]:
-        key = self.create_cooldown_key(user_id, symbol)
+    def _meta_key(self, user_id: str, job_id: str) -> str:
+        return ANALYSIS_META_KEY.format(user_id=user_id, job_id=job_id)
 
-        job_id = self.redis.get(key)
-        if job_id is None:
-            return None, None
+    def _result_key(self, job_id: str) -> str:
+        return ANALYSIS_RESULT_KEY.format(job_id=job_id)
 
-        ttl = self.redis.ttl(key)
+    def _dedup_key(self, symbol: str, trade_date: str, fingerprint: str) -> str:
+        return ANALYSIS_DEDUP_KEY.format(symbol=symbol, trade_date=trade_date, fingerprint=fingerprint)
 
+    def _check_cooldown_ttl(self, key: str, ttl: int) -> int | None:
         # Redis TTL semantics:
         # -2 → key does not exist
         # -1 → key exists but has no expiry
@@ -42,57 +51,134 @@ class RedisRepo:
 
         if ttl < 0:
             print(f"WARNING: Cooldown key {key} has invalid TTL {ttl}.")
-            ttl = None
-
-        return job_id, ttl
-
-
-    def _meta_key(self, user_id: str, job_id: str) -> str:
-        return ANALYSIS_META_KEY.format(user_id=user_id, job_id=job_id)
+            return None
+        return ttl
 
-    def _result_key(self, job_id: str) -> str:
-        return ANALYSIS_RESULT_KEY.format(job_id=job_id)
-    
-    def create_analysis_meta(self, meta: AnalysisMeta, ttl: int = 7 * 24 * 3600):
-        self.redis.hset(
-            self._meta_key(meta.user_id, meta.job_id),
-            mapping={
-                "job_id": meta.job_id,
-                "trade_date": meta.trade_date,
-                "user_id": meta.user_id,
-                "symbol": meta.symbol,
-                "status": meta.status.value,
-                "updated_at": meta.updated_at,
-                "created_at": meta.created_at,
-            },
-        )
-        self.redis.expire(self._meta_key(meta.user_id, meta.job_id), ttl)
+    def _parse_final(self, data: dict[str, str], status: AnalysisStatus) -> bool:
+        return is_final_status(status, data["final"] == "1" if "final" in data else None)
 
-    def update_status_analysis_meta(self, user_id: str, job_id: str, status: AnalysisStatus, message: str = ""):
-        self.redis.hset(
-            self._meta_key(user_id, job_id),
-            mapping={
-                "status": status.value,
-                "message": message,
-                "updated_at": time.time(),
-            },
-        )
-
-    def get_analysis_meta(self, user_id: str, job_id: str) -> AnalysisMeta | None:
-        data = self.redis.hgetall(self._meta_key(user_id, job_id))
+    def _parse_analysis_meta(self, data: dict[bytes, bytes]) -> AnalysisMeta | None:
         if not data:
             return None
         data = self._decode_hash(data)
+        status = AnalysisStatus(data["status"])
         return AnalysisMeta(
             job_id=data["job_id"],
             user_id=data["user_id"],
             symbol=data["symbol"],
             message=data.get("message"),
             trade_date=data["trade_date"],
-            status=AnalysisStatus(data["status"]),
+            status=status,
             updated_at=float(data["updated_at"]),
             created_at=float(data["created_at"]) if "created_at" in data else 0.0,
+            final=self._parse_final(data, status),
+        )
+
+    def _parse_job_status(self, data: dict[bytes, bytes]) -> tuple[AnalysisStatus, str, bool] | tuple[None, None, None]:
+        if not data:
+            return None, None, None
+        data = self._decode_hash(data)
+        status = AnalysisStatus(data["status"])
+        return status, data.get("message", ""), self._parse_final(data, status)
+
+    def _parse_progress_events(self, streams) -> list[tuple[str, dict]]:
+        events = []
+        for _, entries in streams or []:
+            for event_id, fields in entries:
+                events.append((event_id.decode(), json.loads(fields[b"data"])))
+        return events
+
+    def _write_analysis_meta(self, pipe: Pipeline, meta: AnalysisMeta, ttl: int):
+        mapping = {
+            "job_id": meta.job_id,
+            "trade_date": meta.trade_date,
+            "user_id": meta.user_id,
+            "symbol": meta.symbol,
+            "status": meta.status.value,
+            "final": int(meta.final),
+            "updated_at": meta.updated_at,
+            "created_at": meta.created_at,
+        }
+        if meta.message:
+            mapping["message"] = meta.message
+        pipe.hset(self._meta_key(meta.user_id, meta.job_id), mapping=mapping)
+        pipe.expire(self._meta_key(meta.user_id, meta.job_id), ttl)
+
+    def _write_meta_status(self, pipe: Pipeline, user_id: str, job_id: str, status: AnalysisStatus, message: str, final: bool = False):
+        pipe.hset(
+            self._meta_key(user_id, job_id),
+            mapping={
+                "status": status.value,
+                "final": int(final),
+                "message": message,
+                "updated_at": time.time(),
+            },
+        )
+
+    def _write_job_status(self, pipe: Pipeline, job_id: str, status: AnalysisStatus, message: str, ttl: int, final: bool = False):
+        key = ANALYSIS_JOB_KEY.format(job_id=job_id)
+        pipe.hset(key, mapping={"status": status.value, "final": int(final), "message": message, "updated_at": time.time()})
+        pipe.expire(key, ttl)
+
+    def _write_job_user(self, pipe: Pipeline, job_id: str, user_id: str, ttl: int):
+        key = ANALYSIS_JOB_USERS_KEY.format(job_id=job_id)
+        pipe.sadd(key, user_id)
+        pipe.expire(key, ttl)
+
+    def _write_progress_event(self, pipe: Pipeline, job_id: str, event: dict, ttl: int):
+        key = ANALYSIS_EVENTS_KEY.format(job_id=job_id)
+        data = json.dumps(event)
+        pipe.xadd(
+            key,
+            {"type": event.get("type", ""), "data": data, "ts": time.time()},
+            maxlen=ANALYSIS_EVENTS_MAXLEN,
+            approximate=True,
         )
+        pipe.expire(key, ttl)
+        # Live subscribers such as the Telegram bot get the event pushed as well
+        pipe.publish(ANALYSIS_NOTIFY_CHANNEL.format(job_id=job_id), data)
+
+    def _write_status_update(self, pipe: Pipeline, job_id: str, user_ids: list[str], status: AnalysisStatus, message: str, final: bool, ttl: int):
+        self._write_job_status(pipe, job_id, status, message, ttl, final)
+        for user_id in user_ids:
+            self._write_meta_status(pipe, user_id, job_id, status, message, final)
+        self._write_progress_event(pipe, job_id, {"type": "status", "status": status.value, "message": message, "final": final}, ttl)
+
+    def _write_attach(self, pipe: Pipeline, meta: AnalysisMeta, shared_job_id: str, data: dict[str, str], cooldown_key: str, cooldown_ttl: int, ttl: int) -> AnalysisStatus:
+        status = AnalysisStatus(data["status"])
+        shared_meta = AnalysisMeta.new(shared_job_id, meta.user_id, meta.symbol, meta.trade_date)
+        shared_meta.status = status
+        shared_meta.message = data.get("message")
+        shared_meta.final = self._parse_final(data, status)
+        self._write_job_user(pipe, shared_job_id, meta.user_id, ttl)
+        self._write_analysis_meta(pipe, shared_meta, ttl)
+        pipe.set(cooldown_key, shared_job_id, ex=cooldown_ttl)
+        return status
+
+    def _write_new_job(self, pipe: Pipeline, meta: AnalysisMeta, dedup_key: str, cooldown_key: str, cooldown_ttl: int, dedup_ttl: int, ttl: int):
+        self._write_job_status(pipe, meta.job_id, meta.status, "", ttl)
+        self._write_job_user(pipe, meta.job_id, meta.user_id, ttl)
+        self._write_analysis_meta(pipe, meta, ttl)
+        pipe.set(dedup_key, meta.job_id, ex=dedup_ttl)
+        pipe.set(cooldown_key, meta.job_id, ex=cooldown_ttl)
+
+
+class RedisRepo(_RedisRepoBase):
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    def exists(self, key: str) -> bool:
+        return self.redis.exists(key) == 1
+
+    def update_status_analysis_meta(self, user_id: str, job_id: str, status: AnalysisStatus, message: str = "", pipeline: Pipeline | None = None):
+        """Update the status of a user's analysis meta, buffered on ``pipeline`` when one is given."""
+        pipe = pipeline if pipeline is not None else self.redis.pipeline(transaction=False)
+        self._write_meta_status(pipe, user_id, job_id, status, message)
+        if pipeline is None:
+            pipe.execute()
+
+    def get_analysis_meta(self, user_id: str, job_id: str) -> AnalysisMeta | None:
+        return self._parse_analysis_meta(self.redis.hgetall(self._meta_key(user_id, job_id)))
 
     def save_result(self, job_id: str, final_trade: str, ttl: int = 7 * 24 * 3600):
         '''
@@ -103,6 +189,153 @@ class RedisRepo:
     def get_result(self, job_id: str) -> str | None:
         return self.redis.get(self._result_key(job_id))
 
+    def get_job_status(self, job_id: str) -> tuple[AnalysisStatus, str, bool] | tuple[None, None, None]:
+        return self._parse_job_status(self.redis.hgetall(ANALYSIS_JOB_KEY.format(job_id=job_id)))
+
+    def update_job_status(self, job_id: str, status: AnalysisStatus, message: str = "", final: bool | None = None, ttl: int = 7 * 24 * 3600):
+        """Set the job status and the analysis meta of every attached user in one transaction.
+
+        The users set is watched, so a user attaching concurrently either is included
+        or retries the transaction and sees the new status.
+
+        Args:
+            final: Whether the status will not change anymore, False for a failure RQ will retry.
+                Defaults to ``is_final_status(status)``
+        """
+        final = is_final_status(status, final)
+        users_key = ANALYSIS_JOB_USERS_KEY.format(job_id=job_id)
+
+        def update(pipe: Pipeline):
+            user_ids = [user_id.decode() for user_id in pipe.smembers(users_key)]
+            pipe.multi()
+            self._write_status_update(pipe, job_id, user_ids, status, message, final, ttl)
+
+        self.redis.transaction(update, users_key, ANALYSIS_JOB_KEY.format(job_id=job_id))
+
+    def add_progress_event(self, job_id: str, event: dict, ttl: int = 7 * 24 * 3600) -> None:
+        """Append a progress event of a job to its Redis Stream."""
+        pipe = self.redis.pipeline(transaction=False)
+        self._write_progress_event(pipe, job_id, event, ttl)
+        pipe.execute()
+
+    def read_progress_events(self, job_id: str, last_id: str = "0", block_ms: int | None = None, count: int = 100) -> list[tuple[str, dict]]:
+        """Read the progress events of a job after ``last_id``.
+
+        Args:
+            last_id: Stream id of the last event already seen, "0" to read from the start
+            block_ms: Milliseconds to wait for new events, None to return immediately. Capped
+                below the client's socket timeout, which would otherwise fail the read
+
+        Returns:
+            List of (event id, event dict) tuples, empty when nothing arrived in time
+        """
+        if block_ms is not None:
+            block_ms = min(block_ms, SOCKET_TIMEOUT * 1000 - 500)
+        streams = self.redis.xread({ANALYSIS_EVENTS_KEY.format(job_id=job_id): last_id}, count=count, block=block_ms)
+        return self._parse_progress_events(streams)
+
+    def reserve_analysis(
+        self,
+        meta: AnalysisMeta,
+        fingerprint: str,
+        enqueue: Callable[[Pipeline], object],
+        cooldown_ttl: int = 6 * 3600,
+        dedup_ttl: int = 6 * 3600,
+        ttl: int = 7 * 24 * 3600,
+    ) -> tuple[str, str, AnalysisStatus | int | None]:
+        """Check the cooldown, then attach to a shared job or create and push a new one, atomically.
+
+        The cooldown, dedup and shared job keys are watched and all writes, including the
+        job push done by ``enqueue`` on the given pipeline, are sent in a single MULTI/EXEC.
+        A concurrent request changing any watched key makes the transaction retry, so two
+        requests can never both pass the cooldown check.
+
+        Args:
+            meta: Analysis meta of the requesting user for the new job
+            fingerprint: Configuration fingerprint the dedup key is built from
+            enqueue: Buffers the queue push of ``meta.job_id`` on the pipeline it is given
+
+        Returns:
+            ("on_cooldown", job_id, ttl), ("attached", shared_job_id, status) or ("enqueued", job_id, status)
+        """
+        cooldown_key = self.create_cooldown_key(meta.user_id, meta.symbol)
+        dedup_key = self._dedup_key(meta.symbol, meta.trade_date, fingerprint)
+
+        def reserve(pipe: Pipeline):
+            cooldown_job_id = pipe.get(cooldown_key)
+            if cooldown_job_id is not None:
+                return "on_cooldown", cooldown_job_id.decode(), self._check_cooldown_ttl(cooldown_key, pipe.ttl(cooldown_key))
+
+            shared_job_id = pipe.get(dedup_key)
+            if shared_job_id is not None:
+                shared_job_id = shared_job_id.decode()
+                job_key = ANALYSIS_JOB_KEY.format(job_id=shared_job_id)
+                pipe.watch(job_key)
+                data = pipe.hgetall(job_key)
+                job_status, _, final = self._parse_job_status(data)
+                # A failure RQ still retries can be attached to, only a final one is analyzed again
+                if data and not (job_status == AnalysisStatus.FAILED and final):
+                    pipe.multi()
+                    status = self._write_attach(pipe, meta, shared_job_id, self._decode_hash(data), cooldown_key, cooldown_ttl, ttl)
+                    return "attached", shared_job_id, status
+
+            pipe.multi()
+            self._write_new_job(pipe, meta, dedup_key, cooldown_key, cooldown_ttl, dedup_ttl, ttl)
+            enqueue(pipe)
+            return "enqueued", meta.job_id, meta.status
+
+        return self.redis.transaction(reserve, cooldown_key, dedup_key, value_from_callable=True)
+
+
+class AsyncRedisRepo(_RedisRepoBase):
+    """asyncio counterpart of RedisRepo for the webapp and bot event loops."""
+
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+
+    async def exists(self, key: str) -> bool:
+        return await self.redis.exists(key) == 1
+
+    async def update_status_analysis_meta(self, user_id: str, job_id: str, status: AnalysisStatus, message: str = ""):
+        pipe = self.redis.pipeline(transaction=False)
+        self._write_meta_status(pipe, user_id, job_id, status, message)
+        await pipe.execute()
+
+    async def get_analysis_meta(self, user_id: str, job_id: str) -> AnalysisMeta | None:
+        return self._parse_analysis_meta(await self.redis.hgetall(self._meta_key(user_id, job_id)))
+
+    async def save_result(self, job_id: str, final_trade: str, ttl: int = 7 * 24 * 3600):
+        await self.redis.set(self._result_key(job_id), final_trade, ex=ttl)
+
+    async def get_result(self, job_id: str) -> str | None:
+        return await self.redis.get(self._result_key(job_id))
+
+    async def get_job_status(self, job_id: str) -> tuple[AnalysisStatus, str, bool] | tuple[None, None, None]:
+        return self._parse_job_status(await self.redis.hgetall(ANALYSIS_JOB_KEY.format(job_id=job_id)))
+
+    async def update_job_status(self, job_id: str, status: AnalysisStatus, message: str = "", final: bool | None = None, ttl: int = 7 * 24 * 3600):
+        """Set the job status and the analysis meta of every attached user in one transaction."""
+        final = is_final_status(status, final)
+        users_key = ANALYSIS_JOB_USERS_KEY.format(job_id=job_id)
+
+        async def update(pipe):
+            user_ids = [user_id.decode() for user_id in await pipe.smembers(users_key)]
+            pipe.multi()
+            self._write_status_update(pipe, job_id, user_ids, status, message, final, ttl)
+
+        await self.redis.transaction(update, users_key, ANALYSIS_JOB_KEY.format(job_id=job_id))
+
+    async def add_progress_event(self, job_id: str, event: dict, ttl: int = 7 * 24 * 3600) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        self._write_progress_event(pipe, job_id, event, ttl)
+        await pipe.execute()
+
+    async def read_progress_events(self, job_id: str, last_id: str = "0", block_ms: int | None = None, count: int = 100) -> list[tuple[str, dict]]:
+        """Read the progress events of a job after ``last_id``, waiting up to ``block_ms`` without blocking the loop."""
+        streams = await self.redis.xread({ANALYSIS_EVENTS_KEY.format(job_id=job_id): last_id}, count=count, block=block_ms)
+        return self._parse_progress_events(streams)
+
 
 redis_repo = RedisRepo(get_redis_client())
-redis_queue = Queue(connection=get_redis_client(), retry=Retry(max=settings.RQ_RETRIES, interval=settings.RQ_INTERVALS))
+async_redis_repo = AsyncRedisRepo(get_async_redis_client())
+redis_queue = Queue(connection=get_redis_client())
@@ -4,6 +4,7 @@ from .trading_graph import TradingAgentsGraph
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
+from .prefetch import DataPrefetcher
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
 
@@ -12,6 +13,7 @@ __all__ = [
     "ConditionalLogic",
     "GraphSetup",
     "Propagator",
+    "DataPrefetcher",
     "Reflector",
     "SignalProcessor",
 ]
@@ -0,0 +1,225 @@
+# TradingAgents/graph/checkpointer.py
+
+import json
+import pickle
+from typing import Any, Dict, Iterator, Optional
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from tradingagents.config import settings
+
+CHECKPOINT_STORAGE_KEY = "graph:checkpoint:{thread_id}:storage"
+CHECKPOINT_WRITES_KEY = "graph:checkpoint:{thread_id}:writes"
+CHECKPOINT_BLOBS_KEY = "graph:checkpoint:{thread_id}:blobs"
+
+# Layout of the hashes below, stored in the storage hash. Threads written in another
+# layout, e.g. by an older worker, are dropped instead of loaded.
+CHECKPOINT_FORMAT_VERSION = "2"
+CHECKPOINT_FORMAT_FIELD = "format"
+
+_checkpointer = None
+
+
+def _field(*parts: Any) -> str:
+    return json.dumps(parts)
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """LangGraph checkpoint saver that stores every thread in Redis.
+
+    Each thread has three hashes: checkpoints by (namespace, checkpoint id), channel
+    values by (namespace, channel, version) and pending writes by (namespace, checkpoint
+    id, task id, index). Values are serialized with the saver's ``serde`` and only
+    builtin tuples of its output are pickled, so the layout does not depend on the
+    langgraph-checkpoint version. Using the job id as thread id lets a retried job
+    resume from the last completed node, in any worker.
+    """
+
+    def __init__(self, redis_client, ttl: int = 24 * 3600):
+        """
+        Args:
+            redis_client: Redis client (bytes responses) holding the checkpoints
+            ttl: Seconds the checkpoints of a thread are kept after its last write
+        """
+        super().__init__()
+        self.redis = redis_client
+        self.ttl = ttl
+
+    def _keys(self, thread_id: str) -> tuple:
+        return (
+            CHECKPOINT_STORAGE_KEY.format(thread_id=thread_id),
+            CHECKPOINT_WRITES_KEY.format(thread_id=thread_id),
+            CHECKPOINT_BLOBS_KEY.format(thread_id=thread_id),
+        )
+
+    def _expire(self, pipe, thread_id: str):
+        for key in self._keys(thread_id):
+            pipe.expire(key, self.ttl)
+
+    def _load_checkpoints(self, thread_id: str, checkpoint_ns: Optional[str]) -> Dict[tuple, tuple]:
+        """Load the (namespace, checkpoint id) -> (checkpoint, metadata, parent id) entries of a thread."""
+        storage = self.redis.hgetall(self._keys(thread_id)[0])
+        if not storage:
+            return {}
+        version = storage.pop(CHECKPOINT_FORMAT_FIELD.encode(), b"").decode()
+        if version != CHECKPOINT_FORMAT_VERSION:
+            print(
+                f"WARNING: Dropping graph checkpoints of thread {thread_id} stored in format "
+                f"{version or 'unknown'}, expected {CHECKPOINT_FORMAT_VERSION}"
+            )
+            self.redis.delete(*self._keys(thread_id))
+            return {}
+
+        checkpoints = {}
+        for field, value in storage.items():
+            ns, checkpoint_id = json.loads(field)
+            if checkpoint_ns is None or ns == checkpoint_ns:
+                checkpoints[(ns, checkpoint_id)] = pickle.loads(value)
+        return checkpoints
+
+    def _make_tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, entry: tuple) -> CheckpointTuple:
+        checkpoint_typed, metadata_typed, parent_checkpoint_id = entry
+        checkpoint = self.serde.loads_typed(checkpoint_typed)
+        writes_key, blobs_key = self._keys(thread_id)[1:]
+
+        blob_fields = [_field(checkpoint_ns, channel, version) for channel, version in checkpoint["channel_versions"].items()]
+        channel_values = {}
+        if blob_fields:
+            for (channel, _), blob in zip(checkpoint["channel_versions"].items(), self.redis.hmget(blobs_key, blob_fields)):
+                if blob is None:
+                    continue
+                value_typed = pickle.loads(blob)
+                if value_typed[0] != "empty":
+                    channel_values[channel] = self.serde.loads_typed(value_typed)
+
+        # Pending writes in the order live execution applies them: task path, task id, index
+        writes = []
+        for field, value in self.redis.hgetall(writes_key).items():
+            ns, write_checkpoint_id, task_id, idx = json.loads(field)
+            if ns == checkpoint_ns and write_checkpoint_id == checkpoint_id:
+                channel, value_typed, task_path = pickle.loads(value)
+                writes.append(((task_path, task_id, idx), (task_id, channel, self.serde.loads_typed(value_typed))))
+        writes.sort(key=lambda write: write[0])
+
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed(metadata_typed),
+            pending_writes=[write for _, write in writes],
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_checkpoint_id}}
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoints = self._load_checkpoints(thread_id, checkpoint_ns)
+        if not checkpoints:
+            return None
+
+        checkpoint_id = get_checkpoint_id(config) or max(checkpoint_id for _, checkpoint_id in checkpoints)
+        entry = checkpoints.get((checkpoint_ns, checkpoint_id))
+        if entry is None:
+            return None
+        return self._make_tuple(thread_id, checkpoint_ns, checkpoint_id, entry)
+
+    def list(self, config, *, filter=None, before=None, limit=None) -> Iterator[CheckpointTuple]:
+        if not config:
+            # Threads are only looked up by id, listing every thread would scan Redis
+            return
+        thread_id = config["configurable"]["thread_id"]
+        checkpoints = self._load_checkpoints(thread_id, config["configurable"].get("checkpoint_ns"))
+        config_checkpoint_id = get_checkpoint_id(config)
+        before_checkpoint_id = get_checkpoint_id(before) if before else None
+
+        # Newest first, like the other savers
+        for (checkpoint_ns, checkpoint_id), entry in sorted(checkpoints.items(), key=lambda item: item[0][1], reverse=True):
+            if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                continue
+            if before_checkpoint_id and checkpoint_id >= before_checkpoint_id:
+                continue
+            if filter:
+                metadata = self.serde.loads_typed(entry[1])
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            if limit is not None and limit <= 0:
+                break
+            if limit is not None:
+                limit -= 1
+            yield self._make_tuple(thread_id, checkpoint_ns, checkpoint_id, entry)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoint = checkpoint.copy()
+        values = checkpoint.pop("channel_values")
+
+        storage_key, _, blobs_key = self._keys(thread_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(storage_key, mapping={
+            CHECKPOINT_FORMAT_FIELD: CHECKPOINT_FORMAT_VERSION,
+            _field(checkpoint_ns, checkpoint["id"]): pickle.dumps((
+                self.serde.dumps_typed(checkpoint),
+                self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+                config["configurable"].get("checkpoint_id"),
+            )),
+        })
+        if new_versions:
+            pipe.hset(blobs_key, mapping={
+                _field(checkpoint_ns, channel, version): pickle.dumps(
+                    self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+                )
+                for channel, version in new_versions.items()
+            })
+        self._expire(pipe, thread_id)
+        pipe.execute()
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        _, writes_key, _ = self._keys(thread_id)
+
+        regular, special = {}, {}
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            # Special channels (errors, interrupts) are replaced, regular writes are kept once
+            target = special if idx < 0 else regular
+            target[_field(checkpoint_ns, checkpoint_id, task_id, idx)] = pickle.dumps(
+                (channel, self.serde.dumps_typed(value), task_path)
+            )
+        if not regular and not special:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        for field, value in regular.items():
+            pipe.hsetnx(writes_key, field, value)
+        if special:
+            pipe.hset(writes_key, mapping=special)
+        self._expire(pipe, thread_id)
+        pipe.execute()
+
+    def delete_thread(self, thread_id: str):
+        """Delete the checkpoints of a thread."""
+        self.redis.delete(*self._keys(thread_id))
+
+
+def get_graph_checkpointer() -> Optional[RedisCheckpointSaver]:
+    """Get the shared graph checkpointer, or None when checkpointing is disabled in the configuration."""
+    global _checkpointer
+    if not settings.GRAPH_CHECKPOINT_ENABLED:
+        return None
+    if _checkpointer is None:
+        from tradingagents.external.redis.client import get_redis_client
+        _checkpointer = RedisCheckpointSaver(get_redis_client(), settings.GRAPH_CHECKPOINT_TTL)
+    return _checkpointer
@@ -1,19 +1,24 @@
 # TradingAgents/graph/conditional_logic.py
 
-from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.agent_states import AgentState, get_analyst_messages_key
 
 
 class ConditionalLogic:
     """Handles conditional logic for determining graph flow."""
 
-    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1):
+    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1, parallel_analysts=False):
         """Initialize with configuration parameters."""
         self.max_debate_rounds = max_debate_rounds
         self.max_risk_discuss_rounds = max_risk_discuss_rounds
+        self.parallel_analysts = parallel_analysts
+
+    def _analyst_messages(self, state: AgentState, analyst_type: str):
+        """Get the message channel of an analyst."""
+        return state[get_analyst_messages_key(analyst_type, self.parallel_analysts)]
 
     def should_continue_market(self, state: AgentState):
         """Determine if market analysis should continue."""
-        messages = state["messages"]
+        messages = self._analyst_messages(state, "market")
         last_message = messages[-1]
         if last_message.tool_calls:
             return "tools_market"
@@ -21,7 +26,7 @@ class ConditionalLogic:
 
     def should_continue_social(self, state: AgentState):
         """Determine if social media analysis should continue."""
-        messages = state["messages"]
+        messages = self._analyst_messages(state, "social")
         last_message = messages[-1]
         if last_message.tool_calls:
             return "tools_social"
@@ -29,7 +34,7 @@ class ConditionalLogic:
 
     def should_continue_news(self, state: AgentState):
         """Determine if news analysis should continue."""
-        messages = state["messages"]
+        messages = self._analyst_messages(state, "news")
         last_message = messages[-1]
         if last_message.tool_calls:
             return "tools_news"
@@ -37,7 +42,7 @@ class ConditionalLogic:
 
     def should_continue_fundamentals(self, state: AgentState):
         """Determine if fundamentals analysis should continue."""
-        messages = state["messages"]
+        messages = self._analyst_messages(state, "fundamentals")
         last_message = messages[-1]
         if last_message.tool_calls:
             return "tools_fundamentals"
@@ -45,7 +50,7 @@ class ConditionalLogic:
     
     def should_continue_profile(self, state: AgentState):
         """Determine if profile analysis should continue."""
-        messages = state["messages"]
+        messages = self._analyst_messages(state, "profile")
         last_message = messages[-1]
         if last_message.tool_calls:
             return "tools_profile"
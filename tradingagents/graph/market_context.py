@@ -0,0 +1,157 @@
+# TradingAgents/graph/market_context.py
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from tradingagents.dataflows.singleflight import get_singleflight
+
+from .prefetch import DataPrefetcher, SYMBOL_INDEPENDENT_TOOLS
+
+MARKET_CONTEXT_KEY = "market_context:{trade_date}:{look_back_days}:{news_look_back_days}"
+
+# Analysts whose symbol-independent tools are covered by the market context
+MARKET_CONTEXT_ANALYSTS = ["social", "news", "fundamentals"]
+
+SUMMARY_PROMPT = (
+    "You are a crypto macro strategist. Using only the market-wide data below, write a concise macro"
+    " briefing for {trade_date} that traders of any coin can rely on: overall market regime, sentiment"
+    " (fear & greed trend), total market capitalization and dominance, and the macroeconomic and"
+    " regulatory news most likely to move crypto markets. Do not analyze any single coin beyond what the"
+    " data says about the market as a whole. End with a short Markdown table of the key points.\n\n{data}"
+)
+
+
+class MarketContextBuilder:
+    """Builds the symbol-independent market context of a trade date once and shares it.
+
+    The context holds the raw payloads of the symbol-independent tools (global news,
+    fear & greed, market cap) and an LLM-written macro summary of them. It is cached
+    in this process and, when a Redis client is given, in Redis for every worker.
+    """
+
+    def __init__(
+        self,
+        llm,
+        prefetcher: Optional[DataPrefetcher] = None,
+        redis_client=None,
+        ttl: int = 6 * 3600,
+        lock_ttl: float = 600,
+    ):
+        """
+        Args:
+            llm: Chat model writing the macro summary
+            prefetcher: Prefetcher whose look-back windows and vendor calls are used
+            redis_client: Optional Redis client sharing the context between workers
+            ttl: Seconds a context stays valid
+            lock_ttl: Seconds one worker may spend building a context while the others wait for it
+        """
+        self.llm = llm
+        self.prefetcher = prefetcher or DataPrefetcher()
+        self.redis = redis_client
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self._contexts: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, trade_date: str) -> str:
+        """Build the cache key of the market context of a trade date and look-back window."""
+        return MARKET_CONTEXT_KEY.format(
+            trade_date=trade_date,
+            look_back_days=self.prefetcher.look_back_days,
+            news_look_back_days=self.prefetcher.news_look_back_days,
+        )
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._contexts.get(key)
+            if entry is not None and entry[0] > time.time():
+                return entry[1]
+
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(key)
+                if raw is not None:
+                    context = json.loads(raw)
+                    self._remember(key, context, time.time() + max(self.redis.ttl(key), 1))
+                    return context
+            except Exception as e:
+                print(f"WARNING: Market context read from Redis failed for {key}: {e}")
+        return None
+
+    def _remember(self, key: str, context: Dict[str, Any], expires_at: float):
+        with self._lock:
+            self._contexts = {k: v for k, v in self._contexts.items() if v[0] > time.time()}
+            self._contexts[key] = (expires_at, context)
+
+    def summarize(self, trade_date: str, data: Dict[str, Dict[str, Any]]) -> str:
+        """Write the macro summary of the market-wide tool payloads."""
+        blocks = []
+        for tool_name, payload in data.items():
+            args = ", ".join(f"{k}={v!r}" for k, v in payload["args"].items())
+            blocks.append(f"### {tool_name}({args})\n{payload['result']}")
+        prompt = SUMMARY_PROMPT.format(trade_date=trade_date, data="\n\n".join(blocks))
+        return self.llm.invoke(prompt).content
+
+    def build(self, trade_date: str) -> Dict[str, Any]:
+        """Fetch the market-wide data of a trade date and summarize it, bypassing the cache.
+
+        Returns:
+            Dict with "trade_date", "data" (tool name to {"args": ..., "result": ...}) and
+            "summary" (empty if the summary could not be written)
+        """
+        data = self.prefetcher.prefetch_shared(trade_date, MARKET_CONTEXT_ANALYSTS)
+        summary = ""
+        if data:
+            try:
+                summary = self.summarize(trade_date, data)
+            except Exception as e:
+                # The analysts fall back to reading the data themselves
+                print(f"WARNING: Market context summary for {trade_date} failed: {e}")
+        return {"trade_date": trade_date, "data": data, "summary": summary}
+
+    def _build_and_store(self, key: str, trade_date: str) -> Dict[str, Any]:
+        # Another worker may have finished the build while this one waited for the lock
+        context = self._lookup(key)
+        if context is not None:
+            return context
+
+        started = time.perf_counter()
+        context = self.build(trade_date)
+        print(
+            f"INFO: Built market context for {trade_date} with {len(context['data'])}/"
+            f"{len(SYMBOL_INDEPENDENT_TOOLS)} payloads in {time.perf_counter() - started:.1f}s"
+        )
+        if not context["summary"]:
+            # Incomplete, build it again on the next run
+            return context
+
+        self._remember(key, context, time.time() + self.ttl)
+        if self.redis is not None:
+            try:
+                self.redis.set(key, json.dumps(context), ex=self.ttl)
+            except Exception as e:
+                print(f"WARNING: Market context write to Redis failed for {key}: {e}")
+        return context
+
+    def get(self, trade_date: str) -> Dict[str, Any]:
+        """Get the market context of a trade date, building it once for all concurrent callers."""
+        trade_date = str(trade_date)
+        key = self.make_key(trade_date)
+        context = self._lookup(key)
+        if context is not None:
+            return context
+
+        singleflight = get_singleflight()
+        if singleflight is None:
+            return self._build_and_store(key, trade_date)
+        # The build includes an LLM summary, far longer than the vendor fetches the group is tuned for
+        return singleflight.do(
+            key, lambda: self._build_and_store(key, trade_date), lock_ttl=self.lock_ttl, wait_timeout=self.lock_ttl
+        )
+
+
+def uses_market_context(selected_analysts: List[str]) -> bool:
+    """Whether any of the selected analysts reads the market context."""
+    return any(analyst_type in MARKET_CONTEXT_ANALYSTS for analyst_type in selected_analysts)
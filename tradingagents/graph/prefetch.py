@@ -0,0 +1,142 @@
+# TradingAgents/graph/prefetch.py
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+
+from tradingagents.dataflows.interface import route_to_vendor
+
+# Tools each analyst calls on (almost) every run, in the order they are usually called
+ANALYST_PREFETCH_TOOLS = {
+    "market": ["get_crypto_data", "get_indicators_bulk"],
+    "social": ["get_news", "get_fear_and_greed"],
+    "news": ["get_news", "get_global_news"],
+    "fundamentals": ["get_fundamentals", "get_whitepaper", "get_market_cap"],
+    "profile": ["get_account_balance", "get_open_orders"],
+}
+
+# Tools whose result does not depend on the symbol, shared by all runs of a batch on the same date
+SYMBOL_INDEPENDENT_TOOLS = ["get_fear_and_greed", "get_global_news", "get_market_cap"]
+
+DEFAULT_INDICATORS = [
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+]
+
+
+class DataPrefetcher:
+    """Fetches the standard tool payloads for the selected analysts ahead of their LLM loops."""
+
+    def __init__(self, look_back_days=30, news_look_back_days=7, max_workers=8):
+        """Initialize with configuration parameters."""
+        self.look_back_days = look_back_days
+        self.news_look_back_days = news_look_back_days
+        self.max_workers = max_workers
+
+    def get_tool_args(self, ticker: str, trade_date: str) -> Dict[str, Dict[str, Any]]:
+        """Get the arguments each prefetched tool is called with, keyed by tool name."""
+        trade_dt = datetime.strptime(trade_date, "%Y-%m-%d")
+        start_date = (trade_dt - timedelta(days=self.look_back_days)).strftime("%Y-%m-%d")
+        news_start_date = (trade_dt - timedelta(days=self.news_look_back_days)).strftime("%Y-%m-%d")
+
+        return {
+            "get_crypto_data": {"symbol": ticker, "start_date": start_date, "end_date": trade_date},
+            "get_indicators_bulk": {
+                "symbol": ticker,
+                "indicators": DEFAULT_INDICATORS,
+                "curr_date": trade_date,
+                "look_back_days": self.look_back_days,
+            },
+            "get_news": {"ticker": ticker, "start_date": news_start_date, "end_date": trade_date},
+            "get_fear_and_greed": {"look_back_days": self.look_back_days},
+            "get_global_news": {"curr_date": trade_date, "look_back_days": self.news_look_back_days, "limit": 5},
+            "get_fundamentals": {"ticker": ticker, "curr_date": trade_date},
+            "get_whitepaper": {"ticker": ticker},
+            "get_market_cap": {},
+            "get_account_balance": {"symbol": ticker},
+            "get_open_orders": {"symbol": ticker},
+        }
+
+    def get_tools(self, selected_analysts: List[str]) -> List[str]:
+        """Get the de-duplicated list of tools to prefetch for the selected analysts."""
+        tools = []
+        for analyst_type in selected_analysts:
+            for tool_name in ANALYST_PREFETCH_TOOLS.get(analyst_type, []):
+                if tool_name not in tools:
+                    tools.append(tool_name)
+        return tools
+
+    def _fetch(self, tool_name: str, tool_args: Dict[str, Any]) -> Tuple[str, Dict[str, Any] | None]:
+        """Fetch a single tool payload through the vendor router."""
+        try:
+            result = route_to_vendor(tool_name, *tool_args.values())
+            return tool_name, {"args": tool_args, "result": str(result)}
+        except Exception as e:
+            # The analyst will call the tool itself
+            print(f"WARNING: Prefetch of {tool_name} failed: {e}")
+            return tool_name, None
+
+    def _fetch_all(self, tools: List[str], tool_args: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tools))) as executor:
+            fetched = executor.map(lambda tool_name: self._fetch(tool_name, tool_args[tool_name]), tools)
+            return {tool_name: payload for tool_name, payload in fetched if payload is not None}
+
+    def prefetch(
+        self, ticker: str, trade_date: str, selected_analysts: List[str], prefetched: Dict[str, Dict[str, Any]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch all tool payloads for the selected analysts concurrently.
+
+        Args:
+            prefetched: Payloads already available, e.g. shared by a batch, which are not fetched again
+
+        Returns:
+            Dict mapping tool name to {"args": ..., "result": ...} for every successful fetch
+        """
+        prefetched = dict(prefetched or {})
+        tool_args = self.get_tool_args(ticker, trade_date)
+        tools = [tool_name for tool_name in self.get_tools(selected_analysts) if tool_name not in prefetched]
+        if not tools:
+            return prefetched
+
+        prefetched_data = self._fetch_all(tools, tool_args)
+
+        print(f"INFO: Prefetched {len(prefetched_data)}/{len(tools)} tool payloads for {ticker} on {trade_date}")
+        return {**prefetched, **prefetched_data}
+
+    def prefetch_shared(self, trade_date: str, selected_analysts: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch the symbol-independent tool payloads of the selected analysts once for a date.
+
+        Returns:
+            Dict mapping tool name to {"args": ..., "result": ...}, to seed the prefetched data of every run
+        """
+        tool_args = self.get_tool_args("", trade_date)
+        tools = [tool_name for tool_name in self.get_tools(selected_analysts) if tool_name in SYMBOL_INDEPENDENT_TOOLS]
+        if not tools:
+            return {}
+
+        shared_data = self._fetch_all(tools, tool_args)
+
+        print(f"INFO: Prefetched {len(shared_data)}/{len(tools)} shared tool payloads for {trade_date}")
+        return shared_data
+
+    def create_node(self, selected_analysts: List[str]):
+        """Create the graph node that fills ``prefetched_data`` in the agent state."""
+
+        def prefetch_node(state) -> dict:
+            return {
+                "prefetched_data": self.prefetch(
+                    state["ticker_of_interest"], state["trade_date"], selected_analysts, state.get("prefetched_data")
+                )
+            }
+
+        return prefetch_node
@@ -0,0 +1,66 @@
+# TradingAgents/graph/progress.py
+
+from typing import Any, Dict, Optional
+
+# Report written by each analyst node once it has finished its tool calls
+ANALYST_REPORT_KEYS = {
+    "Market Analyst": "market_report",
+    "Social Analyst": "sentiment_report",
+    "News Analyst": "news_report",
+    "Fundamentals Analyst": "fundamentals_report",
+    "Profile Analyst": "profile_report",
+}
+
+DEBATE_NODES = {"Bull Researcher", "Bear Researcher"}
+RISK_DEBATE_NODES = {"Risky Analyst", "Safe Analyst", "Neutral Analyst"}
+
+
+def node_update_to_event(node: str, update: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Turn the state update of a graph node into a progress event.
+
+    Args:
+        node: Name of the graph node that produced the update
+        update: State keys written by the node
+
+    Returns:
+        Event dict with "type", "node" and the partial report, or None if the
+        update is not a milestone (tool calls, message clearing, ...)
+    """
+    if not update:
+        return None
+
+    report_key = ANALYST_REPORT_KEYS.get(node)
+    if report_key is not None:
+        if not update.get(report_key):
+            return None
+        return {"type": "analyst_report", "node": node, "report_key": report_key, "content": update[report_key]}
+
+    if node in DEBATE_NODES:
+        debate = update.get("investment_debate_state", {})
+        return {
+            "type": "debate_round",
+            "node": node,
+            "round": debate.get("count", 0),
+            "content": debate.get("current_response", ""),
+        }
+
+    if node == "Research Manager":
+        return {"type": "investment_plan", "node": node, "content": update.get("investment_plan", "")}
+
+    if node == "Trader":
+        return {"type": "trader_plan", "node": node, "content": update.get("trader_investment_plan", "")}
+
+    if node in RISK_DEBATE_NODES:
+        debate = update.get("risk_debate_state", {})
+        speaker = node.split()[0].lower()
+        return {
+            "type": "risk_debate_round",
+            "node": node,
+            "round": debate.get("count", 0),
+            "content": debate.get(f"current_{speaker}_response", ""),
+        }
+
+    if node == "Risk Judge":
+        return {"type": "risk_judge_decision", "node": node, "content": update.get("final_trade_decision", "")}
+
+    return None
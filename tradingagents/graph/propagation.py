@@ -5,24 +5,34 @@ from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
+    get_analyst_messages_key,
 )
 
+ANALYST_TYPES = ["market", "social", "news", "fundamentals", "profile"]
+
 
 class Propagator:
     """Handles state initialization and propagation through the graph."""
 
-    def __init__(self, max_recur_limit=100):
+    def __init__(self, max_recur_limit=100, parallel_analysts=False):
         """Initialize with configuration parameters."""
         self.max_recur_limit = max_recur_limit
+        self.parallel_analysts = parallel_analysts
 
     def create_initial_state(
-        self, ticker: str, trade_date: str
+        self,
+        ticker: str,
+        trade_date: str,
+        prefetched_data: Dict[str, Any] = None,
+        market_context: Dict[str, Any] = None,
     ) -> Dict[str, Any]:
         """Create the initial state for the agent graph."""
-        return {
+        state = {
             "messages": [("human", ticker)],
             "ticker_of_interest": ticker,
             "trade_date": str(trade_date),
+            "prefetched_data": dict(prefetched_data or {}),
+            "market_context": dict(market_context or {}),
             "investment_debate_state": InvestDebateState(
                 {"history": "", "current_response": "", "count": 0}
             ),
@@ -42,6 +52,13 @@ class Propagator:
             "profile_report": "",
         }
 
+        if self.parallel_analysts:
+            # Every analyst branch starts its own conversation
+            for analyst_type in ANALYST_TYPES:
+                state[get_analyst_messages_key(analyst_type, True)] = [("human", ticker)]
+
+        return state
+
     def get_graph_args(self) -> Dict[str, Any]:
         """Get arguments for the graph invocation."""
         return {
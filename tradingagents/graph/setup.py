@@ -6,9 +6,10 @@ from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
-from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.agent_states import AgentState, get_analyst_messages_key
 
 from .conditional_logic import ConditionalLogic
+from .prefetch import DataPrefetcher
 
 
 class GraphSetup:
@@ -25,6 +26,7 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        data_prefetcher: DataPrefetcher = None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -36,9 +38,12 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.data_prefetcher = data_prefetcher
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals", "profile"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals", "profile"],
+        parallel_analysts=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -49,6 +54,9 @@ class GraphSetup:
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
                 - "profile": Profile analyst
+            parallel_analysts (bool): Run the analysts as concurrent branches, each on
+                its own message channel, joining before the Bull Researcher. When False
+                the analysts run one after another on the shared ``messages`` channel.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -59,38 +67,43 @@ class GraphSetup:
         tool_nodes = {}
 
         if "market" in selected_analysts:
+            messages_key = get_analyst_messages_key("market", parallel_analysts)
             analyst_nodes["market"] = create_market_analyst(
-                self.quick_thinking_llm
+                self.quick_thinking_llm, messages_key
             )
-            delete_nodes["market"] = create_msg_delete()
+            delete_nodes["market"] = create_msg_delete(messages_key)
             tool_nodes["market"] = self.tool_nodes["market"]
 
         if "social" in selected_analysts:
+            messages_key = get_analyst_messages_key("social", parallel_analysts)
             analyst_nodes["social"] = create_social_media_analyst(
-                self.quick_thinking_llm
+                self.quick_thinking_llm, messages_key
             )
-            delete_nodes["social"] = create_msg_delete()
+            delete_nodes["social"] = create_msg_delete(messages_key)
             tool_nodes["social"] = self.tool_nodes["social"]
 
         if "news" in selected_analysts:
+            messages_key = get_analyst_messages_key("news", parallel_analysts)
             analyst_nodes["news"] = create_news_analyst(
-                self.quick_thinking_llm
+                self.quick_thinking_llm, messages_key
             )
-            delete_nodes["news"] = create_msg_delete()
+            delete_nodes["news"] = create_msg_delete(messages_key)
             tool_nodes["news"] = self.tool_nodes["news"]
 
         if "fundamentals" in selected_analysts:
+            messages_key = get_analyst_messages_key("fundamentals", parallel_analysts)
             analyst_nodes["fundamentals"] = create_fundamentals_analyst(
-                self.quick_thinking_llm
+                self.quick_thinking_llm, messages_key
             )
-            delete_nodes["fundamentals"] = create_msg_delete()
+            delete_nodes["fundamentals"] = create_msg_delete(messages_key)
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
         
         if "profile" in selected_analysts:
+            messages_key = get_analyst_messages_key("profile", parallel_analysts)
             analyst_nodes["profile"] = create_profile_analyst(
-                self.quick_thinking_llm
+                self.quick_thinking_llm, messages_key
             )
-            delete_nodes["profile"] = create_msg_delete()
+            delete_nodes["profile"] = create_msg_delete(messages_key)
             tool_nodes["profile"] = self.tool_nodes["profile"]
 
         # Create researcher and manager nodes
@@ -134,13 +147,15 @@ class GraphSetup:
         workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
 
-        # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        # Optionally fetch the standard tool payloads before any analyst runs
+        entry_node = START
+        if self.data_prefetcher is not None:
+            workflow.add_node("Data Prefetch", self.data_prefetcher.create_node(selected_analysts))
+            workflow.add_edge(START, "Data Prefetch")
+            entry_node = "Data Prefetch"
 
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
+        # Define edges
+        for analyst_type in selected_analysts:
             current_analyst = f"{analyst_type.capitalize()} Analyst"
             current_tools = f"tools_{analyst_type}"
             current_clear = f"Msg Clear {analyst_type.capitalize()}"
@@ -153,12 +168,27 @@ class GraphSetup:
             )
             workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        if parallel_analysts:
+            # Fan out to every analyst and join all branches before Bull Researcher
+            for analyst_type in selected_analysts:
+                workflow.add_edge(entry_node, f"{analyst_type.capitalize()} Analyst")
+            workflow.add_edge(
+                [f"Msg Clear {analyst_type.capitalize()}" for analyst_type in selected_analysts],
+                "Bull Researcher",
+            )
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(entry_node, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence, the last one hands over to Bull Researcher
+            for i, analyst_type in enumerate(selected_analysts):
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -3,6 +3,9 @@
 import os
 from pathlib import Path
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
@@ -19,6 +22,7 @@ from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
+    get_analyst_messages_key,
 )
 # Import removed as set_config is now imported from tradingagents.config
 
@@ -46,6 +50,9 @@ from tradingagents.agents.utils.agent_utils import (
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
+from .prefetch import DataPrefetcher
+from .market_context import MarketContextBuilder, uses_market_context
+from .progress import node_update_to_event
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
 
@@ -98,11 +105,30 @@ class TradingAgentsGraph:
         self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
 
+        # Run analysts as concurrent branches instead of one after another
+        self.parallel_analysts = self.config.get("parallel_analysts", settings.PARALLEL_ANALYSTS)
+
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(parallel_analysts=self.parallel_analysts)
+        self.data_prefetcher = (
+            DataPrefetcher() if self.config.get("prefetch_data", settings.PREFETCH_DATA) else None
+        )
+        self.market_context_builder = None
+        if self.config.get("market_context", settings.MARKET_CONTEXT_ENABLED) and uses_market_context(selected_analysts):
+            redis_client = None
+            if self.config.get("market_context_redis", settings.MARKET_CONTEXT_REDIS):
+                from tradingagents.external.redis.client import get_redis_client
+                redis_client = get_redis_client()
+            self.market_context_builder = MarketContextBuilder(
+                self.quick_thinking_llm,
+                self.data_prefetcher,
+                redis_client,
+                self.config.get("market_context_ttl", settings.MARKET_CONTEXT_TTL),
+                self.config.get("market_context_lock_ttl", settings.MARKET_CONTEXT_LOCK_TTL),
+            )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -113,22 +139,28 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            self.data_prefetcher,
         )
 
-        self.propagator = Propagator()
+        self.propagator = Propagator(parallel_analysts=self.parallel_analysts)
         self.reflector = Reflector(self.quick_thinking_llm)
         self.signal_processor = SignalProcessor(self.quick_thinking_llm)
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = {}  # ticker to date to full state dict
+        self._log_lock = threading.Lock()
+        self.selected_analysts = selected_analysts
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(selected_analysts, self.parallel_analysts)
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
+        def messages_key(analyst_type):
+            return get_analyst_messages_key(analyst_type, self.parallel_analysts)
+
         return {
             "market": ToolNode(
                 [
@@ -139,14 +171,16 @@ class TradingAgentsGraph:
                     # Technical indicators
                     get_indicators,
                     get_indicators_bulk,
-                ]
+                ],
+                messages_key=messages_key("market"),
             ),
             "social": ToolNode(
                 [
                     # News tools for social media analysis
                     get_news,
                     get_fear_and_greed,
-                ]
+                ],
+                messages_key=messages_key("social"),
             ),
             "news": ToolNode(
                 [
@@ -155,7 +189,8 @@ class TradingAgentsGraph:
                     get_global_news,
                     # get_insider_sentiment,
                     # get_insider_transactions,
-                ]
+                ],
+                messages_key=messages_key("news"),
             ),
             "fundamentals": ToolNode(
                 [
@@ -166,32 +201,70 @@ class TradingAgentsGraph:
                     # get_balance_sheet,
                     # get_cashflow,
                     # get_income_statement,
-                ]
+                ],
+                messages_key=messages_key("fundamentals"),
             ),
             "profile": ToolNode(
                 [
                     # Profile analysis tools can be added here
                     get_account_balance,
                     get_open_orders,
-                ]
+                ],
+                messages_key=messages_key("profile"),
             ),
         }
 
-    def propagate(self, ticker, trade_date):
-        """Run the trading agents graph for a coin pair on a specific date."""
+    def propagate(self, ticker, trade_date, on_event=None, checkpointer=None, thread_id=None, prefetched_data=None):
+        """Run the trading agents graph for a coin pair on a specific date.
+
+        Args:
+            ticker: Coin pair to analyze
+            trade_date: Date of the analysis
+            on_event: Optional callback receiving a progress event dict whenever a node
+                reaches a milestone (analyst report, debate round, decision)
+            checkpointer: Optional LangGraph checkpoint saver. With a ``thread_id`` every
+                completed node is checkpointed, and a later call with the same thread id
+                resumes after the last completed node instead of starting over.
+            thread_id: Checkpoint thread, e.g. the id of the job running the analysis
+            prefetched_data: Optional tool payloads to seed the state with, e.g. shared by a batch
+        """
 
         self.ticker = ticker
 
+        # Market-wide data and its summary, built once per trade date for every coin
+        market_context = None
+        if self.market_context_builder is not None:
+            market_context = self.market_context_builder.get(trade_date)
+            prefetched_data = {**market_context["data"], **(prefetched_data or {})}
+
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
-            ticker, trade_date
+            ticker, trade_date, prefetched_data, market_context
         )
         args = self.propagator.get_graph_args()
 
-        if self.debug:
+        graph = self.graph
+        final_state = None
+        if checkpointer is not None and thread_id is not None:
+            graph = self.graph.copy(update={"checkpointer": checkpointer})
+            args["config"] = {**args["config"], "configurable": {"thread_id": thread_id}}
+            snapshot = graph.get_state(args["config"])
+            if snapshot.next:
+                # Passing no input continues from the last checkpoint
+                print(f"INFO: Resuming graph run of thread {thread_id} at {', '.join(snapshot.next)}")
+                init_agent_state = None
+            elif snapshot.values:
+                # The graph already ran to the end for this thread
+                print(f"INFO: Reusing completed graph run of thread {thread_id}")
+                final_state = snapshot.values
+
+        if final_state is not None:
+            # Nothing left to run
+            pass
+        elif self.debug:
             # Debug mode with tracing
             trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
+            for chunk in graph.stream(init_agent_state, **args):
                 if len(chunk["messages"]) == 0:
                     pass
                 else:
@@ -199,9 +272,22 @@ class TradingAgentsGraph:
                     trace.append(chunk)
 
             final_state = trace[-1]
+        elif on_event is not None:
+            # Stream node updates for progress events and full states for the result
+            final_state = None
+            for mode, chunk in graph.stream(
+                init_agent_state, **{**args, "stream_mode": ["updates", "values"]}
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+                for node, update in chunk.items():
+                    event = node_update_to_event(node, update)
+                    if event is not None:
+                        on_event(event)
         else:
             # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+            final_state = graph.invoke(init_agent_state, **args)
 
         # Store current state for reflection
         self.curr_state = final_state
@@ -212,9 +298,73 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    def propagate_many(self, requests, max_concurrency=4):
+        """Run the graph for many (ticker, trade_date) pairs concurrently.
+
+        All runs share this instance's LLM clients and the process-wide candle store and
+        result cache. Symbol-independent tool payloads (fear & greed, global news, market
+        cap) are fetched once per trade date and seeded into every run, together with
+        their macro summary when the market context stage is enabled.
+
+        Args:
+            requests: List of (ticker, trade_date) tuples
+            max_concurrency: Maximum number of graphs running at the same time
+
+        Returns:
+            Dict with "results" (per request, in order: ticker, trade_date, final_state,
+            decision, error and seconds), "shared_seconds" and "total_seconds". ``curr_state``
+            is left at whichever run finished last, use the per-request final states instead.
+        """
+        started = time.perf_counter()
+        prefetcher = self.data_prefetcher or DataPrefetcher()
+        trade_dates = sorted({str(trade_date) for _, trade_date in requests})
+        if self.market_context_builder is not None:
+            # Each run picks the market context up from the builder's cache
+            for trade_date in trade_dates:
+                self.market_context_builder.get(trade_date)
+            shared_data = {trade_date: None for trade_date in trade_dates}
+        else:
+            shared_data = {
+                trade_date: prefetcher.prefetch_shared(trade_date, self.selected_analysts)
+                for trade_date in trade_dates
+            }
+        shared_seconds = time.perf_counter() - started
+
+        def run(request):
+            ticker, trade_date = request
+            run_started = time.perf_counter()
+            result = {"ticker": ticker, "trade_date": trade_date, "final_state": None, "decision": None, "error": None}
+            try:
+                result["final_state"], result["decision"] = self.propagate(
+                    ticker, trade_date, prefetched_data=shared_data[str(trade_date)]
+                )
+            except Exception as e:
+                print(f"ERROR: Batch run for {ticker} on {trade_date} failed: {e}")
+                result["error"] = str(e)
+            result["seconds"] = time.perf_counter() - run_started
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(requests)))) as executor:
+            results = list(executor.map(run, requests))
+
+        total_seconds = time.perf_counter() - started
+        print(
+            f"INFO: Batch of {len(requests)} runs finished in {total_seconds:.1f}s "
+            f"({sum(1 for r in results if r['error'] is None)} succeeded, max concurrency {max_concurrency})"
+        )
+        return {"results": results, "shared_seconds": shared_seconds, "total_seconds": total_seconds}
+
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        # Concurrent runs of propagate_many share this instance
+        with self._log_lock:
+            self._write_state_log(trade_date, final_state)
+
+    def _write_state_log(self, trade_date, final_state):
+        ticker = final_state["ticker_of_interest"]
+        # Batches log several tickers, each ticker's file only holds its own dates
+        ticker_states = self.log_states_dict.setdefault(ticker, {})
+        ticker_states[str(trade_date)] = {
             "ticker_of_interest": final_state["ticker_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -246,14 +396,14 @@ class TradingAgentsGraph:
         }
 
         # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            json.dump(ticker_states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
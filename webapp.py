@@ -1,15 +1,24 @@
-from fastapi import FastAPI, HTTPException, status
+import json
+from fastapi import FastAPI, HTTPException, Header, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 from datetime import datetime
 
 # Import your trading agents
-from service import enqueue_analysis, get_status
+from service import enqueue_analysis_async, get_status_async
+from tradingagents.domain.model import AnalysisStatus, is_final_status
+from tradingagents.external.redis.repo import async_redis_repo
 from tradingagents.config import get_config
+from tradingagents.dataflows.interface import get_vendor_circuit_states
 
 config = get_config()
 DEFAULT_USER = "global_user"
 
+# Seconds an event stream read blocks before a keep-alive comment is sent. The reads go through
+# the asyncio client, which has no socket timeout, unlike the sync one.
+EVENTS_BLOCK_SECONDS = 15
+
 # Create FastAPI app instance
 app = FastAPI(
     title="TradingAgents API",
@@ -53,6 +62,14 @@ async def health_check():
         "service": "tradingagents-api"
     }
 
+@app.get("/health/vendors")
+async def vendor_health():
+    """Circuit breaker state of every data vendor"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "circuits": get_vendor_circuit_states(),
+    }
+
 @app.post("/v1/trading/analyze", response_model=TradingAnalyzeResponse, status_code=status.HTTP_202_ACCEPTED,)
 async def analyze_trading_decision(request: TradingAnalyzeRequest):
     """
@@ -65,7 +82,7 @@ async def analyze_trading_decision(request: TradingAnalyzeRequest):
         "date": "2024-05-10"
     }
     """
-    response = enqueue_analysis(DEFAULT_USER, request.symbol, request.date)
+    response = await enqueue_analysis_async(DEFAULT_USER, request.symbol, request.date)
     print(f"INFO: Enqueue response: {response}")
 
     if response.status == "error":
@@ -80,8 +97,8 @@ async def analyze_trading_decision(request: TradingAnalyzeRequest):
     )
 
 @app.get("/v1/trading/status/{job_id}", response_model=TradingStatusResponse, status_code=status.HTTP_200_OK)
-def get_trading_status(job_id: str):
-    response = get_status(DEFAULT_USER, job_id)
+async def get_trading_status(job_id: str):
+    response = await get_status_async(DEFAULT_USER, job_id)
     if response:
         return TradingStatusResponse(
             job_id=job_id,
@@ -90,6 +107,43 @@ def get_trading_status(job_id: str):
             message=response.message
         )
 
+def _sse(event_id: str, event: dict) -> str:
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+async def _tail_job_events(job_id: str, last_id: str):
+    """Yield the job's progress events as SSE frames until the job is done or failed for good."""
+    # A job that already finished has nothing more to stream after its backlog
+    _, _, finished = await async_redis_repo.get_job_status(job_id)
+    while True:
+        events = await async_redis_repo.read_progress_events(job_id, last_id, block_ms=None if finished else EVENTS_BLOCK_SECONDS * 1000)
+        if not events:
+            if finished:
+                return
+            yield ": keep-alive\n\n"
+            continue
+        for event_id, event in events:
+            last_id = event_id
+            yield _sse(event_id, event)
+            # A failure RQ still retries is followed by the events of the next attempt
+            if event["type"] == "status" and is_final_status(AnalysisStatus(event["status"]), event.get("final")):
+                return
+
+@app.get("/v1/trading/events/{job_id}")
+async def stream_trading_events(job_id: str, last_event_id: str | None = Header(default=None)):
+    """
+    Stream the progress of an analysis as Server-Sent Events: analyst reports, debate
+    rounds, the trader plan, the risk judge decision and status changes. Reconnecting
+    clients resume after the Last-Event-ID header.
+    """
+    if await async_redis_repo.get_analysis_meta(DEFAULT_USER, job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    return StreamingResponse(
+        _tail_job_events(job_id, last_event_id or "0"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     # Run the server
     uvicorn.run(